@@ -0,0 +1,198 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Auto-Grind Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module resolves a long run of explore() battles in one call, with
+no printing and no saving in between. Every fight is a basic-attack
+battle, so it is settled the same way SimpleBattle.fast_forward does
+it: the hits each side needs are a ceiling division.
+
+While the run lasts the character's stats don't change (rewards are
+held back until the end), so each enemy type is worked out once up
+front: how much health the character loses beating it, and the
+rewards. After that each fight is one weighted draw and a subtraction.
+Enemies with behavior rules (enemy_ai) can't be settled with one
+division, so their fight is stepped once by a stand-in with endless
+health - what the enemy does never depends on the player's health, so
+that one fight gives the health cost for every fight.
+
+XP and gold are handed out once at the end of the run (one
+gain_experience and one add_gold call), so any level-ups happen after
+the last fight rather than part-way through. Loot is rolled for every
+win and added to the inventory in one go at the end.
+"""
+
+import random
+
+from custom_exceptions import CharacterDeadError
+
+from character_manager import gain_experience, add_gold
+from inventory_system import add_items_to_inventory
+from combat_system import (
+    SimpleBattle,
+    NULL_SINK,
+    calculate_damage,
+    get_encounter_table,
+    get_enemy_behavior,
+    get_scaled_enemy_stats,
+    get_victory_rewards
+)
+from loot_system import roll_loot
+from weighted_sampling import alias_draw
+
+# Why a run ended
+STOP_COMPLETED = "completed"
+STOP_LOW_HEALTH = "low_health"
+STOP_DEFEATED = "defeated"
+
+# Health of the stand-in that steps a fight against an enemy with behavior
+STAND_IN_HEALTH = 1 << 62
+
+# ============================================================================
+# FIGHT OUTCOMES
+# ============================================================================
+
+def fight_outcome(character, enemy):
+    """
+    Work out a basic-attack fight against a fresh enemy
+
+    Returns: Tuple (health_lost, xp, gold) - a character with more than
+             health_lost health wins and loses that much; anyone else
+             is defeated
+    """
+    if get_enemy_behavior(enemy.get("enemy_id")) is not None:
+        health_lost = stepped_health_lost(character, enemy)
+    else:
+        player_damage = calculate_damage(character, enemy)
+        enemy_damage = calculate_damage(enemy, character)
+
+        # Hits needed (the player always gets at least one swing)
+        player_hits = max(1, -(-enemy.get("health", 0) // player_damage))
+        health_lost = (player_hits - 1) * enemy_damage
+
+    rewards = get_victory_rewards(enemy)
+    return health_lost, rewards["xp"], rewards["gold"]
+
+
+def stepped_health_lost(character, enemy):
+    """
+    Health a basic-attacking character loses beating an enemy, found by
+    stepping the battle with a stand-in that can't die
+
+    Damage taken only ever adds up, so a character wins exactly when its
+    health is above this total.
+    """
+    stand_in = dict(character, health=STAND_IN_HEALTH, inventory=[])
+    battle = SimpleBattle(stand_in, dict(enemy), sink=NULL_SINK)
+    battle.begin_battle()
+    battle.run_turns()
+    return STAND_IN_HEALTH - stand_in["health"]
+
+# ============================================================================
+# AUTO-GRIND
+# ============================================================================
+
+def auto_grind(character, count, stop_below=0.0, rng=None):
+    """
+    Fight up to count random encounters in a row, headless
+
+    Enemies are picked like explore() does (get_random_enemy_for_level
+    for the character's level at the start of the run, with stats scaled
+    to that level) and health carries over from fight to fight.
+
+    Args:
+        character: Character dictionary (updated in place)
+        count: Most fights to play
+        stop_below: Stop before a fight once health is below this
+                    fraction of max_health (0.0 = keep going)
+        rng: Optional random.Random (seeded runs); default random module
+
+    Returns: Dictionary with:
+            {'fights': int, 'wins': int, 'stopped': 'completed'|'low_health'|'defeated',
+             'xp_gained': int, 'gold_gained': int, 'levels_gained': int,
+             'enemies': {enemy_id: fights}, 'health': int,
+             'loot': {item_id: quantity}, 'loot_overflow': {item_id: quantity}}
+    Raises: CharacterDeadError if character is already dead
+            ValueError if count is negative
+    """
+    if character.get("health", 0) <= 0:
+        raise CharacterDeadError("Character is already dead and cannot fight.")
+    if count < 0:
+        raise ValueError("Fight count cannot be negative.")
+
+    level = character.get("level", 1)
+    ids, table = get_encounter_table(level)
+    outcomes = [fight_outcome(character, get_scaled_enemy_stats(enemy_id, level))
+                for enemy_id in ids]
+    fights_by_enemy = [0] * len(ids)
+
+    if rng is None:
+        rng = random
+    threshold = stop_below * character.get("max_health", 0)
+    health = character["health"]
+    single = len(ids) == 1
+
+    fights = 0
+    xp = 0
+    gold = 0
+    loot = {}
+    stopped = STOP_COMPLETED
+    while fights < count:
+        if health < threshold:
+            stopped = STOP_LOW_HEALTH
+            break
+
+        choice = 0 if single else alias_draw(table, rng)
+        health_lost, enemy_xp, enemy_gold = outcomes[choice]
+        fights += 1
+        fights_by_enemy[choice] += 1
+        if health <= health_lost:
+            stopped = STOP_DEFEATED
+            break
+
+        health -= health_lost
+        xp += enemy_xp
+        gold += enemy_gold
+        roll_loot(ids[choice], rng, loot)
+
+    wins = fights - 1 if stopped == STOP_DEFEATED else fights
+
+    # Rewards for the fights that were won go in before any fatal fight
+    # (gain_experience refuses dead characters; a level-up refills health)
+    character["health"] = health
+    if wins:
+        gain_experience(character, xp)
+        add_gold(character, gold)
+    overflow = add_items_to_inventory(character, loot) if loot else {}
+    if stopped == STOP_DEFEATED:
+        character["health"] = 0
+
+    return {
+        "fights": fights,
+        "wins": wins,
+        "stopped": stopped,
+        "xp_gained": xp,
+        "gold_gained": gold,
+        "levels_gained": character.get("level", 1) - level,
+        "enemies": {ids[i]: n for i, n in enumerate(fights_by_enemy) if n},
+        "health": character["health"],
+        "loot": loot,
+        "loot_overflow": overflow,
+    }
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== AUTO-GRIND TEST ===")
+
+    # from character_manager import create_character
+    # hero = create_character("Hero", "Warrior")
+    # print(auto_grind(hero, 10000, stop_below=0.25, rng=random.Random(1)))
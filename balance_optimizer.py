@@ -0,0 +1,362 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Balance Optimizer Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module tunes class and enemy stats to hit target win rates and
+battle lengths. Designers give a target per enemy level band, e.g.
+"level 3-5 characters should beat orcs 70% of the time in about 6 turns",
+and the optimizer runs coordinate descent over the stats: nudge one stat
+up or down, keep the change if the simulated results got closer to the
+targets, and halve the step size once nothing helps.
+
+Every candidate is scored with the headless battle simulator (on a
+process pool). Results are cached per (class stats, enemy stats, level)
+combination, so changing one enemy's stats only re-simulates that
+enemy's battles. The simulator seed stays fixed, so every candidate
+faces the same random rolls and small stat changes aren't lost in noise.
+"""
+
+import os
+from multiprocessing import Pool
+
+from character_manager import get_class_registry
+from combat_system import get_enemy_catalog
+from game_data import save_classes, save_enemies
+from battle_simulator import simulate_combos
+
+# Battles per (class, enemy, level) combination for each evaluation
+DEFAULT_BATTLES = 400
+
+# Stats the optimizer is allowed to change
+CLASS_STATS = ("health", "strength", "magic")
+ENEMY_STATS = ("health", "strength")
+
+# Relative importance of the turn-count error vs the win-rate error
+TURN_WEIGHT = 0.25
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+
+def band_levels(enemy):
+    """
+    Levels to test an enemy at: its band's first, middle and last level
+    (open-ended bands use MIN_LEVEL .. MIN_LEVEL + 2)
+    """
+    low = enemy["min_level"]
+    high = enemy["max_level"] if enemy["max_level"] is not None else low + 2
+    return sorted({low, (low + high) // 2, high})
+
+
+def default_targets(win_rate=0.7, avg_turns=6.0):
+    """
+    One target per enemy in the catalog, all with the same goals
+
+    Returns: List of target dictionaries:
+             {'enemy': id, 'levels': [..], 'win_rate': float, 'avg_turns': float}
+    """
+    return [
+        {"enemy": enemy_id, "levels": band_levels(enemy),
+         "win_rate": win_rate, "avg_turns": avg_turns}
+        for enemy_id, enemy in get_enemy_catalog().items()
+    ]
+
+# ============================================================================
+# OPTIMIZER
+# ============================================================================
+
+class BalanceOptimizer:
+    """
+    Coordinate-descent search over class and enemy stats
+    """
+
+    def __init__(self, targets, classes=None, battles=DEFAULT_BATTLES, workers=None,
+                 seed=0, policy="ability", tune_classes=True, tune_enemies=True):
+        """
+        Args:
+            targets: List of target dictionaries (see default_targets)
+            classes: Classes to simulate (default: every class)
+            battles: Battles per combination per evaluation
+            workers: Simulator processes (None = one per CPU, 1 = no pool)
+            seed: Simulator seed, fixed for the whole search
+            policy: Simulator player policy name
+            tune_classes / tune_enemies: Which stats may change
+
+        Raises: ValueError if there are no targets or nothing to tune
+        """
+        if not targets:
+            raise ValueError("Balance optimizer needs at least one target")
+        if not tune_classes and not tune_enemies:
+            raise ValueError("Nothing to tune")
+
+        registry = get_class_registry()
+        catalog = get_enemy_catalog()
+
+        self.targets = [dict(t, enemy=t["enemy"].lower()) for t in targets]
+        self.classes = list(classes or registry)
+        self.battles = battles
+        self.workers = workers
+        self.seed = seed
+        self.policy = policy
+
+        self.class_stats = {name: {stat: registry[name][stat] for stat in CLASS_STATS}
+                            for name in self.classes}
+        self.enemy_stats = {t["enemy"]: {stat: catalog[t["enemy"]][stat] for stat in ENEMY_STATS}
+                            for t in self.targets}
+
+        self.parameters = []
+        if tune_enemies:
+            self.parameters += [("enemy", name, stat)
+                                for name in self.enemy_stats for stat in ENEMY_STATS]
+        if tune_classes:
+            self.parameters += [("class", name, stat)
+                                for name in self.class_stats for stat in CLASS_STATS]
+
+        # (class, class stats, enemy, enemy stats, level) -> simulator stats
+        self.cache = {}
+        self.evaluations = 0
+        self.cache_hits = 0
+        self.simulated_combos = 0
+        self._pool = None
+
+    def combos(self):
+        """Every (class, enemy, level) combination the targets cover"""
+        return [(character_class, target["enemy"], level)
+                for target in self.targets
+                for character_class in self.classes
+                for level in target["levels"]]
+
+    def _cache_key(self, combo, class_stats, enemy_stats):
+        """Cache key: the combination plus the exact stats used for it"""
+        character_class, enemy_id, level = combo
+        return (character_class, tuple(class_stats[character_class][s] for s in CLASS_STATS),
+                enemy_id, tuple(enemy_stats[enemy_id][s] for s in ENEMY_STATS), level)
+
+    def evaluate(self, class_stats, enemy_stats):
+        """
+        Score one set of stats
+
+        Returns: Tuple (loss, {combo: simulator stats})
+        """
+        self.evaluations += 1
+        combos = self.combos()
+        keys = {combo: self._cache_key(combo, class_stats, enemy_stats) for combo in combos}
+
+        missing = [combo for combo in combos if keys[combo] not in self.cache]
+        self.cache_hits += len(combos) - len(missing)
+        if missing:
+            self.simulated_combos += len(missing)
+            simulated = simulate_combos(missing, self.battles, self.workers, self.seed,
+                                        self.policy, class_stats, enemy_stats,
+                                        pool=self._pool)
+            for combo, stats in simulated.items():
+                self.cache[keys[combo]] = stats
+
+        results = {combo: self.cache[keys[combo]] for combo in combos}
+        return self.loss(results), results
+
+    def loss(self, results):
+        """
+        Mean squared error against the targets
+
+        Each combination adds (win rate error)^2 plus TURN_WEIGHT times
+        the squared relative error in average turns.
+        """
+        total = 0.0
+        count = 0
+        for target in self.targets:
+            for character_class in self.classes:
+                for level in target["levels"]:
+                    stats = results[(character_class, target["enemy"], level)]
+                    win_error = stats["win_rate"] - target["win_rate"]
+                    turn_error = (stats["avg_turns"] - target["avg_turns"]) / target["avg_turns"]
+                    total += win_error ** 2 + TURN_WEIGHT * turn_error ** 2
+                    count += 1
+        return total / count
+
+    def optimize(self, max_rounds=20, step=0.25, min_step=0.02):
+        """
+        Run the search
+
+        Args:
+            max_rounds: Most passes over every parameter
+            step: Starting relative change per try (0.25 = +-25%)
+            min_step: Stop once the step shrinks below this
+
+        Returns: Result dictionary with class_stats, enemy_stats,
+                 initial/final loss and results, and search counters
+        """
+        if self.workers is not None and self.workers > 1:
+            with Pool(processes=self.workers) as pool:
+                self._pool = pool
+                try:
+                    return self._search(max_rounds, step, min_step)
+                finally:
+                    self._pool = None
+        return self._search(max_rounds, step, min_step)
+
+    def _stats_for(self, kind):
+        """The class or enemy stat table"""
+        return self.class_stats if kind == "class" else self.enemy_stats
+
+    def _search(self, max_rounds, step, min_step):
+        """Coordinate descent; returns the result dictionary"""
+        initial_class = {k: dict(v) for k, v in self.class_stats.items()}
+        initial_enemy = {k: dict(v) for k, v in self.enemy_stats.items()}
+        best_loss, best_results = self.evaluate(self.class_stats, self.enemy_stats)
+        initial_loss, initial_results = best_loss, best_results
+
+        rounds = 0
+        while rounds < max_rounds and step >= min_step:
+            rounds += 1
+            improved = False
+            for kind, name, stat in self.parameters:
+                table = self._stats_for(kind)
+                current = table[name][stat]
+                for direction in (1, -1):
+                    candidate = max(1, round(current * (1 + direction * step)))
+                    if candidate == current:
+                        candidate = max(1, current + direction)
+                    if candidate == current:
+                        continue
+
+                    table[name][stat] = candidate
+                    loss, results = self.evaluate(self.class_stats, self.enemy_stats)
+                    if loss < best_loss:
+                        best_loss, best_results = loss, results
+                        current = candidate
+                        improved = True
+                        break
+                    table[name][stat] = current
+
+            if not improved:
+                step /= 2
+
+        return {
+            "class_stats": {k: dict(v) for k, v in self.class_stats.items()},
+            "enemy_stats": {k: dict(v) for k, v in self.enemy_stats.items()},
+            "initial_class_stats": initial_class,
+            "initial_enemy_stats": initial_enemy,
+            "initial_loss": initial_loss,
+            "loss": best_loss,
+            "initial_results": initial_results,
+            "results": best_results,
+            "targets": self.targets,
+            "rounds": rounds,
+            "evaluations": self.evaluations,
+            "simulated_combos": self.simulated_combos,
+            "cache_hits": self.cache_hits,
+        }
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def write_balance_files(result, output_dir):
+    """
+    Write tuned classes.txt and enemies.txt into output_dir
+
+    Every other field (abilities, rewards, level bands...) is copied from
+    the current registry and catalog.
+
+    Returns: Tuple (classes path, enemies path)
+    """
+    classes = {}
+    for name, data in get_class_registry().items():
+        classes[name] = dict(data)
+        classes[name].update(result["class_stats"].get(name, {}))
+
+    enemies = {}
+    for enemy_id, data in get_enemy_catalog().items():
+        enemies[enemy_id] = dict(data)
+        enemies[enemy_id].update(result["enemy_stats"].get(enemy_id, {}))
+
+    classes_path = os.path.join(output_dir, "classes.txt")
+    enemies_path = os.path.join(output_dir, "enemies.txt")
+    save_classes(classes, classes_path)
+    save_enemies(enemies, enemies_path)
+    return classes_path, enemies_path
+
+
+def _band_summary(results, target):
+    """Average win rate and turns for one target over its classes and levels"""
+    matching = [stats for (_, enemy_id, level), stats in results.items()
+                if enemy_id == target["enemy"] and level in target["levels"]]
+    battles = sum(s["battles"] for s in matching)
+    wins = sum(s["wins"] for s in matching)
+    turns = sum(s["total_turns"] for s in matching)
+    return (wins / battles if battles else 0.0, turns / battles if battles else 0.0)
+
+
+def format_balance_report(result):
+    """
+    Build a plain-text report of a balance run
+
+    Returns: Report string
+    """
+    lines = ["=== BALANCE REPORT ===", ""]
+    lines.append(f"Loss: {result['initial_loss']:.4f} -> {result['loss']:.4f}")
+    lines.append(f"Rounds: {result['rounds']}  Evaluations: {result['evaluations']}  "
+                 f"Combos simulated: {result['simulated_combos']}  "
+                 f"Cache hits: {result['cache_hits']}")
+
+    lines += ["", "Targets (averaged over classes and levels):",
+              f"{'Enemy':<10}{'Levels':<10}{'Win % goal':>11}{'before':>9}{'after':>9}"
+              f"{'Turns goal':>12}{'before':>9}{'after':>9}"]
+    for target in result["targets"]:
+        before_win, before_turns = _band_summary(result["initial_results"], target)
+        after_win, after_turns = _band_summary(result["results"], target)
+        levels = f"{min(target['levels'])}-{max(target['levels'])}"
+        lines.append(f"{target['enemy']:<10}{levels:<10}{target['win_rate'] * 100:>11.1f}"
+                     f"{before_win * 100:>9.1f}{after_win * 100:>9.1f}"
+                     f"{target['avg_turns']:>12.1f}{before_turns:>9.2f}{after_turns:>9.2f}")
+
+    lines += ["", "Stat changes:"]
+    for label, before_key, after_key in (("Class", "initial_class_stats", "class_stats"),
+                                         ("Enemy", "initial_enemy_stats", "enemy_stats")):
+        for name, after in result[after_key].items():
+            before = result[before_key][name]
+            for stat, value in after.items():
+                if value != before[stat]:
+                    lines.append(f"  {label} {name}: {stat} {before[stat]} -> {value}")
+    if lines[-1] == "Stat changes:":
+        lines.append("  (none)")
+
+    return "\n".join(lines) + "\n"
+
+
+def balance(targets=None, output_dir="data/balanced", **options):
+    """
+    Run the optimizer and write tuned data files plus balance_report.txt
+
+    options are passed to BalanceOptimizer (battles, workers, seed, ...)
+    except max_rounds / step / min_step, which go to optimize().
+
+    Returns: The optimizer result dictionary
+    """
+    search_options = {key: options.pop(key) for key in ("max_rounds", "step", "min_step")
+                      if key in options}
+    optimizer = BalanceOptimizer(targets or default_targets(), **options)
+    result = optimizer.optimize(**search_options)
+
+    write_balance_files(result, output_dir)
+    with open(os.path.join(output_dir, "balance_report.txt"), "w", encoding="utf-8") as f:
+        f.write(format_balance_report(result))
+    return result
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BALANCE OPTIMIZER TEST ===")
+
+    # targets = default_targets(win_rate=0.7, avg_turns=6)
+    # result = balance(targets, "data/balanced", battles=300, max_rounds=5)
+    # print(format_balance_report(result))
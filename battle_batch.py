@@ -0,0 +1,254 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Batch Battle Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module resolves many basic-attack battles at once with NumPy.
+Each turn is applied to every unfinished battle in one vectorized step,
+using the same rules as SimpleBattle:
+    - player attacks first, then the enemy
+    - damage = attacker strength - defender strength // 4, minimum 1
+    - health never drops below 0
+    - the battle ends as soon as one side reaches 0 health
+    - enemies with behavior rules (enemy_ai) look up defend / heal /
+      special in their decision tables, stacked into one array so the
+      whole batch picks its actions with one fancy-indexing lookup
+
+NumPy is optional for the rest of the game; it is only needed here.
+"""
+
+import math
+
+from custom_exceptions import CharacterDeadError
+
+from combat_system import get_enemy_behavior
+from enemy_ai import (
+    HP_BUCKETS,
+    ENEMY_HEAL_LIMIT,
+    ACTION_DEFEND,
+    ACTION_HEAL,
+    ACTION_SPECIAL
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Winner codes in the returned 'winner' array
+WINNER_PLAYER = 1
+WINNER_ENEMY = 2
+
+# Health given to finished battles so they can never end again
+PARKED_HEALTH = 1 << 62
+
+# ============================================================================
+# BATCH RESOLVER
+# ============================================================================
+
+def _require_numpy():
+    """Raise a helpful error if NumPy isn't installed"""
+    if np is None:
+        raise ImportError("battle_batch needs NumPy: pip install numpy")
+
+
+def batch_damage(attacker_strength, defender_strength):
+    """
+    Vectorized version of combat_system.calculate_damage
+
+    Returns: Integer array of damage per battle
+    """
+    _require_numpy()
+    return np.maximum(attacker_strength - defender_strength // 4, 1)
+
+
+def _park(indices, p_hp, e_hp, p_dmg, e_dmg):
+    """Take finished battles out of play without resizing the arrays"""
+    p_hp[indices] = PARKED_HEALTH
+    e_hp[indices] = PARKED_HEALTH
+    p_dmg[indices] = 0
+    e_dmg[indices] = 0
+
+
+def stack_behaviors(behaviors):
+    """
+    Stack compiled behaviors into one decision array
+
+    Args:
+        behaviors: One (period, table) or None per battle
+
+    Returns: Tuple (tables, index, period) - tables has shape
+             (kinds, HP_BUCKETS + 1, period) with kind 0 = always attack;
+             index gives each battle's kind
+    """
+    kinds = {}
+    index = np.zeros(len(behaviors), dtype=np.int64)
+    for i, behavior in enumerate(behaviors):
+        if behavior is not None:
+            index[i] = kinds.setdefault(id(behavior), (len(kinds) + 1, behavior))[0]
+
+    period = 1
+    for _, (period_i, _) in kinds.values():
+        period = math.lcm(period, period_i)
+
+    tables = np.zeros((len(kinds) + 1, HP_BUCKETS + 1, period), dtype=np.int8)
+    for kind, (period_i, table) in kinds.values():
+        rows = np.array(table, dtype=np.int8).reshape(HP_BUCKETS + 1, period_i)
+        # Repeat each table's own cycle out to the shared period
+        tables[kind] = np.tile(rows, (1, period // period_i))
+    return tables, index, period
+
+
+def resolve_battles(player_stats, enemy_stats, behaviors=None):
+    """
+    Resolve N battles at once (the player always uses basic attacks).
+
+    Args:
+        player_stats: Mapping with 'strength' and 'health' arrays of length N
+                      ('magic' may be given but basic attacks don't use it)
+        enemy_stats: Same for the enemies ('max_health' defaults to
+                     'health'; 'magic' is needed for heal and special)
+        behaviors: Optional list of N compiled enemy behaviors (see
+                   behaviors_from_dicts); None = every enemy attacks
+
+    Returns:
+        Dictionary of arrays of length N:
+        'winner'        WINNER_PLAYER or WINNER_ENEMY
+        'turns'         turn number the battle ended on
+        'player_health' player health when the battle ended
+        'enemy_health'  enemy health when the battle ended
+        (Rewards are not applied - this is the state before gain_experience.)
+
+    Raises: CharacterDeadError if any player starts with 0 health
+    """
+    _require_numpy()
+
+    player_strength = np.asarray(player_stats["strength"], dtype=np.int64)
+    enemy_strength = np.asarray(enemy_stats["strength"], dtype=np.int64)
+    player_health = np.array(player_stats["health"], dtype=np.int64)
+    enemy_health = np.array(enemy_stats["health"], dtype=np.int64)
+
+    if np.any(player_health <= 0):
+        raise CharacterDeadError("Character is already dead and cannot fight.")
+
+    count = player_health.shape[0]
+    player_damage = batch_damage(player_strength, enemy_strength)
+    enemy_damage = batch_damage(enemy_strength, player_strength)
+
+    winner = np.zeros(count, dtype=np.int8)
+    turns = np.zeros(count, dtype=np.int64)
+
+    # Working copies for the battles still running. Finished battles are
+    # "parked" (no damage, unreachable health) so they drop out of the
+    # checks, and the arrays are only compacted once half of them are
+    # parked. Results are written back to the full arrays as battles end.
+    active = np.arange(count)
+    p_hp = player_health.copy()
+    e_hp = enemy_health.copy()
+    p_dmg = player_damage.copy()
+    e_dmg = enemy_damage.copy()
+    parked = 0
+    turn = 1
+
+    # Enemy AI state - only built when some enemy has behavior rules
+    ai = behaviors is not None and any(b is not None for b in behaviors)
+    if ai:
+        tables, kind, period = stack_behaviors(behaviors)
+        e_max = np.asarray(enemy_stats.get("max_health", enemy_health), dtype=np.int64).copy()
+        e_magic = np.asarray(enemy_stats.get("magic", np.zeros(count)), dtype=np.int64).copy()
+        heal = np.maximum(2 * e_magic, 1)
+        heals_left = np.full(count, ENEMY_HEAL_LIMIT, dtype=np.int64)
+        defending = np.zeros(count, dtype=bool)
+
+    while active.size > parked:
+        # Player attacks (a defending enemy takes half, at least 1)
+        if ai:
+            e_hp -= np.where(defending, np.maximum(p_dmg // 2, 1), p_dmg)
+        else:
+            e_hp -= p_dmg
+        won = np.flatnonzero(e_hp <= 0)
+        if won.size:
+            finished = active[won]
+            winner[finished] = WINNER_PLAYER
+            turns[finished] = turn
+            enemy_health[finished] = 0
+            player_health[finished] = p_hp[won]
+            _park(won, p_hp, e_hp, p_dmg, e_dmg)
+            parked += won.size
+
+        # Enemy acts in the battles still running
+        if ai:
+            running = p_dmg > 0
+            bucket = np.clip(e_hp * HP_BUCKETS // np.maximum(e_max, 1), 0, HP_BUCKETS)
+            action = tables[kind, bucket, turn % period]
+            defending = running & (action == ACTION_DEFEND)
+            healing = running & (action == ACTION_HEAL) & (heals_left > 0)
+            special = running & (action == ACTION_SPECIAL)
+
+            e_hp = np.where(healing, np.minimum(e_max, e_hp + heal), e_hp)
+            heals_left -= healing
+            p_hp -= np.where(defending | healing, 0, e_dmg + np.where(special, e_magic, 0))
+        else:
+            p_hp -= e_dmg
+        lost = np.flatnonzero(p_hp <= 0)
+        if lost.size:
+            finished = active[lost]
+            winner[finished] = WINNER_ENEMY
+            turns[finished] = turn
+            player_health[finished] = 0
+            enemy_health[finished] = e_hp[lost]
+            _park(lost, p_hp, e_hp, p_dmg, e_dmg)
+            parked += lost.size
+
+        if parked * 2 > active.size:
+            keep = p_dmg > 0
+            active, p_hp, e_hp = active[keep], p_hp[keep], e_hp[keep]
+            p_dmg, e_dmg = p_dmg[keep], e_dmg[keep]
+            if ai:
+                kind, e_max, e_magic, heal = kind[keep], e_max[keep], e_magic[keep], heal[keep]
+                heals_left, defending = heals_left[keep], defending[keep]
+            parked = 0
+
+        turn += 1
+
+    return {
+        "winner": winner,
+        "turns": turns,
+        "player_health": player_health,
+        "enemy_health": enemy_health,
+    }
+
+
+def behaviors_from_dicts(enemies):
+    """
+    Compiled behavior of each enemy dict (by its enemy_id) for resolve_battles
+    """
+    return [get_enemy_behavior(enemy.get("enemy_id")) for enemy in enemies]
+
+
+def stats_from_dicts(combatants):
+    """
+    Build a stats mapping of arrays from a list of character/enemy dicts
+    """
+    _require_numpy()
+    return {
+        key: np.array([c.get(key, c.get("health", 0) if key == "max_health" else 0)
+                       for c in combatants], dtype=np.int64)
+        for key in ("strength", "health", "max_health", "magic")
+    }
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATCH BATTLE TEST ===")
+
+    # players = {"strength": np.array([15, 8]), "health": np.array([120, 90])}
+    # enemies = {"strength": np.array([12, 25]), "health": np.array([80, 200])}
+    # print(resolve_battles(players, enemies))
@@ -0,0 +1,305 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Effects Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module tracks everything in a battle that happens "in N turns":
+ability cooldowns and status effects (poison, regen, buffs).
+
+Expiries and cooldowns go on a timer wheel keyed on turn number, so
+advancing a turn only looks at the slot for that turn. Poison and regen
+ticks are not stored per effect at all: effects with the same tick
+interval and phase are summed into one rate per target, so a turn costs
+one update per ticking (rate, target) pair plus whatever expires, even
+with hundreds of effects active.
+"""
+
+from heapq import heappush, heappop
+
+# Turns the wheel covers directly; anything further out waits in a heap
+WHEEL_SIZE = 32
+
+# Status effect kinds
+POISON = "poison"     # lose amount health per tick
+REGEN = "regen"       # gain amount health per tick (up to max_health)
+BUFF = "buff"         # stat += amount until the effect expires
+EFFECT_KINDS = (POISON, REGEN, BUFF)
+
+# What a timer wheel entry is for
+_EXPIRE = 0
+_COOLDOWN = 1
+
+# ============================================================================
+# TIMER WHEEL
+# ============================================================================
+
+class TimerWheel:
+    """
+    Schedules items for a future turn; advance() returns the ones due
+
+    Turns only move forward one at a time, and items within WHEEL_SIZE
+    turns go straight into that turn's slot. Items further away wait in
+    a heap and drop into the wheel once they come into range.
+    """
+
+    def __init__(self, start_turn=0, size=WHEEL_SIZE):
+        """Start an empty wheel at start_turn"""
+        self.size = size
+        self.current_turn = start_turn
+        self.slots = [[] for _ in range(size)]
+        self.overflow = []    # heap of (turn, sequence, item)
+        self._sequence = 0
+        self.pending = 0
+
+    def schedule(self, turn, item):
+        """
+        Run item on a future turn
+
+        Raises: ValueError if turn is not after the current turn
+        """
+        delay = turn - self.current_turn
+        if delay <= 0:
+            raise ValueError("Can only schedule for a future turn")
+
+        if delay < self.size:
+            self.slots[turn % self.size].append(item)
+        else:
+            heappush(self.overflow, (turn, self._sequence, item))
+            self._sequence += 1
+        self.pending += 1
+
+    def advance(self):
+        """
+        Move to the next turn
+
+        Returns: List of items scheduled for that turn
+        """
+        self.current_turn += 1
+        turn = self.current_turn
+        index = turn % self.size
+        due = self.slots[index]
+        if due:
+            self.slots[index] = []
+
+        # Far-away items that are now close enough join the wheel
+        overflow = self.overflow
+        while overflow and overflow[0][0] - turn < self.size:
+            item_turn, _, item = heappop(overflow)
+            if item_turn == turn:
+                due.append(item)
+            else:
+                self.slots[item_turn % self.size].append(item)
+
+        self.pending -= len(due)
+        return due
+
+# ============================================================================
+# STATUS EFFECTS AND COOLDOWNS
+# ============================================================================
+
+class StatusEffect:
+    """One active poison / regen / buff on a target"""
+
+    __slots__ = ("kind", "target", "amount", "interval", "phase", "expires",
+                 "stat", "active")
+
+    def __init__(self, kind, target, amount, interval, phase, expires, stat):
+        """Store the effect's settings"""
+        self.kind = kind
+        self.target = target
+        self.amount = amount
+        self.interval = interval
+        self.phase = phase
+        self.expires = expires
+        self.stat = stat
+        self.active = True
+
+
+class BattleEffects:
+    """
+    Cooldowns and status effects for one battle
+
+    current_turn follows the battle's turn_counter; call advance_turn()
+    once at the start of every new turn.
+    """
+
+    def __init__(self, start_turn=1):
+        """Start with nothing active"""
+        self.wheel = TimerWheel(start_turn)
+        # Poison/regen summed into tick rates: an effect every `interval`
+        # turns ticks when turn % interval == phase, so each group is
+        # (interval, phase) -> {id(target): [target, health change, effect count]}
+        self.rates = {}
+        self.effects = set()
+        self.cooldowns = {}   # (id(owner), ability) -> turn it is ready again
+
+    @property
+    def current_turn(self):
+        """Turn the effects have been advanced to"""
+        return self.wheel.current_turn
+
+    def is_idle(self):
+        """True when nothing is active or scheduled"""
+        return self.wheel.pending == 0 and not self.effects
+
+    # ------------------------------------------------------------------
+    # Cooldowns
+    # ------------------------------------------------------------------
+
+    def start_cooldown(self, owner, ability, turns, on_ready=None):
+        """
+        Put an ability on cooldown for a number of turns
+
+        on_ready() is called at the start of the turn it can be used again.
+        """
+        ready_turn = self.current_turn + turns
+        self.cooldowns[(id(owner), ability)] = ready_turn
+        self.wheel.schedule(ready_turn, (_COOLDOWN, (owner, ability, on_ready)))
+
+    def cooldown_remaining(self, owner, ability):
+        """Turns until an ability is ready (0 if ready now)"""
+        ready_turn = self.cooldowns.get((id(owner), ability))
+        if ready_turn is None:
+            return 0
+        return max(0, ready_turn - self.current_turn)
+
+    # ------------------------------------------------------------------
+    # Status effects
+    # ------------------------------------------------------------------
+
+    def add_effect(self, target, kind, amount, duration, interval=1, stat="strength"):
+        """
+        Start a status effect on a character or enemy
+
+        Args:
+            target: Character or enemy dictionary
+            kind: POISON, REGEN or BUFF
+            amount: Health per tick (poison/regen) or stat bonus (buff)
+            duration: Turns the effect lasts (until turn current_turn + duration)
+            interval: Ticks every this many turns (poison/regen); a tick
+                      that lands on the last turn still happens
+            stat: Stat a buff changes
+
+        Returns: The StatusEffect (pass it to remove_effect to end it early)
+        Raises: ValueError for an unknown kind or non-positive duration
+        """
+        if kind not in EFFECT_KINDS:
+            raise ValueError(f"Unknown effect kind: {kind}")
+        if duration <= 0 or interval <= 0:
+            raise ValueError("Effect duration and interval must be positive")
+
+        turn = self.current_turn
+        effect = StatusEffect(kind, target, amount, interval, turn % interval,
+                              turn + duration, stat)
+        self.effects.add(effect)
+
+        if kind == BUFF:
+            target[stat] = target.get(stat, 0) + amount
+        else:
+            self._change_rate(effect, 1)
+
+        self.wheel.schedule(effect.expires, (_EXPIRE, effect))
+        return effect
+
+    def remove_effect(self, effect):
+        """End an effect early (buffs are taken back off)"""
+        if not effect.active:
+            return
+        effect.active = False
+        if effect.kind == BUFF:
+            target = effect.target
+            target[effect.stat] = target.get(effect.stat, 0) - effect.amount
+        else:
+            self._change_rate(effect, -1)
+        self.effects.discard(effect)
+
+    def clear(self):
+        """End every effect (call when the battle is over)"""
+        for effect in list(self.effects):
+            self.remove_effect(effect)
+
+    def advance_turn(self):
+        """
+        Move to the next turn and apply whatever happens on it
+
+        Returns: List of (target, health change) for targets whose
+                 health was changed by poison or regen this turn
+        """
+        due = self.wheel.advance()
+        turn = self.current_turn
+
+        # Health change per target from every rate group ticking this turn
+        changes = {}
+        for (interval, phase), group in self.rates.items():
+            if turn % interval != phase:
+                continue
+            for key, entry in group.items():
+                total = changes.get(key)
+                if total is None:
+                    changes[key] = [entry[0], entry[1]]
+                else:
+                    total[1] += entry[1]
+
+        applied = []
+        for target, change in changes.values():
+            if change:
+                applied.append(self._apply_health_change(target, change))
+
+        # Expiries come after the ticks so an effect's last tick still lands
+        for kind, data in due:
+            if kind == _EXPIRE:
+                self.remove_effect(data)
+            else:
+                owner, ability, on_ready = data
+                if self.cooldowns.get((id(owner), ability)) == turn:
+                    del self.cooldowns[(id(owner), ability)]
+                    if on_ready is not None:
+                        on_ready()
+
+        return applied
+
+    def _apply_health_change(self, target, change):
+        """Change health within 0..max_health; returns (target, actual change)"""
+        before = target.get("health", 0)
+        health = before + change
+        health = max(0, min(target.get("max_health", health), health))
+        target["health"] = health
+        return target, health - before
+
+    def _change_rate(self, effect, count):
+        """Add (count=1) or take away (count=-1) a poison/regen tick rate"""
+        change = -effect.amount if effect.kind == POISON else effect.amount
+        group_key = (effect.interval, effect.phase)
+        group = self.rates.get(group_key)
+        if group is None:
+            group = self.rates[group_key] = {}
+
+        key = id(effect.target)
+        entry = group.get(key)
+        if entry is None:
+            entry = group[key] = [effect.target, 0, 0]
+        entry[1] += change * count
+        entry[2] += count
+
+        if entry[2] == 0:
+            del group[key]
+            if not group:
+                del self.rates[group_key]
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE EFFECTS TEST ===")
+
+    # goblin = {"name": "Goblin", "health": 50, "max_health": 50}
+    # effects = BattleEffects()
+    # effects.add_effect(goblin, POISON, 5, duration=3)
+    # for _ in range(4):
+    #     print(effects.advance_turn(), goblin["health"])
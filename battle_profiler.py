@@ -0,0 +1,187 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Profiler Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module times where SimpleBattle spends its time. Pass a
+BattleProfiler to SimpleBattle(profiler=...) and it swaps timed
+wrappers in for the battle's hot methods on that one battle object:
+
+    setup         SimpleBattle.__init__
+    turn          play_turn (one full player + enemy turn)
+    fast_forward  fast_forward (a whole attack-only battle in one step)
+    damage        calculate_damage
+    end_check     check_battle_end
+    rewards       apply_rewards (gain_experience + add_gold)
+    display       every event sent to the sink (rendering)
+
+Phases nest: a turn's time includes its damage, end checks and display.
+Battles created without a profiler keep the plain methods, so disabled
+profiling costs nothing but two None checks in __init__.
+
+Timings go into log2 histograms: bucket b counts calls that took
+between 2**(b-1) and 2**b - 1 nanoseconds.
+"""
+
+import time
+
+PHASES = ("setup", "turn", "fast_forward", "damage", "end_check", "rewards", "display")
+
+# Methods wrapped on the battle for each phase (setup is timed directly)
+PHASE_METHODS = {
+    "turn": "play_turn",
+    "fast_forward": "fast_forward",
+    "damage": "calculate_damage",
+    "end_check": "check_battle_end",
+    "rewards": "apply_rewards",
+}
+
+# Enough buckets for anything under about 9 seconds
+BUCKETS = 64
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+
+class BattleProfiler:
+    """
+    Per-phase call counts, total time and log2 latency histograms
+
+    One profiler can be shared by any number of battles.
+    """
+
+    def __init__(self):
+        """Start with empty histograms"""
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        self.counts = {phase: 0 for phase in PHASES}
+        self.total_ns = {phase: 0 for phase in PHASES}
+        self.max_ns = {phase: 0 for phase in PHASES}
+        self.buckets = {phase: [0] * BUCKETS for phase in PHASES}
+
+    def record(self, phase, elapsed_ns):
+        """Add one timing (in nanoseconds) to a phase"""
+        self.counts[phase] += 1
+        self.total_ns[phase] += elapsed_ns
+        if elapsed_ns > self.max_ns[phase]:
+            self.max_ns[phase] = elapsed_ns
+        self.buckets[phase][min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+
+    def timed(self, phase, function):
+        """Wrap function so every call is recorded under phase"""
+        record = self.record
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(phase, clock() - started)
+
+        return wrapper
+
+    def instrument(self, battle, setup_started):
+        """
+        Install timed methods on one SimpleBattle (called by its __init__)
+
+        setup_started: perf_counter_ns() taken at the top of __init__
+        """
+        self.record("setup", time.perf_counter_ns() - setup_started)
+        for phase, name in PHASE_METHODS.items():
+            setattr(battle, name, self.timed(phase, getattr(battle, name)))
+        if battle._emit is not None:
+            battle._emit = self.timed("display", battle._emit)
+
+    def merge(self, other):
+        """Add another profiler's timings into this one"""
+        for phase in PHASES:
+            self.counts[phase] += other.counts[phase]
+            self.total_ns[phase] += other.total_ns[phase]
+            self.max_ns[phase] = max(self.max_ns[phase], other.max_ns[phase])
+            for bucket, count in enumerate(other.buckets[phase]):
+                self.buckets[phase][bucket] += count
+        return self
+
+    def histogram(self, phase):
+        """
+        Non-empty buckets for one phase
+
+        Returns: Dictionary {upper bound in ns: count}; a call that took
+                 t ns is counted under the smallest power of two > t
+        """
+        return {1 << bucket: count
+                for bucket, count in enumerate(self.buckets[phase]) if count}
+
+    def percentile_ns(self, phase, fraction):
+        """
+        Approximate percentile from the histogram (bucket upper bound)
+
+        Returns: Nanoseconds (0 if the phase has no calls)
+        """
+        total = self.counts[phase]
+        if total == 0:
+            return 0
+        needed = fraction * total
+        seen = 0
+        for bucket, count in enumerate(self.buckets[phase]):
+            seen += count
+            if seen >= needed:
+                return min(1 << bucket, self.max_ns[phase])
+        return self.max_ns[phase]
+
+    def summary(self):
+        """
+        Summary of every phase that was called
+
+        Returns: Dictionary {phase: {'count', 'total_ns', 'mean_ns',
+                 'p50_ns', 'p95_ns', 'max_ns'}}
+        """
+        result = {}
+        for phase in PHASES:
+            count = self.counts[phase]
+            if count == 0:
+                continue
+            result[phase] = {
+                "count": count,
+                "total_ns": self.total_ns[phase],
+                "mean_ns": self.total_ns[phase] / count,
+                "p50_ns": self.percentile_ns(phase, 0.50),
+                "p95_ns": self.percentile_ns(phase, 0.95),
+                "max_ns": self.max_ns[phase],
+            }
+        return result
+
+
+def display_profile(profiler):
+    """
+    Display a table of per-phase timings
+    """
+    print(f"\n{'Phase':<14}{'Calls':>9}{'Total ms':>11}{'Mean us':>10}"
+          f"{'p50 us':>9}{'p95 us':>9}{'Max us':>10}")
+    for phase, stats in profiler.summary().items():
+        print(f"{phase:<14}{stats['count']:>9}{stats['total_ns'] / 1e6:>11.2f}"
+              f"{stats['mean_ns'] / 1e3:>10.2f}{stats['p50_ns'] / 1e3:>9.2f}"
+              f"{stats['p95_ns'] / 1e3:>9.2f}{stats['max_ns'] / 1e3:>10.2f}")
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE PROFILER TEST ===")
+
+    # from character_manager import create_character
+    # from combat_system import SimpleBattle, create_enemy, ListBattleSink
+    # profiler = BattleProfiler()
+    # for _ in range(1000):
+    #     SimpleBattle(create_character("Hero", "Warrior"), create_enemy("orc"),
+    #                  sink=ListBattleSink(), profiler=profiler).start_battle()
+    # display_profile(profiler)
@@ -0,0 +1,296 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Replay Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module stores battles as small binary replays and re-runs them.
+A SimpleBattle created with record=True keeps its seed, both sides'
+starting stats and every player action. Since all of the battle's
+randomness comes from its own seeded RNG, that is enough to replay it
+exactly.
+
+Replay layout (little endian, version 3):
+    header   b"QCRP", version (1 byte), flags (1 byte)
+    seed     1 byte length + the seed as a signed integer of that many
+             bytes (any int seed is stored in full)
+    strings  character name, class, enemy name, enemy type - 1 byte
+             length + utf-8
+    stats    character: level, experience, gold, health, max_health,
+             strength, magic (4 each)
+             enemy: health, max_health, strength, magic, xp_reward,
+             gold_reward (4 each)
+    actions  count (4 bytes), then 2 bits per action, 4 per byte - one
+             per player turn, default attacks included (only when flags
+             has FLAG_SCRIPTED, i.e. the battle had player turns;
+             without it every turn replays as an attack)
+
+Versions 1 and 2 (still readable) had a 4 byte seed in the header and
+a 2 byte level; version 1 also had no enemy type.
+
+A typical replay is well under 100 bytes. The enemy type lets a replay
+roll the same loot; replays start with an empty inventory, so loot that
+overflowed a full inventory in the original battle will fit in the
+replay.
+"""
+
+import struct
+
+from custom_exceptions import CorruptedDataError
+
+from combat_system import SimpleBattle, NULL_SINK
+
+REPLAY_MAGIC = b"QCRP"
+REPLAY_VERSION = 3
+
+# Versions decode_replay still reads (1 = before enemy types were stored,
+# 1-2 = 32-bit seed and 16-bit level)
+READABLE_VERSIONS = (1, 2, 3)
+
+# Player turns were recorded, so the actions list follows
+FLAG_SCRIPTED = 1
+
+HEADER = struct.Struct("<4sBB")
+CHARACTER_STATS = struct.Struct("<IIIIIII")
+OLD_SEED = struct.Struct("<I")
+OLD_CHARACTER_STATS = struct.Struct("<HIIIIII")
+ENEMY_STATS = struct.Struct("<IIIIII")
+COUNT = struct.Struct("<I")
+
+ACTION_CODES = {"attack": 0, "ability": 1, "escape": 2}
+ACTION_NAMES = ("attack", "ability", "escape", "attack")
+
+CHARACTER_STAT_FIELDS = ("level", "experience", "gold", "health",
+                         "max_health", "strength", "magic")
+ENEMY_STAT_FIELDS = ("health", "max_health", "strength", "magic",
+                     "xp_reward", "gold_reward")
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def _pack_string(value):
+    """1 byte length + utf-8 (cut to 255 bytes)"""
+    data = str(value or "").encode("utf-8")[:255]
+    return bytes([len(data)]) + data
+
+
+def _pack_seed(seed):
+    """
+    1 byte length + the seed as a little endian signed integer
+
+    Raises: ValueError if the seed is not an int
+    """
+    if not isinstance(seed, int):
+        raise ValueError(f"Only int seeds can be stored in a replay, not {seed!r}")
+    data = seed.to_bytes(seed.bit_length() // 8 + 1, "little", signed=True)
+    if len(data) > 255:
+        raise ValueError("Battle seed is too large to store in a replay")
+    return bytes([len(data)]) + data
+
+
+def pack_actions(actions):
+    """
+    Pack a list of action names into 2 bits each
+
+    Unknown actions are stored as attacks (that's what SimpleBattle does).
+    """
+    packed = bytearray((len(actions) + 3) // 4)
+    for i, action in enumerate(actions):
+        packed[i >> 2] |= ACTION_CODES.get(action, 0) << ((i & 3) * 2)
+    return COUNT.pack(len(actions)) + bytes(packed)
+
+
+def encode_replay(battle):
+    """
+    Encode a recorded battle as replay bytes
+
+    Raises: ValueError if the battle wasn't created with record=True,
+            or its seed or a stat can't be stored (stats are 0 .. 2**32 - 1)
+    """
+    if battle.initial_state is None:
+        raise ValueError("Battle was not recorded (use record=True)")
+
+    character, enemy = battle.initial_state
+    # Every player turn is recorded, so this is only empty for battles
+    # that ended before the player acted
+    scripted = bool(battle.recorded_actions)
+    flags = FLAG_SCRIPTED if scripted else 0
+
+    try:
+        stats = [
+            CHARACTER_STATS.pack(*(int(character[key] or 0) for key in CHARACTER_STAT_FIELDS)),
+            ENEMY_STATS.pack(*(int(enemy[key] or 0) for key in ENEMY_STAT_FIELDS)),
+        ]
+    except struct.error as e:
+        raise ValueError("Battle stats don't fit in a replay (0 .. 2**32 - 1)") from e
+
+    parts = [
+        HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, flags),
+        _pack_seed(battle.seed),
+        _pack_string(character["name"]),
+        _pack_string(character["class"]),
+        _pack_string(enemy["name"]),
+        _pack_string(enemy.get("enemy_id")),
+    ] + stats
+    if scripted:
+        parts.append(pack_actions(battle.recorded_actions))
+    return b"".join(parts)
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+def _unpack_string(data, offset):
+    """Read a 1 byte length + utf-8 string; returns (string, new offset)"""
+    length = data[offset]
+    end = offset + 1 + length
+    if end > len(data):
+        raise CorruptedDataError("Replay is truncated")
+    return data[offset + 1:end].decode("utf-8"), end
+
+
+def unpack_actions(data, offset):
+    """Read a packed action list; returns (actions, new offset)"""
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    end = offset + (count + 3) // 4
+    if end > len(data):
+        raise CorruptedDataError("Replay is truncated")
+
+    actions = [ACTION_NAMES[(data[offset + (i >> 2)] >> ((i & 3) * 2)) & 3]
+               for i in range(count)]
+    return actions, end
+
+
+def decode_replay(data):
+    """
+    Decode replay bytes
+
+    Returns: Dictionary with 'seed', 'character', 'enemy' and 'actions'
+             (actions is None when no player actions were recorded)
+    Raises: CorruptedDataError if the bytes are not a valid replay
+    """
+    try:
+        magic, version, flags = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or version not in READABLE_VERSIONS:
+            raise CorruptedDataError("Not a Quest Chronicles replay")
+
+        offset = HEADER.size
+        if version >= 3:
+            length = data[offset]
+            end = offset + 1 + length
+            if end > len(data):
+                raise CorruptedDataError("Replay is truncated")
+            seed = int.from_bytes(data[offset + 1:end], "little", signed=True)
+            offset = end
+            character_stats = CHARACTER_STATS
+        else:
+            (seed,) = OLD_SEED.unpack_from(data, offset)
+            offset += OLD_SEED.size
+            character_stats = OLD_CHARACTER_STATS
+        name, offset = _unpack_string(data, offset)
+        character_class, offset = _unpack_string(data, offset)
+        enemy_name, offset = _unpack_string(data, offset)
+        enemy_id = ""
+        if version >= 2:
+            enemy_id, offset = _unpack_string(data, offset)
+
+        character = dict(zip(CHARACTER_STAT_FIELDS,
+                             character_stats.unpack_from(data, offset)))
+        offset += character_stats.size
+        enemy = dict(zip(ENEMY_STAT_FIELDS, ENEMY_STATS.unpack_from(data, offset)))
+        offset += ENEMY_STATS.size
+
+        actions = None
+        if flags & FLAG_SCRIPTED:
+            actions, offset = unpack_actions(data, offset)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise CorruptedDataError("Replay is truncated or damaged") from e
+
+    character["name"] = name
+    character["class"] = character_class
+    enemy["name"] = enemy_name
+    if enemy_id:
+        enemy["enemy_id"] = enemy_id
+    return {"seed": seed, "character": character, "enemy": enemy, "actions": actions}
+
+# ============================================================================
+# REPLAY ENGINE
+# ============================================================================
+
+def replay_battle(data, sink=NULL_SINK):
+    """
+    Re-run a battle from its replay bytes
+
+    Runs headless by default; pass sink=None to watch it in the console.
+
+    Returns: Tuple (result, character, enemy) - the battle result
+             dictionary and both sides as they ended the battle
+    Raises: CorruptedDataError if the replay is invalid
+    """
+    replay = decode_replay(data)
+    character = dict(replay["character"])
+    character.update({"inventory": [], "active_quests": [], "completed_quests": []})
+    enemy = dict(replay["enemy"])
+
+    action_source = None
+    if replay["actions"] is not None:
+        actions = iter(replay["actions"])
+        action_source = lambda battle: next(actions, "attack")
+
+    battle = SimpleBattle(character, enemy, sink=sink,
+                          action_source=action_source, seed=replay["seed"])
+    result = battle.start_battle()
+    return result, character, enemy
+
+
+def write_replays(path, replays):
+    """
+    Append replays to a replay log file (4 byte length prefix each)
+    """
+    with open(path, "ab") as f:
+        for data in replays:
+            f.write(COUNT.pack(len(data)))
+            f.write(data)
+
+
+def iter_replays(path):
+    """
+    Yield the replay bytes stored in a replay log file
+
+    Raises: CorruptedDataError if the file ends part-way through a replay
+    """
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(COUNT.size)
+            if not prefix:
+                return
+            if len(prefix) < COUNT.size:
+                raise CorruptedDataError("Replay log is truncated")
+            (length,) = COUNT.unpack(prefix)
+            data = f.read(length)
+            if len(data) < length:
+                raise CorruptedDataError("Replay log is truncated")
+            yield data
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE REPLAY TEST ===")
+
+    # from character_manager import create_character
+    # from combat_system import create_enemy
+    # hero = create_character("Hero", "Rogue")
+    # battle = SimpleBattle(hero, create_enemy("orc"), sink=NULL_SINK,
+    #                       action_source=lambda b: "ability", seed=42, record=True)
+    # battle.start_battle()
+    # data = encode_replay(battle)
+    # print(len(data), "bytes")
+    # print(replay_battle(data, sink=None))
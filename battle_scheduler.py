@@ -0,0 +1,291 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Scheduler Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module runs many SimpleBattles at once on one asyncio event loop.
+Each battle is stepped one turn at a time. Before every player turn the
+scheduler awaits that battle's action source (a player typing, an AI,
+a network message...). While one battle waits, the others keep going.
+
+If the action source doesn't answer within the turn timeout, the player
+does a basic attack so a quiet player can't stall a battle forever.
+Plain (blocking) action sources run in a worker thread so the same
+timeout applies to them.
+The scheduler records battle and decision latencies so a host can see
+how responsive it is.
+"""
+
+import asyncio
+import inspect
+import time
+
+# Seconds to wait for a player's action before attacking for them
+DEFAULT_TURN_TIMEOUT = 30.0
+
+# Action used when the action source times out
+TIMEOUT_ACTION = "attack"
+
+# ============================================================================
+# ACTION SOURCES
+# ============================================================================
+
+def queue_action_source(queue):
+    """
+    Action source that waits for actions put on an asyncio.Queue
+
+    Handy for human players: the input handler puts "attack", "ability"
+    or "escape" on the queue and the battle picks it up.
+
+    After a timeout the scheduler calls discard_pending(): whatever was
+    put for the missed turn is thrown away before the next turn waits,
+    so it isn't played a turn late.
+    """
+    stale = False
+
+    async def next_action(battle):
+        nonlocal stale
+        if stale:
+            stale = False
+            while not queue.empty():
+                queue.get_nowait()
+        return await queue.get()
+
+    def discard_pending():
+        nonlocal stale
+        stale = True
+
+    next_action.discard_pending = discard_pending
+    return next_action
+
+async def call_action_source(action_source, battle):
+    """
+    Get one action from a coroutine function or a plain function,
+    running a plain one in the loop's default thread pool
+    """
+    if inspect.iscoroutinefunction(action_source):
+        return await action_source(battle)
+
+    loop = asyncio.get_running_loop()
+    action = await loop.run_in_executor(None, action_source, battle)
+    if inspect.isawaitable(action):
+        action = await action
+    return action
+
+# ============================================================================
+# LATENCY METRICS
+# ============================================================================
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (0 if empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1,
+                      int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def summarize_latencies(values):
+    """p50 / p95 / p99 / max of a list of seconds"""
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": percentile(ordered, 0.50),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+class BattleMetrics:
+    """Latency and outcome counters for a scheduler"""
+
+    def __init__(self):
+        """Start with nothing recorded"""
+        self.battle_latencies = []     # seconds from first to last turn
+        self.decision_latencies = []   # seconds waiting for each action
+        self.turns = 0
+        self.timeouts = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def report(self):
+        """
+        Build a summary dictionary
+
+        Returns: Dictionary with completed, failed, turns, timeouts,
+                 battles_per_second, battle_latency and decision_latency
+                 (each latency has count, p50, p95, p99 and max in seconds)
+        """
+        elapsed = 0.0
+        if self.started_at is not None and self.finished_at is not None:
+            elapsed = self.finished_at - self.started_at
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "turns": self.turns,
+            "timeouts": self.timeouts,
+            "battles_per_second": self.completed / elapsed if elapsed > 0 else 0.0,
+            "battle_latency": summarize_latencies(self.battle_latencies),
+            "decision_latency": summarize_latencies(self.decision_latencies),
+        }
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class BattleScheduler:
+    """
+    Drives many SimpleBattles concurrently on one event loop
+    """
+
+    def __init__(self, turn_timeout=DEFAULT_TURN_TIMEOUT, max_concurrent=None):
+        """
+        turn_timeout: Seconds to wait for each action (None = forever)
+        max_concurrent: Most battles running at once (None = no limit)
+        """
+        self.turn_timeout = turn_timeout
+        self.max_concurrent = max_concurrent
+        self.metrics = BattleMetrics()
+
+    async def next_action(self, battle, action_source):
+        """
+        Await the player's action for this turn (or time out)
+
+        action_source(battle) may be a coroutine function or a plain
+        function (run in a worker thread; one that times out keeps its
+        thread until it returns, and its answer is ignored). None means
+        the battle's own action_source / attack.
+
+        On a timeout, action_source.discard_pending() is called if the
+        source has one (see queue_action_source).
+        """
+        if action_source is None:
+            return None
+
+        started = time.perf_counter()
+        try:
+            action = await asyncio.wait_for(call_action_source(action_source, battle),
+                                            self.turn_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            action = TIMEOUT_ACTION
+            discard_pending = getattr(action_source, "discard_pending", None)
+            if discard_pending is not None:
+                discard_pending()
+        self.metrics.decision_latencies.append(time.perf_counter() - started)
+        return action
+
+    async def run_battle(self, battle, action_source=None):
+        """
+        Run one battle turn by turn, yielding to the event loop each turn
+
+        Returns: The battle's result dictionary (see SimpleBattle.start_battle)
+        Raises: Whatever the battle raises (e.g. CharacterDeadError)
+        """
+        metrics = self.metrics
+        started = time.perf_counter()
+        try:
+            battle.begin_battle()
+            winner = None
+            while winner is None:
+                action = await self.next_action(battle, action_source)
+                winner = battle.play_turn(action)
+                metrics.turns += 1
+                if action_source is None:
+                    # Nothing to wait for - still let other battles run
+                    await asyncio.sleep(0)
+            result = battle.end_battle(winner)
+        except Exception:
+            metrics.failed += 1
+            raise
+
+        metrics.completed += 1
+        metrics.battle_latencies.append(time.perf_counter() - started)
+        return result
+
+    async def run_all(self, battles, action_source=None):
+        """
+        Run every battle concurrently
+
+        Args:
+            battles: List of SimpleBattle objects
+            action_source: One action source for every battle, or a list
+                           with one per battle
+
+        Returns: List of results in the same order as battles; a battle
+                 that raised has its exception in its place
+        """
+        if isinstance(action_source, (list, tuple)):
+            sources = list(action_source)
+        else:
+            sources = [action_source] * len(battles)
+
+        limit = None
+        if self.max_concurrent is not None:
+            limit = asyncio.Semaphore(self.max_concurrent)
+
+        async def run_one(battle, source):
+            if limit is None:
+                return await self.run_battle(battle, source)
+            async with limit:
+                return await self.run_battle(battle, source)
+
+        self.metrics.started_at = time.perf_counter()
+        results = await asyncio.gather(
+            *(run_one(battle, source) for battle, source in zip(battles, sources)),
+            return_exceptions=True
+        )
+        self.metrics.finished_at = time.perf_counter()
+        return results
+
+
+def run_battles(battles, action_source=None, turn_timeout=DEFAULT_TURN_TIMEOUT,
+                max_concurrent=None):
+    """
+    Run battles on a fresh event loop (for callers that aren't async)
+
+    Returns: Tuple (results, metrics report)
+    """
+    scheduler = BattleScheduler(turn_timeout, max_concurrent)
+    results = asyncio.run(scheduler.run_all(battles, action_source))
+    return results, scheduler.metrics.report()
+
+
+def display_metrics(report):
+    """
+    Display a latency report from BattleMetrics.report()
+    """
+    print(f"\nBattles: {report['completed']} completed, {report['failed']} failed")
+    print(f"Turns: {report['turns']}  Timeouts: {report['timeouts']}")
+    print(f"Throughput: {report['battles_per_second']:.1f} battles/s")
+    for label in ("battle_latency", "decision_latency"):
+        stats = report[label]
+        print(f"{label}: p50 {stats['p50'] * 1000:.1f} ms, p95 {stats['p95'] * 1000:.1f} ms, "
+              f"p99 {stats['p99'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms")
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE SCHEDULER TEST ===")
+
+    # from character_manager import create_character
+    # from combat_system import SimpleBattle, create_enemy, NULL_SINK
+    #
+    # async def slow_ai(battle):
+    #     await asyncio.sleep(0.01)
+    #     return "attack"
+    #
+    # battles = [SimpleBattle(create_character(f"P{i}", "Warrior"), create_enemy("orc"),
+    #                         sink=NULL_SINK) for i in range(1000)]
+    # results, report = run_battles(battles, slow_ai, turn_timeout=1.0)
+    # display_metrics(report)
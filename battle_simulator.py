@@ -0,0 +1,325 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Simulator Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module runs large numbers of headless SimpleBattle fights for
+balance work. Every class x enemy x level combination is split into
+chunks that run on a process pool. Each chunk gets its own RNG seed
+derived from the master seed, so the same seed always gives the same
+statistics no matter how many workers are used.
+"""
+
+import os
+import random
+from multiprocessing import Pool
+
+from character_manager import create_character, gain_experience, list_character_classes
+from combat_system import (SimpleBattle, create_enemy_for_level, get_enemy_catalog,
+                           get_enemy_prototype, NULL_SINK)
+
+# Battles run per pool task
+CHUNK_SIZE = 500
+
+# Remaining-HP distribution uses 10% buckets: 0 (dead) .. 10 (full health)
+HP_BUCKETS = 10
+
+# ============================================================================
+# PLAYER POLICIES
+# ============================================================================
+
+def policy_attack(battle):
+    """Always use a basic attack"""
+    return "attack"
+
+
+def policy_ability(battle):
+    """Use the special ability whenever it is ready, otherwise attack"""
+    if battle.character.get("ability_on_cooldown", False):
+        return "attack"
+    return "ability"
+
+
+def policy_cautious(battle):
+    """Like policy_ability, but try to run away below 25% health"""
+    character = battle.character
+    if character["health"] * 4 < character["max_health"]:
+        return "escape"
+    return policy_ability(battle)
+
+
+POLICIES = {
+    "attack": policy_attack,
+    "ability": policy_ability,
+    "cautious": policy_cautious,
+}
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def build_character(character_class, level, base_stats=None):
+    """
+    Create a fresh character and level it up to the given level
+
+    base_stats optionally replaces the class's level-1 stats
+    ({'health': .., 'strength': .., 'magic': ..}) before leveling.
+    Uses gain_experience so stats grow exactly as they do in the game.
+    """
+    character = create_character(f"Sim{character_class}", character_class)
+    if base_stats:
+        character.update(base_stats)
+        if "health" in base_stats:
+            character["max_health"] = base_stats["health"]
+    if level > 1:
+        # XP needed from level 1 to `level`: 100 * (1 + 2 + ... + (level - 1))
+        gain_experience(character, 100 * level * (level - 1) // 2)
+    return character
+
+
+def copy_character(template):
+    """
+    Fresh copy of a built character for one battle
+
+    inventory and the quest lists are copied too, so loot and other
+    changes from one battle never carry over into the next.
+    """
+    character = dict(template)
+    for key in ("inventory", "active_quests", "completed_quests"):
+        if key in character:
+            character[key] = character[key].copy()
+    return character
+
+
+def _new_stats():
+    """Empty statistics for one combination"""
+    return {
+        "battles": 0,
+        "wins": 0,
+        "losses": 0,
+        "escapes": 0,
+        "total_turns": 0,
+        "turn_histogram": {},
+        "hp_histogram": [0] * (HP_BUCKETS + 1),
+    }
+
+
+def merge_stats(total, part):
+    """Add the statistics in part into total"""
+    for key in ("battles", "wins", "losses", "escapes", "total_turns"):
+        total[key] += part[key]
+    for turns, count in part["turn_histogram"].items():
+        total["turn_histogram"][turns] = total["turn_histogram"].get(turns, 0) + count
+    for bucket, count in enumerate(part["hp_histogram"]):
+        total["hp_histogram"][bucket] += count
+    return total
+
+
+def chunk_seed(seed, combo, chunk_index):
+    """Seed string for one chunk - independent stream per chunk"""
+    character_class, enemy_type, level = combo
+    return f"{seed}:{character_class}:{enemy_type}:{level}:{chunk_index}"
+
+
+def build_enemy(enemy_type, level=1, stats=None):
+    """
+    Create an enemy scaled to a character level, optionally with
+    replacement base stats ({'health': .., 'strength': .., 'magic': ..})
+
+    The replacement stats take the place of the data-file base stats,
+    and the type's per-level growth is still added on top of them.
+    """
+    enemy = create_enemy_for_level(enemy_type, level)
+    if stats:
+        base = get_enemy_prototype(enemy_type)
+        for stat, value in stats.items():
+            enemy[stat] = value + enemy[stat] - base[stat]
+        enemy["max_health"] = enemy["health"]
+    return enemy
+
+
+def run_chunk(task):
+    """
+    Run one chunk of battles for a single combination
+
+    Args:
+        task: (combo, chunk_index, count, seed, policy_name,
+               class_stats, enemy_stats) - the stats are None or
+              dictionaries replacing the data-file stats
+
+    Returns: (combo, stats)
+    """
+    (combo, chunk_index, count, seed, policy_name,
+     class_stats, enemy_stats) = task
+    character_class, enemy_type, level = combo
+    policy = POLICIES[policy_name]
+
+    # Each battle gets its own seed from this chunk's RNG stream
+    rng = random.Random(chunk_seed(seed, combo, chunk_index))
+
+    stats = _new_stats()
+    template = build_character(character_class, level, class_stats)
+    for _ in range(count):
+        character = copy_character(template)
+        enemy = build_enemy(enemy_type, level, enemy_stats)
+        result = SimpleBattle(character, enemy, sink=NULL_SINK, action_source=policy,
+                              seed=rng.getrandbits(32)).start_battle()
+
+        stats["battles"] += 1
+        winner = result["winner"]
+        if winner == "player":
+            stats["wins"] += 1
+        elif winner == "enemy":
+            stats["losses"] += 1
+        else:
+            stats["escapes"] += 1
+
+        turns = result["turns"]
+        stats["total_turns"] += turns
+        stats["turn_histogram"][turns] = stats["turn_histogram"].get(turns, 0) + 1
+
+        bucket = character["health"] * HP_BUCKETS // character["max_health"]
+        stats["hp_histogram"][bucket] += 1
+
+    return combo, stats
+
+
+def config_combos(config):
+    """
+    Every (class, enemy, level) combination a simulation config asks for
+    """
+    classes = config.get("classes") or list_character_classes()
+    enemies = config.get("enemies") or list(get_enemy_catalog())
+    levels = config.get("levels") or [1]
+    return [(character_class, enemy_type.lower(), level)
+            for character_class in classes
+            for enemy_type in enemies
+            for level in levels]
+
+
+def build_tasks(combos, n, seed, policy_name="attack", class_stats=None, enemy_stats=None):
+    """
+    Split combinations into chunk tasks
+
+    class_stats / enemy_stats: optional {class or enemy_id: stats dict}
+    overrides, passed along with each task so worker processes use them
+
+    Returns: List of (combo, chunk_index, count, seed, policy_name,
+                      class_stats, enemy_stats)
+    """
+    if policy_name not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy_name}")
+    class_stats = class_stats or {}
+    enemy_stats = enemy_stats or {}
+
+    tasks = []
+    for combo in combos:
+        character_class, enemy_type, level = combo
+        overrides = (class_stats.get(character_class), enemy_stats.get(enemy_type))
+        remaining = n
+        chunk_index = 0
+        while remaining > 0:
+            count = min(CHUNK_SIZE, remaining)
+            tasks.append((combo, chunk_index, count, seed, policy_name) + overrides)
+            remaining -= count
+            chunk_index += 1
+    return tasks
+
+
+def summarize_stats(stats):
+    """Add win rate and average turns to a combination's statistics"""
+    battles = stats["battles"]
+    stats["win_rate"] = stats["wins"] / battles if battles else 0.0
+    stats["avg_turns"] = stats["total_turns"] / battles if battles else 0.0
+    return stats
+
+
+def simulate_battles(config, n, workers=None, seed=0):
+    """
+    Simulate n battles for every class x enemy x level combination.
+
+    Args:
+        config: Dictionary with optional keys
+                'classes' (default: every registry class),
+                'enemies' (default: every enemy in the catalog),
+                'levels'  (default: [1]),
+                'policy'  ("attack", "ability" or "cautious"),
+                'class_stats' / 'enemy_stats' ({name: stats dict} to
+                          replace data-file stats, e.g. for balancing)
+        n: Battles per combination
+        workers: Worker processes (None = one per CPU, 1 = no pool)
+        seed: Master seed - same seed gives the same results
+
+    Returns:
+        Dictionary {(class, enemy, level): stats} where stats has
+        battles, wins, losses, escapes, win_rate, avg_turns,
+        turn_histogram {turns: count} and hp_histogram (11 buckets of
+        remaining health, 0 = dead .. 10 = full)
+    Raises: InvalidCharacterClassError / InvalidTargetError for bad names
+    """
+    return simulate_combos(config_combos(config), n, workers, seed,
+                           config.get("policy", "attack"),
+                           config.get("class_stats"), config.get("enemy_stats"))
+
+
+def simulate_combos(combos, n, workers=None, seed=0, policy_name="attack",
+                    class_stats=None, enemy_stats=None, pool=None):
+    """
+    Simulate n battles for each (class, enemy, level) combination in combos
+
+    pool: Optional multiprocessing Pool to reuse (workers is then ignored)
+
+    Returns: Dictionary {(class, enemy, level): stats} (see simulate_battles)
+    """
+    tasks = build_tasks(combos, n, seed, policy_name, class_stats, enemy_stats)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    results = {}
+    own_pool = None
+    if pool is not None:
+        chunk_results = pool.imap_unordered(run_chunk, tasks)
+    elif workers <= 1:
+        chunk_results = map(run_chunk, tasks)
+    else:
+        own_pool = Pool(processes=workers)
+        chunk_results = own_pool.imap_unordered(run_chunk, tasks)
+
+    try:
+        for combo, stats in chunk_results:
+            merge_stats(results.setdefault(combo, _new_stats()), stats)
+    finally:
+        if own_pool is not None:
+            own_pool.close()
+            own_pool.join()
+
+    for stats in results.values():
+        summarize_stats(stats)
+    return results
+
+
+def display_simulation_results(results):
+    """
+    Display a table of simulation results
+    """
+    print(f"\n{'Class':<10}{'Enemy':<10}{'Lvl':>4}{'Win %':>8}{'Turns':>8}{'Runs':>8}")
+    for (character_class, enemy_type, level), stats in sorted(results.items()):
+        print(f"{character_class:<10}{enemy_type:<10}{level:>4}"
+              f"{stats['win_rate'] * 100:>8.1f}{stats['avg_turns']:>8.2f}"
+              f"{stats['battles']:>8}")
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE SIMULATOR TEST ===")
+
+    # results = simulate_battles({"levels": [1, 3, 6], "policy": "ability"},
+    #                            n=2000, seed=42)
+    # display_simulation_results(results)
@@ -0,0 +1,68 @@
+"""
+Benchmark - a 10,000 fight grind
+
+Compares auto_grind with the explore() loop it replaces: a new enemy
+and a headless SimpleBattle for every fight, plus the autosave the game
+loop does after each one. The explore loop levels up between fights
+(and meets tougher enemies); auto_grind levels up once at the end.
+
+Run from the repository root:
+    python benchmarks/bench_auto_grind.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import auto_grind
+import character_manager
+import combat_system
+
+FIGHTS = 10000
+
+
+def make_hero():
+    """A Warrior strong enough to survive the whole grind"""
+    hero = character_manager.create_character("Grinder", "Warrior")
+    hero["strength"] = 100
+    return hero
+
+
+def run_explore_loop(save_directory):
+    """Baseline: one battle and one save per fight"""
+    hero = make_hero()
+    rng = random.Random(1)
+    for _ in range(FIGHTS):
+        enemy = combat_system.get_random_enemy_for_level(hero["level"], rng)
+        combat_system.SimpleBattle(hero, enemy, sink=combat_system.NULL_SINK).start_battle()
+        character_manager.save_character(hero, save_directory)
+    return hero
+
+
+def run_auto_grind(save_directory):
+    """auto_grind, then a single save"""
+    hero = make_hero()
+    auto_grind.auto_grind(hero, FIGHTS, rng=random.Random(1))
+    character_manager.save_character(hero, save_directory)
+    return hero
+
+
+def main():
+    """Time both approaches"""
+    print(f"{FIGHTS} fights\n")
+    with tempfile.TemporaryDirectory() as save_directory:
+        for label, runner in (("explore loop", run_explore_loop),
+                              ("auto_grind", run_auto_grind)):
+            start = time.perf_counter()
+            hero = runner(save_directory)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<14} {elapsed * 1000:>10.1f} ms   "
+                  f"level {hero['level']}, {hero['gold']} gold")
+
+
+if __name__ == "__main__":
+    main()
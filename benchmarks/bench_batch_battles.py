@@ -0,0 +1,63 @@
+"""
+Benchmark - scalar SimpleBattle vs NumPy batch resolver
+
+Generates N random basic-attack battles, resolves them one at a time with
+headless SimpleBattle and all at once with battle_batch.resolve_battles,
+checks the results agree and prints the speedup.
+
+Run from the repository root (needs NumPy):
+    python benchmarks/bench_batch_battles.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import battle_batch
+import combat_system
+
+N = 100000
+
+
+def random_combatant(rng, name):
+    """Random basic stats (no rewards so health isn't restored by level-ups)"""
+    health = rng.randint(20, 400)
+    return {"name": name, "health": health, "max_health": health,
+            "strength": rng.randint(1, 40), "magic": rng.randint(0, 20),
+            "level": 1, "experience": 0, "gold": 0}
+
+
+def main():
+    """Run both engines and compare"""
+    rng = random.Random(1)
+    players = [random_combatant(rng, "Hero") for _ in range(N)]
+    enemies = [random_combatant(rng, "Foe") for _ in range(N)]
+    player_stats = battle_batch.stats_from_dicts(players)
+    enemy_stats = battle_batch.stats_from_dicts(enemies)
+
+    start = time.perf_counter()
+    scalar_turns = []
+    for player, enemy in zip(players, enemies):
+        result = combat_system.SimpleBattle(dict(player), dict(enemy),
+                                            sink=combat_system.NULL_SINK).start_battle()
+        scalar_turns.append(result["turns"])
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = battle_batch.resolve_battles(player_stats, enemy_stats)
+    batch_time = time.perf_counter() - start
+
+    assert np.array_equal(batch["turns"], np.array(scalar_turns))
+    print(f"{N} battles")
+    print(f"{'scalar SimpleBattle':<22} {scalar_time:>8.3f} s")
+    print(f"{'NumPy batch':<22} {batch_time:>8.3f} s")
+    print(f"speedup: {scalar_time / batch_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
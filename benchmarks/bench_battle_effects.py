@@ -0,0 +1,96 @@
+"""
+Benchmark - status effect turns with hundreds of active effects
+
+Compares BattleEffects (timer wheel + per-target totals) with the
+simple approach of checking every active effect on every turn.
+
+Run from the repository root:
+    python benchmarks/bench_battle_effects.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_effects
+
+TARGETS = 20
+EFFECTS = 500
+TURNS = 1000
+
+# Effects start during the first START_WINDOW turns and last a long time,
+# so several hundred are active at once
+START_WINDOW = 100
+
+
+def make_effects(rng):
+    """Random (target index, kind, amount, start turn, duration, interval)"""
+    effects = []
+    for _ in range(EFFECTS):
+        kind = rng.choice([battle_effects.POISON, battle_effects.REGEN])
+        effects.append((rng.randrange(TARGETS), kind, rng.randint(1, 5),
+                        rng.randrange(START_WINDOW), rng.randint(100, 900), rng.choice([1, 1, 2, 3])))
+    return effects
+
+
+def new_targets():
+    """Fresh combatants with plenty of health"""
+    return [{"health": 10**9, "max_health": 10**9} for _ in range(TARGETS)]
+
+
+def run_naive(effects):
+    """Every turn, loop over every active effect"""
+    targets = new_targets()
+    active = []
+    by_start = {}
+    for effect in effects:
+        by_start.setdefault(effect[3], []).append(effect)
+
+    start = time.perf_counter()
+    for turn in range(TURNS):
+        for index, kind, amount, begin, duration, interval in by_start.get(turn, ()):
+            active.append((index, kind, amount, begin + duration, interval, begin))
+        still_active = []
+        for effect in active:
+            index, kind, amount, expires, interval, begin = effect
+            if (turn - begin) % interval == 0 and turn > begin:
+                change = -amount if kind == battle_effects.POISON else amount
+                targets[index]["health"] += change
+            if turn < expires:
+                still_active.append(effect)
+        active = still_active
+    return time.perf_counter() - start
+
+
+def run_wheel(effects):
+    """Same effects through BattleEffects"""
+    targets = new_targets()
+    tracker = battle_effects.BattleEffects(start_turn=0)
+    by_start = {}
+    for effect in effects:
+        by_start.setdefault(effect[3], []).append(effect)
+
+    start = time.perf_counter()
+    for turn in range(TURNS):
+        for index, kind, amount, begin, duration, interval in by_start.get(turn, ()):
+            tracker.add_effect(targets[index], kind, amount, duration, interval)
+        tracker.advance_turn()
+    return time.perf_counter() - start
+
+
+def main():
+    """Run both approaches on the same random effects"""
+    effects = make_effects(random.Random(1))
+    print(f"{EFFECTS} effects on {TARGETS} targets over {TURNS} turns\n")
+
+    naive = run_naive(effects)
+    print(f"{'scan every effect':<24} {naive * 1000:>8.1f} ms")
+    wheel = run_wheel(effects)
+    print(f"{'timer wheel':<24} {wheel * 1000:>8.1f} ms  ({naive / wheel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark - battles per second with and without rendering
+
+Runs the same Warrior vs Orc battle with the console renderer (output
+sent to os.devnull), an in-memory event list, and fully headless.
+
+Run from the repository root:
+    python benchmarks/bench_battle_rendering.py
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+
+BATTLES = 20000
+
+
+def run_battles(make_sink):
+    """Run BATTLES battles and return battles per second"""
+    start = time.perf_counter()
+    for _ in range(BATTLES):
+        char = character_manager.create_character("Hero", "Warrior")
+        enemy = combat_system.create_enemy("orc")
+        combat_system.SimpleBattle(char, enemy, sink=make_sink()).start_battle()
+    return BATTLES / (time.perf_counter() - start)
+
+
+def main():
+    """Run every sink configuration"""
+    print(f"{BATTLES} Warrior vs Orc battles\n")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        rendered = run_battles(combat_system.TextBattleRenderer)
+    print(f"{'text renderer (to devnull)':<28} {rendered:>10.0f} battles/s")
+
+    listed = run_battles(combat_system.ListBattleSink)
+    print(f"{'in-memory event list':<28} {listed:>10.0f} battles/s")
+
+    headless = run_battles(lambda: combat_system.NULL_SINK)
+    print(f"{'headless (no-op sink)':<28} {headless:>10.0f} battles/s")
+
+
+if __name__ == "__main__":
+    main()
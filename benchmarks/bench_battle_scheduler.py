@@ -0,0 +1,46 @@
+"""
+Benchmark - thousands of concurrent battles on one event loop
+
+Every battle waits on a simulated player who takes up to THINK_TIME
+seconds to answer each turn. The scheduler's latency report shows how
+much of each wait was the player and how much was the loop being busy.
+
+Run from the repository root:
+    python benchmarks/bench_battle_scheduler.py
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_scheduler
+import character_manager
+import combat_system
+
+BATTLES = 2000
+THINK_TIME = 0.01
+TURN_TIMEOUT = 0.5
+
+
+async def simulated_player(battle):
+    """Think for a random moment, then attack"""
+    await asyncio.sleep(random.random() * THINK_TIME)
+    return "attack"
+
+
+def main():
+    """Run the battles and print the latency report"""
+    battles = [combat_system.SimpleBattle(character_manager.create_character(f"Player{i}", "Warrior"),
+                                          combat_system.create_enemy("orc"),
+                                          sink=combat_system.NULL_SINK)
+               for i in range(BATTLES)]
+    print(f"{BATTLES} concurrent battles, players think up to {THINK_TIME * 1000:.0f} ms")
+    _, report = battle_scheduler.run_battles(battles, simulated_player, TURN_TIMEOUT)
+    battle_scheduler.display_metrics(report)
+
+
+if __name__ == "__main__":
+    main()
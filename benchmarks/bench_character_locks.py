@@ -0,0 +1,85 @@
+"""
+Benchmark - character_manager lock contention
+
+Runs several threads (or processes) that each do load/modify/save cycles
+through character_session, either all on ONE shared character (full
+contention) or each on its own character (no contention), and reports
+sessions per second. The shared run also checks that no update was lost.
+
+Run from the repository root:
+    python benchmarks/bench_character_locks.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Process
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+WORKERS = 4
+SESSIONS_PER_WORKER = 500
+
+
+def run_sessions(character_name, save_directory, count):
+    """Add 1 gold to a character count times"""
+    for _ in range(count):
+        with character_manager.character_session(character_name, save_directory) as char:
+            char["gold"] += 1
+
+
+def setup_characters(save_directory, names):
+    """Create fresh characters with 0 gold"""
+    for name in names:
+        char = character_manager.create_character(name, "Warrior")
+        char["gold"] = 0
+        character_manager.save_character(char, save_directory)
+
+
+def bench(label, save_directory, worker_type, shared):
+    """Time one configuration and print the result"""
+    names = ["Shared"] if shared else [f"Worker{i}" for i in range(WORKERS)]
+    setup_characters(save_directory, names)
+
+    workers = []
+    for i in range(WORKERS):
+        name = names[0] if shared else names[i]
+        args = (name, save_directory, SESSIONS_PER_WORKER)
+        if worker_type == "thread":
+            workers.append(threading.Thread(target=run_sessions, args=args))
+        else:
+            workers.append(Process(target=run_sessions, args=args))
+
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    total = WORKERS * SESSIONS_PER_WORKER
+    gold = sum(character_manager.load_character(n, save_directory)["gold"] for n in names)
+    status = "OK" if gold == total else f"LOST {total - gold} UPDATES"
+    print(f"{label:<32} {total / elapsed:>10.0f} sessions/s  [{status}]")
+
+
+def main():
+    """Run every benchmark configuration"""
+    save_directory = tempfile.mkdtemp(prefix="lock_bench_")
+    try:
+        print(f"{WORKERS} workers x {SESSIONS_PER_WORKER} sessions\n")
+        bench("threads, one shared character", save_directory, "thread", True)
+        bench("threads, separate characters", save_directory, "thread", False)
+        bench("processes, one shared character", save_directory, "process", True)
+        bench("processes, separate characters", save_directory, "process", False)
+    finally:
+        shutil.rmtree(save_directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark - enemy action choice
+
+Compares enemy_ai.choose_action (one lookup in a compiled decision
+table) with walking the parsed behavior rules every turn, then times
+a batch of battles against the dragon (which has behavior rules) in
+SimpleBattle and in the NumPy batch resolver.
+
+Run from the repository root:
+    python benchmarks/bench_enemy_ai.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+import enemy_ai
+import game_data
+
+DECISIONS = 500000
+BATTLES = 5000
+RULES = "hp<20&turn%2=1:heal, turn%4=0:special, hp>=90:defend, hp<60&turn%3=2:defend, turn%6=5:special"
+
+
+def walk_rules(rules, health, max_health, turn):
+    """Baseline: check every rule in order"""
+    percent = health * 100 / max_health
+    for rule in rules:
+        if rule["hp_below"] is not None and not percent < rule["hp_below"]:
+            continue
+        if rule["hp_at_least"] is not None and not percent >= rule["hp_at_least"]:
+            continue
+        if turn % rule["period"] == rule["phase"]:
+            return game_data.ENEMY_ACTIONS.index(rule["action"])
+    return enemy_ai.ACTION_ATTACK
+
+
+def time_decisions():
+    """Decisions per second for both approaches"""
+    rules = game_data.parse_behavior_rules(RULES)
+    behavior = enemy_ai.compile_behavior(rules)
+    rng = random.Random(2)
+    states = [(rng.randint(1, 300), rng.randint(1, 50)) for _ in range(DECISIONS)]
+
+    start = time.perf_counter()
+    for health, turn in states:
+        walk_rules(rules, health, 300, turn)
+    walked = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for health, turn in states:
+        enemy_ai.choose_action(behavior, health, 300, turn)
+    looked_up = time.perf_counter() - start
+    return walked, looked_up
+
+
+def make_pairs():
+    """Random players against dragons"""
+    rng = random.Random(4)
+    pairs = []
+    for _ in range(BATTLES):
+        player = {"name": "P", "health": rng.randint(50, 400), "strength": rng.randint(10, 60),
+                  "magic": 0, "level": 1, "experience": 0, "gold": 0}
+        player["max_health"] = player["health"]
+        enemy = combat_system.create_enemy("dragon")
+        enemy.update(xp_reward=0, gold_reward=0)
+        pairs.append((player, enemy))
+    return pairs
+
+
+def main():
+    """Time decisions and dragon battles"""
+    walked, looked_up = time_decisions()
+    print(f"{DECISIONS} enemy decisions\n")
+    print(f"{'rule walk':<14} {DECISIONS / walked:>12.0f} decisions/s")
+    print(f"{'table lookup':<14} {DECISIONS / looked_up:>12.0f} decisions/s")
+
+    pairs = make_pairs()
+    start = time.perf_counter()
+    for player, enemy in pairs:
+        combat_system.SimpleBattle(dict(player), dict(enemy), sink=combat_system.NULL_SINK).start_battle()
+    elapsed = time.perf_counter() - start
+    print(f"\n{BATTLES} dragon battles")
+    print(f"{'SimpleBattle':<14} {BATTLES / elapsed:>12.0f} battles/s")
+
+    try:
+        import battle_batch
+        enemies = [e for _, e in pairs]
+        start = time.perf_counter()
+        battle_batch.resolve_battles(battle_batch.stats_from_dicts([p for p, _ in pairs]),
+                                     battle_batch.stats_from_dicts(enemies),
+                                     battle_batch.behaviors_from_dicts(enemies))
+        elapsed = time.perf_counter() - start
+        print(f"{'batch (NumPy)':<14} {BATTLES / elapsed:>12.0f} battles/s")
+    except ImportError:
+        print("batch (NumPy)  skipped - NumPy not installed")
+
+
+if __name__ == "__main__":
+    main()
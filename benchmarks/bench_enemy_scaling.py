@@ -0,0 +1,64 @@
+"""
+Benchmark - level-scaled enemy creation
+
+Times get_random_enemy_for_level (the enemy pick in explore()) at
+level 1, 6 and 500, and compares the memoized (type, level) stat
+blocks with working the scaling formula out again for every enemy.
+
+Run from the repository root:
+    python benchmarks/bench_enemy_scaling.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+
+ENEMIES = 200000
+LEVELS = (1, 6, 500)
+
+
+def scale_uncached(enemy_type, level):
+    """Baseline: apply the per-level growth to a fresh copy every time"""
+    catalog = combat_system.get_enemy_catalog()[enemy_type]
+    enemy = combat_system.create_enemy(enemy_type)
+    levels_above = max(0, level - catalog["min_level"])
+    for stat, growth in catalog.get("per_level", {}).items():
+        enemy[stat] += growth * levels_above
+    enemy["max_health"] = enemy["health"]
+    return enemy
+
+
+def time_explore(level):
+    """Enemies per second picked and built for one level"""
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(ENEMIES):
+        combat_system.get_random_enemy_for_level(level, rng)
+    return ENEMIES / (time.perf_counter() - start)
+
+
+def main():
+    """Time enemy creation per level, cached and uncached"""
+    print(f"{ENEMIES} explore() enemy picks\n")
+    for level in LEVELS:
+        print(f"level {level:<8} {time_explore(level):>12.0f} enemies/s")
+
+    print(f"\n{ENEMIES} level-500 dragons")
+    start = time.perf_counter()
+    for _ in range(ENEMIES):
+        scale_uncached("dragon", 500)
+    print(f"{'uncached':<14} {ENEMIES / (time.perf_counter() - start):>12.0f} enemies/s")
+    start = time.perf_counter()
+    for _ in range(ENEMIES):
+        combat_system.create_enemy_for_level("dragon", 500)
+    print(f"{'cached':<14} {ENEMIES / (time.perf_counter() - start):>12.0f} enemies/s")
+    print(f"\n{combat_system._scaled_enemy.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark - loot rolls
+
+Compares roll_loot (precompiled alias tables) with rolling straight
+from the loot table dictionary: build the weight list and call
+random.choices for every roll. Also times headless battles to show
+what loot adds to a whole battle.
+
+Run from the repository root:
+    python benchmarks/bench_loot_tables.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import loot_system
+
+ROLLS = 200000
+BATTLES = 20000
+ENEMIES = ["goblin", "orc", "dragon"]
+
+
+def roll_from_table(enemy_id, rng):
+    """Baseline: read the table dictionary on every roll"""
+    table = loot_system.get_loot_tables().get(enemy_id)
+    loot = {}
+    if table is None:
+        return loot
+    outcomes = [None] + table["drops"]
+    weights = [table["nothing_weight"]] + [drop["weight"] for drop in table["drops"]]
+    for _ in range(table["rolls"]):
+        drop = rng.choices(outcomes, weights)[0]
+        if drop is None:
+            continue
+        quantity = rng.randint(drop["min_quantity"], drop["max_quantity"])
+        loot[drop["item_id"]] = loot.get(drop["item_id"], 0) + quantity
+    return loot
+
+
+def time_rolls(roll):
+    """Seconds for ROLLS rolls spread over every enemy type"""
+    rng = random.Random(3)
+    start = time.perf_counter()
+    for i in range(ROLLS):
+        roll(ENEMIES[i % 3], rng)
+    return time.perf_counter() - start
+
+
+def time_battles():
+    """Seconds for BATTLES headless battles (loot included)"""
+    start = time.perf_counter()
+    for i in range(BATTLES):
+        hero = character_manager.create_character("Hero", "Warrior")
+        enemy = combat_system.create_enemy(ENEMIES[i % 3])
+        combat_system.SimpleBattle(hero, enemy, sink=combat_system.NULL_SINK,
+                                   seed=i).start_battle()
+    return time.perf_counter() - start
+
+
+def main():
+    """Time both rollers and a battle run"""
+    loot_system.load_loot_catalog()
+    print(f"{ROLLS} loot rolls\n")
+    for label, roll in (("table scan", roll_from_table), ("roll_loot", loot_system.roll_loot)):
+        elapsed = time_rolls(roll)
+        print(f"{label:<12} {ROLLS / elapsed:>12.0f} rolls/s")
+
+    elapsed = time_battles()
+    print(f"\n{BATTLES} headless battles: {BATTLES / elapsed:.0f} battles/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark - 50v50 party battles
+
+Runs PartyBattle (initiative heap + indexed targets) and a simple
+version that sorts everyone by speed each round and scans the other
+side for the weakest living target on every action.
+
+Run from the repository root:
+    python benchmarks/bench_party_battles.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import party_battle
+
+SIDE_SIZE = 50
+BATTLES = 40
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+ENEMIES = ["goblin", "orc", "dragon"]
+
+
+def make_sides(rng):
+    """A random 50-character party and 50-enemy horde"""
+    party = []
+    for i in range(SIDE_SIZE):
+        character = character_manager.create_character(f"Hero{i}", rng.choice(CLASSES))
+        character["health"] = character["max_health"] = rng.randint(150, 400)
+        party.append(character)
+    horde = [combat_system.create_enemy(rng.choice(ENEMIES)) for _ in range(SIDE_SIZE)]
+    return party, horde
+
+
+def run_scanning(party, horde):
+    """Baseline: every action scans the other side for its weakest member"""
+    fighters = [(c, 0) for c in party] + [(e, 1) for e in horde]
+    actions = 0
+    while any(c["health"] > 0 for c in party) and any(e["health"] > 0 for e in horde):
+        # One round: everyone alive acts once, fastest first
+        order = sorted(fighters, key=lambda f: -party_battle.combatant_speed(f[0]))
+        for actor, side in order:
+            if actor["health"] <= 0:
+                continue
+            others = horde if side == 0 else party
+            living = [o for o in others if o["health"] > 0]
+            if not living:
+                break
+            target = min(living, key=lambda o: o["health"])
+            damage = combat_system.calculate_damage(actor, target)
+            target["health"] = max(0, target["health"] - damage)
+            actions += 1
+    return actions
+
+
+def run_party_battle(party, horde):
+    """PartyBattle, headless"""
+    return party_battle.PartyBattle(party, horde).start_battle()["actions"]
+
+
+def time_engine(engine):
+    """Run BATTLES battles on the same random sides; returns (seconds, actions)"""
+    rng = random.Random(5)
+    total = 0
+    elapsed = 0.0
+    for _ in range(BATTLES):
+        party, horde = make_sides(rng)
+        start = time.perf_counter()
+        total += engine(party, horde)
+        elapsed += time.perf_counter() - start
+    return elapsed, total
+
+
+def main():
+    """Time both engines"""
+    print(f"{BATTLES} battles of {SIDE_SIZE} v {SIDE_SIZE}\n")
+    for label, engine in (("list scans", run_scanning), ("PartyBattle", run_party_battle)):
+        elapsed, actions = time_engine(engine)
+        print(f"{label:<14} {BATTLES / elapsed:>8.1f} battles/s "
+              f"{actions / elapsed:>12.0f} actions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark - roster-wide quest analytics
+
+Builds a synthetic roster, then compares completion percentages and
+quest reward totals worked out per character from completed-quest
+lists (quest_handler) with the packed bitset roster in quest_analytics
+(NumPy). Also prints how much memory each form takes.
+
+Run from the repository root (needs NumPy):
+    python benchmarks/bench_quest_analytics.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_analytics
+import quest_handler
+
+QUESTS = 200
+CHARACTERS = 100000
+
+
+def make_roster():
+    """Quest catalog and characters with random completed quests"""
+    rng = random.Random(9)
+    quests = {f"quest_{i}": {"quest_id": f"quest_{i}", "reward_xp": rng.randint(10, 500),
+                             "reward_gold": rng.randint(5, 200)} for i in range(QUESTS)}
+    ids = list(quests)
+    roster = [{"completed_quests": rng.sample(ids, rng.randint(0, QUESTS))}
+              for _ in range(CHARACTERS)]
+    return quests, roster
+
+
+def list_bytes(roster):
+    """
+    Approximate memory of the completed-quest lists (one string object
+    per entry, as when characters are loaded from save files)
+    """
+    total = 0
+    for character in roster:
+        done = character["completed_quests"]
+        total += sys.getsizeof(done) + sum(sys.getsizeof(q) for q in done)
+    return total
+
+
+def main():
+    """Time per-character list stats against the packed roster"""
+    quests, roster = make_roster()
+    print(f"{CHARACTERS} characters, {QUESTS} quests\n")
+    list_memory = list_bytes(roster)
+
+    start = time.perf_counter()
+    for character in roster:
+        quest_handler.get_quest_completion_percentage(character, quests)
+        quest_handler.get_total_quest_rewards_earned(character, quests)
+    listed = time.perf_counter() - start
+
+    index = quest_analytics.get_quest_index(quests)
+    start = time.perf_counter()
+    packed = quest_analytics.pack_roster(roster, index)
+    packing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    quest_analytics.roster_completion_percentages(packed, index)
+    quest_analytics.roster_rewards_earned(packed, index)
+    quest_analytics.completion_funnel(packed, index, index.ids[:10])
+    vectorized = time.perf_counter() - start
+
+    print(f"{'lists':<14} {listed:>8.2f} s  {list_memory / 1e6:>9.1f} MB")
+    print(f"{'bitset (NumPy)':<14} {vectorized:>8.2f} s  {packed.nbytes / 1e6:>9.1f} MB"
+          f"  (packing once: {packing:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark - available-quest lookups
+
+Plays a character part-way through a synthetic catalog, then times
+get_available_quests with a full catalog scan (no frontier) and with
+an attached QuestFrontier, plus the cost of keeping the frontier up to
+date while quests are accepted and completed.
+
+Run from the repository root:
+    python benchmarks/bench_quest_frontier.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_handler
+
+QUESTS = 3000
+PLAYED = 1500
+VIEWS = 200
+
+
+def make_catalog():
+    """Branching quest lines with rising level requirements"""
+    rng = random.Random(7)
+    quests = {}
+    for i in range(QUESTS):
+        prereq = f"quest_{rng.randrange(i)}" if i else "NONE"
+        quests[f"quest_{i}"] = {
+            "quest_id": f"quest_{i}", "title": f"Quest {i}", "description": "",
+            "reward_xp": 0, "reward_gold": 0,
+            "required_level": 1 + i // 200, "prerequisite": prereq,
+        }
+    return quests
+
+
+def play(character, quests, rng):
+    """Accept and complete PLAYED quests; returns seconds spent"""
+    start = time.perf_counter()
+    for _ in range(PLAYED):
+        available = quest_handler.get_available_quests(character, quests)
+        if not available:
+            character["level"] += 1
+            continue
+        quest_id = rng.choice(available)["quest_id"]
+        quest_handler.accept_quest(character, quest_id, quests)
+        quest_handler.complete_quest(character, quest_id, quests)
+    return time.perf_counter() - start
+
+
+def time_views(character, quests):
+    """Menu views per second"""
+    start = time.perf_counter()
+    for _ in range(VIEWS):
+        quest_handler.get_available_quests(character, quests)
+    return VIEWS / (time.perf_counter() - start)
+
+
+def main():
+    """Time quest play and menu views with and without a frontier"""
+    quests = make_catalog()
+    print(f"{QUESTS} quests, {PLAYED} accepted + completed\n")
+
+    for label, attach in (("full scan", False), ("frontier", True)):
+        character = character_manager.create_character("Bench", "Warrior")
+        if attach:
+            quest_handler.attach_quest_frontier(character, quests)
+        played = play(character, quests, random.Random(1))
+        views = time_views(character, quests)
+        print(f"{label:<12} play {played:>7.2f} s   {views:>10.0f} views/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark - quest prerequisite chains
+
+Builds a synthetic catalog of branching quest lines, then compares
+walking PREREQUISITE links on every call (the old
+get_quest_prerequisite_chain) with the cached chains of a QuestGraph
+built once.
+
+Run from the repository root:
+    python benchmarks/bench_quest_graph.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_graph
+import quest_handler
+
+QUESTS = 5000
+LOOKUPS = 20000
+
+
+def make_catalog():
+    """Quests whose prerequisite is a random recent quest (deep lines)"""
+    rng = random.Random(3)
+    quests = {}
+    for i in range(QUESTS):
+        prereq = f"quest_{rng.randint(max(0, i - 5), i - 1)}" if i else "NONE"
+        quests[f"quest_{i}"] = {"quest_id": f"quest_{i}", "prerequisite": prereq}
+    return quests
+
+
+def walk_chain(quest_id, quests):
+    """Baseline: follow prerequisite links every call"""
+    chain = []
+    current = quest_id
+    while True:
+        chain.append(current)
+        prereq = quests[current].get("prerequisite", "NONE")
+        if not prereq or prereq == "NONE":
+            break
+        current = prereq
+    chain.reverse()
+    return chain
+
+
+def main():
+    """Time graph building and chain lookups"""
+    quests = make_catalog()
+    rng = random.Random(5)
+    targets = [f"quest_{rng.randrange(QUESTS)}" for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    graph = quest_graph.QuestGraph(quests)
+    built = time.perf_counter() - start
+    depth = max(graph.depth.values())
+    print(f"{QUESTS} quests (deepest chain {depth + 1}), graph built in {built * 1e3:.1f} ms\n")
+
+    start = time.perf_counter()
+    for quest_id in targets:
+        walk_chain(quest_id, quests)
+    walked = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for quest_id in targets:
+        quest_handler.get_quest_prerequisite_chain(quest_id, quests)
+    cached = time.perf_counter() - start
+
+    print(f"{LOOKUPS} chain lookups")
+    print(f"{'link walk':<14} {LOOKUPS / walked:>12.0f} chains/s")
+    print(f"{'QuestGraph':<14} {LOOKUPS / cached:>12.0f} chains/s")
+
+
+if __name__ == "__main__":
+    main()
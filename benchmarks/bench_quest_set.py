@@ -0,0 +1,58 @@
+"""
+Benchmark - quest membership for veteran characters
+
+Times is_quest_completed and an accept + complete cycle for a
+character with thousands of completed quests, with the quest state in
+plain lists (the old format) and in QuestSets.
+
+Run from the repository root:
+    python benchmarks/bench_quest_set.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quest_set import QuestSet
+
+COMPLETED = 5000
+CHECKS = 20000
+CYCLES = 5000
+
+
+def run(active, completed):
+    """Membership checks and accept/complete cycles; returns (checks/s, cycles/s)"""
+    probes = [f"quest_{i * 7 % (2 * COMPLETED)}" for i in range(CHECKS)]
+    start = time.perf_counter()
+    for quest_id in probes:
+        quest_id in completed
+    checks = CHECKS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(CYCLES):
+        quest_id = f"new_{i}"
+        # Same steps accept_quest / complete_quest take
+        if quest_id in completed or quest_id in active:
+            continue
+        active.append(quest_id)
+        active.remove(quest_id)
+        if quest_id not in completed:
+            completed.append(quest_id)
+    cycles = CYCLES / (time.perf_counter() - start)
+    return checks, cycles
+
+
+def main():
+    """Compare lists and QuestSets"""
+    done = [f"quest_{i}" for i in range(COMPLETED)]
+    print(f"{COMPLETED} completed quests\n")
+    for label, make in (("list", list), ("QuestSet", QuestSet)):
+        # A few active quests ahead of the one being cycled, like a real log
+        checks, cycles = run(make(f"active_{i}" for i in range(20)), make(done))
+        print(f"{label:<10} {checks:>12.0f} checks/s {cycles:>12.0f} accept+complete/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,13 +12,44 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import threading
+from contextlib import contextmanager, ExitStack
+from types import MappingProxyType
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl - fall back to in-process locks only
+    fcntl = None
+
 from custom_exceptions import (
+    MissingDataFileError,
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
     CharacterDeadError
 )
+from game_data import load_classes, DEFAULT_CLASSES, DEFAULT_SPEED
+from quest_set import QuestSet
+
+# Fields every saved character has, in save-file order
+SAVE_FIELDS = [
+    "name", "class", "level", "health", "max_health",
+    "strength", "magic", "experience", "gold",
+    "inventory", "active_quests", "completed_quests"
+]
+
+STARTING_GOLD = 100
+
+# Class registry - filled once by load_class_registry()
+_class_registry = None        # {class_name: class_data_dict}
+_class_templates = None       # {class_name: new-character template} - never mutate
+_class_names_lower = None     # {"warrior": "Warrior", ...}
+
+# Per-character locks, keyed by absolute save file path (removed when unused)
+_lock_table = {}
+_lock_table_guard = threading.Lock()
 
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
@@ -27,37 +58,24 @@ from custom_exceptions import (
 def create_character(name, character_class):
     """
     Create a new character with stats based on class.
+
+    Classes come from the class registry (data/classes.txt); each new
+    character is a cheap copy of that class's prebuilt template.
     """
-    # Valid classes
-    valid_classes = {
-        "Warrior": {"health": 120, "strength": 15, "magic": 5},
-        "Mage": {"health": 90, "strength": 8, "magic": 20},
-        "Rogue": {"health": 100, "strength": 12, "magic": 10},
-        "Cleric": {"health": 110, "strength": 10, "magic": 15}
-    }
+    if _class_templates is None:
+        load_class_registry()
 
     # Validate class
-    if character_class not in valid_classes:
+    template = _class_templates.get(character_class)
+    if template is None:
         raise InvalidCharacterClassError(f"Invalid class: {character_class}")
 
-    # Get the base stats
-    base = valid_classes[character_class]
-
-    # Build the character dictionary
-    character = {
-        "name": name,
-        "class": character_class,
-        "level": 1,
-        "health": base["health"],
-        "max_health": base["health"],
-        "strength": base["strength"],
-        "magic": base["magic"],
-        "experience": 0,
-        "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+    # Copy the template, then fill in the name and give it its own lists
+    character = template.copy()
+    character["name"] = name
+    character["inventory"] = []
+    character["active_quests"] = QuestSet()
+    character["completed_quests"] = QuestSet()
 
     return character
 
@@ -91,26 +109,12 @@ def save_character(character, save_directory="data/save_games"):
     filename = f"{character['name']}_save.txt"
     filepath = os.path.join(save_directory, filename)
 
-    # Helper to convert list -> comma separated string
-    def list_to_str(value):
-        if isinstance(value, list):
-            return ",".join(str(v) for v in value)
-        return str(value)
+    # Format first, so a bad character never touches the save file
+    text = format_character_save(character)
 
     # Let any file I/O exceptions propagate
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(f"NAME: {character['name']}\n")
-        f.write(f"CLASS: {character['class']}\n")
-        f.write(f"LEVEL: {character['level']}\n")
-        f.write(f"HEALTH: {character['health']}\n")
-        f.write(f"MAX_HEALTH: {character['max_health']}\n")
-        f.write(f"STRENGTH: {character['strength']}\n")
-        f.write(f"MAGIC: {character['magic']}\n")
-        f.write(f"EXPERIENCE: {character['experience']}\n")
-        f.write(f"GOLD: {character['gold']}\n")
-        f.write(f"INVENTORY: {list_to_str(character['inventory'])}\n")
-        f.write(f"ACTIVE_QUESTS: {list_to_str(character['active_quests'])}\n")
-        f.write(f"COMPLETED_QUESTS: {list_to_str(character['completed_quests'])}\n")
+    with character_lock(character["name"], save_directory, create=True):
+        _replace_locked(filepath, text)
 
     return True
 
@@ -138,49 +142,19 @@ def load_character(character_name, save_directory="data/save_games"):
     if not os.path.exists(filepath):
         raise CharacterNotFoundError(f"Save file not found for: {character_name}")
 
-    # 2) Try to read file
+    # 2) Try to read file under a shared lock (it may be deleted meanwhile)
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except OSError as e:
-        # File exists but can't be read
+        with character_lock(character_name, save_directory, shared=True):
+            with open(filepath, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+    except FileNotFoundError as e:
+        raise CharacterNotFoundError(f"Save file not found for: {character_name}") from e
+    except (OSError, UnicodeDecodeError) as e:
+        # File exists but can't be read (or is not valid text)
         raise SaveFileCorruptedError(f"Could not read save file for: {character_name}") from e
 
-    # 3) Parse key: value lines into a dict of strings
-    raw_data = {}
-    try:
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            if ":" not in line:
-                raise InvalidSaveDataError("Invalid line format in save file")
-            key, value = line.split(":", 1)
-            key = key.strip()
-            value = value.strip()
-            raw_data[key] = value
-
-        # 4) Build character dict with proper types
-        character = {
-            "name": raw_data["NAME"],
-            "class": raw_data["CLASS"],
-            "level": int(raw_data["LEVEL"]),
-            "health": int(raw_data["HEALTH"]),
-            "max_health": int(raw_data["MAX_HEALTH"]),
-            "strength": int(raw_data["STRENGTH"]),
-            "magic": int(raw_data["MAGIC"]),
-            "experience": int(raw_data["EXPERIENCE"]),
-            "gold": int(raw_data["GOLD"]),
-            "inventory": [item for item in raw_data["INVENTORY"].split(",") if item],
-            "active_quests": [q for q in raw_data["ACTIVE_QUESTS"].split(",") if q],
-            "completed_quests": [q for q in raw_data["COMPLETED_QUESTS"].split(",") if q],
-        }
-
-    except (KeyError, ValueError) as e:
-        # Missing keys or invalid number formats
-        raise InvalidSaveDataError("Invalid or incomplete character data") from e
-
-    return character
+    # 3) Parse the lines into a character dict
+    return parse_character_save(lines)
 
 def list_saved_characters(save_directory="data/save_games"):
     """
@@ -189,16 +163,22 @@ def list_saved_characters(save_directory="data/save_games"):
     Returns:
         List of character names (without _save.txt extension)
     """
-    if not os.path.isdir(save_directory):
-        return []
+    return list(iter_saved_characters(save_directory))
+
+def iter_saved_characters(save_directory="data/save_games"):
+    """
+    Yield saved character names one at a time.
 
-    names = []
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            name = filename[:-9]  # remove "_save.txt"
-            names.append(name)
+    Uses os.scandir so huge save directories are never held in memory
+    as one big list.
+    """
+    if not os.path.isdir(save_directory):
+        return
 
-    return names
+    with os.scandir(save_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith("_save.txt"):
+                yield entry.name[:-9]  # remove "_save.txt"
 
 def delete_character(character_name, save_directory="data/save_games"):
     """
@@ -215,9 +195,156 @@ def delete_character(character_name, save_directory="data/save_games"):
     if not os.path.exists(filepath):
         raise CharacterNotFoundError(f"Save file not found for: {character_name}")
 
-    os.remove(filepath)
+    try:
+        with character_lock(character_name, save_directory):
+            os.remove(filepath)
+    except FileNotFoundError as e:
+        raise CharacterNotFoundError(f"Save file not found for: {character_name}") from e
+
     return True
 
+# ============================================================================
+# LOCKING
+# ============================================================================
+
+def _open_locked(filepath, shared, create):
+    """
+    Open a save file and flock it, making sure the lock is on the file
+    that is still at filepath (it may be deleted while we wait)
+
+    Returns: Open file handle holding the lock
+    Raises: FileNotFoundError if the file is gone and create is False
+    """
+    operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    while True:
+        handle = open(filepath, "a" if create else "r")
+        try:
+            fcntl.flock(handle.fileno(), operation)
+            if os.path.exists(filepath) and \
+                    os.stat(filepath).st_ino == os.fstat(handle.fileno()).st_ino:
+                return handle
+        except BaseException:
+            handle.close()
+            raise
+        # Deleted (or replaced) while we waited - try again
+        handle.close()
+        if not create and not os.path.exists(filepath):
+            raise FileNotFoundError(filepath)
+
+
+def _replace_locked(filepath, text):
+    """
+    Write text to a temp file and swap it in for the locked save file
+
+    Readers never see a half-written save. The flock this process holds
+    moves to the new file before the swap, so nobody else gets in
+    between (they were waiting on the old file, notice it was replaced
+    and start waiting on the new one).
+    """
+    temp_path = filepath + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    with _lock_table_guard:
+        entry = _lock_table.get(os.path.abspath(filepath))
+    if entry is None or entry["handle"] is None:
+        os.replace(temp_path, filepath)
+        return
+
+    handle = open(temp_path, "r")
+    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    try:
+        os.replace(temp_path, filepath)
+    except BaseException:
+        handle.close()
+        os.remove(temp_path)
+        raise
+    old_handle = entry["handle"]
+    entry["handle"] = handle
+    fcntl.flock(old_handle.fileno(), fcntl.LOCK_UN)
+    old_handle.close()
+
+
+@contextmanager
+def character_lock(character_name, save_directory="data/save_games",
+                   shared=False, create=False):
+    """
+    Hold the lock for one character's save file.
+
+    Threads in this process share an in-process lock table. Other
+    processes are kept out with an advisory fcntl lock on the save file
+    itself (shared for reads, exclusive for writes), so no lock files
+    are left behind. The lock is re-entrant within a thread, so
+    save/load calls inside a locked block don't deadlock.
+
+    create: make an empty save file if there is none (for saving)
+
+    Raises: FileNotFoundError if the save file doesn't exist (and
+            create is False), OSError if it can't be opened
+    """
+    filepath = os.path.abspath(
+        os.path.join(save_directory, f"{character_name}_save.txt")
+    )
+
+    with _lock_table_guard:
+        entry = _lock_table.get(filepath)
+        if entry is None:
+            entry = {"lock": threading.RLock(), "depth": 0, "handle": None, "users": 0}
+            _lock_table[filepath] = entry
+        entry["users"] += 1
+
+    try:
+        with entry["lock"]:
+            if entry["depth"] == 0 and fcntl is not None:
+                entry["handle"] = _open_locked(filepath, shared, create)
+            entry["depth"] += 1
+
+            try:
+                yield
+            finally:
+                entry["depth"] -= 1
+                if entry["depth"] == 0 and entry["handle"] is not None:
+                    handle = entry["handle"]
+                    entry["handle"] = None
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                    handle.close()
+    finally:
+        # Forget characters nobody is using, so the table doesn't grow
+        with _lock_table_guard:
+            entry["users"] -= 1
+            if entry["users"] == 0 and _lock_table.get(filepath) is entry:
+                del _lock_table[filepath]
+
+
+@contextmanager
+def character_session(character_name, save_directory="data/save_games"):
+    """
+    Load a character, keep it locked while in use, then save it.
+
+    Usage:
+        with character_session("Hero") as char:
+            char["gold"] += 10
+
+    If the block raises, the character is NOT saved.
+
+    Raises: Same exceptions as load_character
+    """
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(character_lock(character_name, save_directory))
+        except FileNotFoundError as e:
+            raise CharacterNotFoundError(f"Save file not found for: {character_name}") from e
+        except OSError as e:
+            raise SaveFileCorruptedError(f"Could not read save file for: {character_name}") from e
+        character = load_character(character_name, save_directory)
+        yield character
+        save_character(character, save_directory)
+
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
@@ -307,6 +434,199 @@ def revive_character(character):
     character["health"] = max(1, character["max_health"] // 2)
     return True
 
+# ============================================================================
+# CLASS REGISTRY
+# ============================================================================
+
+def load_class_registry(filename="data/classes.txt"):
+    """
+    (Re)load the class registry and rebuild the new-character templates.
+
+    Falls back to DEFAULT_CLASSES if the class file doesn't exist.
+
+    Returns: Dictionary {class_name: class_data_dict}
+    Raises: InvalidDataFormatError, CorruptedDataError from game_data
+    """
+    global _class_registry, _class_templates, _class_names_lower
+
+    try:
+        classes = load_classes(filename)
+    except MissingDataFileError:
+        classes = {name: dict(data) for name, data in DEFAULT_CLASSES.items()}
+
+    # Prebuilt characters in save-field order; create_character copies these
+    templates = {}
+    for class_name, data in classes.items():
+        templates[class_name] = {
+            "name": None,
+            "class": class_name,
+            "level": 1,
+            "health": data["health"],
+            "max_health": data["health"],
+            "strength": data["strength"],
+            "magic": data["magic"],
+            "experience": 0,
+            "gold": STARTING_GOLD,
+            "inventory": None,
+            "active_quests": None,
+            "completed_quests": None
+        }
+
+    _class_registry = classes
+    _class_templates = templates
+    _class_names_lower = {name.lower(): name for name in classes}
+    return classes
+
+
+def get_class_registry():
+    """
+    Get the class registry, loading it on first use.
+
+    Returns: Dictionary {class_name: class_data_dict}
+    """
+    if _class_registry is None:
+        load_class_registry()
+    return _class_registry
+
+
+def get_class_templates():
+    """
+    Get read-only views of the new-character templates.
+
+    Returns: Dictionary {class_name: MappingProxyType template}
+    """
+    if _class_templates is None:
+        load_class_registry()
+    return {name: MappingProxyType(t) for name, t in _class_templates.items()}
+
+
+def list_character_classes():
+    """
+    Get the names of all playable classes in file order.
+    """
+    return list(get_class_registry())
+
+
+def get_class_ability(character_class):
+    """
+    Get the special ability name for a class (case-insensitive).
+
+    Returns: Ability name string, or None if class is unknown
+    """
+    registry = get_class_registry()
+    class_name = _class_names_lower.get(str(character_class).lower())
+    if class_name is None:
+        return None
+    return registry[class_name]["ability"]
+
+
+def get_class_ability_cooldown(character_class):
+    """
+    Get how many turns a class's ability stays on cooldown (case-insensitive).
+
+    Returns: Integer turns; 0 means once per battle (also for unknown classes)
+    """
+    registry = get_class_registry()
+    class_name = _class_names_lower.get(str(character_class).lower())
+    if class_name is None:
+        return 0
+    return registry[class_name].get("cooldown", 0)
+
+
+def get_class_speed(character_class):
+    """
+    Get a class's initiative speed (case-insensitive).
+
+    Returns: Integer speed (DEFAULT_SPEED for unknown classes)
+    """
+    registry = get_class_registry()
+    class_name = _class_names_lower.get(str(character_class).lower())
+    if class_name is None:
+        return DEFAULT_SPEED
+    return registry[class_name].get("speed", DEFAULT_SPEED)
+
+# ============================================================================
+# SAVE FORMAT HELPERS
+# ============================================================================
+
+def format_character_save(character):
+    """
+    Convert a character dictionary into save file text.
+
+    Shared by every save backend so they all use the same format.
+
+    Returns: String in KEY: VALUE save format
+    """
+    # Helper to convert list -> comma separated string
+    def list_to_str(value):
+        if isinstance(value, QuestSet):
+            return value.to_save_string()
+        if isinstance(value, list):
+            return ",".join(str(v) for v in value)
+        return str(value)
+
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {list_to_str(character['inventory'])}\n"
+        f"ACTIVE_QUESTS: {list_to_str(character['active_quests'])}\n"
+        f"COMPLETED_QUESTS: {list_to_str(character['completed_quests'])}\n"
+    )
+
+
+def parse_character_save(lines):
+    """
+    Parse save file lines into a character dictionary.
+
+    Args:
+        lines: List of strings in KEY: VALUE save format
+
+    Returns: Character dictionary
+    Raises: InvalidSaveDataError if data format is wrong
+    """
+    # Parse key: value lines into a dict of strings
+    raw_data = {}
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if ":" not in line:
+                raise InvalidSaveDataError("Invalid line format in save file")
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip()
+            raw_data[key] = value
+
+        # Build character dict with proper types
+        character = {
+            "name": raw_data["NAME"],
+            "class": raw_data["CLASS"],
+            "level": int(raw_data["LEVEL"]),
+            "health": int(raw_data["HEALTH"]),
+            "max_health": int(raw_data["MAX_HEALTH"]),
+            "strength": int(raw_data["STRENGTH"]),
+            "magic": int(raw_data["MAGIC"]),
+            "experience": int(raw_data["EXPERIENCE"]),
+            "gold": int(raw_data["GOLD"]),
+            "inventory": [item for item in raw_data["INVENTORY"].split(",") if item],
+            "active_quests": QuestSet(q for q in raw_data["ACTIVE_QUESTS"].split(",") if q),
+            "completed_quests": QuestSet(q for q in raw_data["COMPLETED_QUESTS"].split(",") if q),
+        }
+
+    except (KeyError, ValueError) as e:
+        # Missing keys or invalid number formats
+        raise InvalidSaveDataError("Invalid or incomplete character data") from e
+
+    return character
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -320,14 +640,8 @@ def validate_character_data(character):
     Raises:
         InvalidSaveDataError if missing fields or invalid types
     """
-    required_keys = [
-        "name", "class", "level", "health", "max_health",
-        "strength", "magic", "experience", "gold",
-        "inventory", "active_quests", "completed_quests"
-    ]
-
     # Check keys
-    for key in required_keys:
+    for key in SAVE_FIELDS:
         if key not in character:
             raise InvalidSaveDataError(f"Missing field: {key}")
 
@@ -345,7 +659,12 @@ def validate_character_data(character):
 
         for key in list_fields:
             if not isinstance(character[key], list):
-                raise InvalidSaveDataError(f"Field {key} must be a list")
+                # Quest lists may also be QuestSets
+                if key == "inventory" or not isinstance(character[key], QuestSet):
+                    raise InvalidSaveDataError(f"Field {key} must be a list")
+            # Item and quest ids are strings (and quest lists become QuestSets)
+            if not all(isinstance(entry, str) for entry in character[key]):
+                raise InvalidSaveDataError(f"Field {key} must only hold ids (strings)")
 
     except KeyError as e:
         raise InvalidSaveDataError("Character data is incomplete") from e
@@ -10,89 +10,432 @@ AI Usage: [Helped with debugging, structuring my code and explanations.]
 Handles combat mechanics
 """
 import random
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
 
 from custom_exceptions import (
+    MissingDataFileError,
     InvalidTargetError,
     CombatNotActiveError,
     CharacterDeadError,
     AbilityOnCooldownError
 )
 
-from character_manager import gain_experience, add_gold
+from character_manager import (
+    gain_experience,
+    add_gold,
+    get_class_ability,
+    get_class_ability_cooldown
+)
+from inventory_system import add_items_to_inventory
+from battle_effects import BattleEffects
+from game_data import load_enemies, DEFAULT_ENEMIES, DEFAULT_SPEED
+from loot_system import roll_loot, format_loot
+from enemy_ai import (
+    compile_behavior,
+    choose_action,
+    enemy_heal_amount,
+    ACTION_DEFEND,
+    ACTION_HEAL,
+    ACTION_SPECIAL,
+    ENEMY_HEAL_LIMIT
+)
+from weighted_sampling import build_alias_table, alias_draw
 
 
 # ============================================================================
 # ENEMY DEFINITIONS
 # ============================================================================
 
+# Enemy catalog - filled once by load_enemy_catalog()
+_enemy_catalog = None         # {enemy_id: enemy_data_dict}
+_enemy_prototypes = None      # {enemy_id: battle-ready enemy dict} - never mutate
+_enemy_catalog_version = 0    # bumped every time the catalog changes
+_enemy_behaviors = {}         # {enemy_id: (period, decision table)} - attackers left out
+_enemy_scaling = {}           # {enemy_id: (min_level, ((stat, growth), ...))} - fixed types left out
+
+# Most (type, level) stat blocks kept by get_scaled_enemy_stats
+ENEMY_STAT_CACHE_SIZE = 4096
+_level_candidates = {}        # {level: ([enemy_id, ...], [weight, ...])}
+
+# Encounter tables - one alias table per level band, rebuilt lazily
+# whenever _enemy_catalog_version changes
+_encounter_version = None
+_band_starts = []             # sorted first level of every band
+_encounter_tables = {}        # {band index: ([enemy_id, ...], alias table)}
+
+
+def load_enemy_catalog(filename="data/enemies.txt"):
+    """
+    (Re)load the enemy catalog and rebuild the enemy prototypes.
+
+    Falls back to DEFAULT_ENEMIES if the enemy file doesn't exist.
+
+    Returns: Dictionary {enemy_id: enemy_data_dict}
+    Raises: InvalidDataFormatError, CorruptedDataError from game_data
+    """
+    try:
+        enemies = load_enemies(filename)
+    except MissingDataFileError:
+        enemies = {enemy_id: dict(data) for enemy_id, data in DEFAULT_ENEMIES.items()}
+
+    set_enemy_catalog(enemies)
+    return enemies
+
+
+def set_enemy_catalog(enemies):
+    """
+    Install an enemy catalog {enemy_id: enemy_data_dict} directly.
+    """
+    global _enemy_catalog, _enemy_prototypes, _enemy_catalog_version
+
+    prototypes = {}
+    behaviors = {}
+    scaling = {}
+    for enemy_id, data in enemies.items():
+        behavior = compile_behavior(data.get("behavior"))
+        if behavior is not None:
+            behaviors[enemy_id] = behavior
+        growth = tuple((stat, n) for stat, n in data.get("per_level", {}).items() if n)
+        if growth:
+            scaling[enemy_id] = (data.get("min_level", 1), growth)
+        prototypes[enemy_id] = {
+            "enemy_id": enemy_id,
+            "name": data["name"],
+            "health": data["health"],
+            "max_health": data["health"],
+            "strength": data["strength"],
+            "magic": data["magic"],
+            "xp_reward": data["xp_reward"],
+            "gold_reward": data["gold_reward"],
+            "speed": data.get("speed", DEFAULT_SPEED)
+        }
+
+    _enemy_catalog = enemies
+    _enemy_prototypes = prototypes
+    _enemy_behaviors.clear()
+    _enemy_behaviors.update(behaviors)
+    _enemy_scaling.clear()
+    _enemy_scaling.update(scaling)
+    _enemy_catalog_version += 1
+    _level_candidates.clear()
+
+
+def get_enemy_catalog():
+    """
+    Get the enemy catalog, loading it on first use.
+
+    Returns: Dictionary {enemy_id: enemy_data_dict}
+    """
+    if _enemy_catalog is None:
+        load_enemy_catalog()
+    return _enemy_catalog
+
+
+def get_enemy_prototype(enemy_type):
+    """
+    Get a read-only view of an enemy type's prototype.
+
+    Raises: InvalidTargetError if enemy_type not recognized
+    """
+    if _enemy_prototypes is None:
+        load_enemy_catalog()
+    prototype = _enemy_prototypes.get(enemy_type.lower())
+    if prototype is None:
+        raise InvalidTargetError(f"Unknown enemy type: {enemy_type}")
+    return MappingProxyType(prototype)
+
+
+def get_enemy_behavior(enemy_type):
+    """
+    Get an enemy type's compiled behavior (see enemy_ai)
+
+    Returns: Tuple (period, decision table), or None for enemies that
+             only ever attack (including unknown types)
+    """
+    if _enemy_prototypes is None:
+        load_enemy_catalog()
+    if enemy_type is None:
+        return None
+    return _enemy_behaviors.get(enemy_type.lower())
+
+
 def create_enemy(enemy_type):
     """
     Create an enemy based on type
 
-    Example enemy types and stats:
+    Enemy types and stats come from data/enemies.txt, e.g.:
     - goblin: health=50, strength=8, magic=2, xp_reward=25, gold_reward=10
     - orc: health=80, strength=12, magic=5, xp_reward=50, gold_reward=25
     - dragon: health=200, strength=25, magic=15, xp_reward=200, gold_reward=100
 
-    Returns: Enemy dictionary
+    Returns: Enemy dictionary (a fresh copy of the type's prototype)
     Raises: InvalidTargetError if enemy_type not recognized
     """
-    enemy_type = enemy_type.lower()
-
-    if enemy_type == "goblin":
-        enemy = {
-            "name": "Goblin",
-            "health": 50,
-            "max_health": 50,
-            "strength": 8,
-            "magic": 2,
-            "xp_reward": 25,
-            "gold_reward": 10
-        }
-    elif enemy_type == "orc":
-        enemy = {
-            "name": "Orc",
-            "health": 80,
-            "max_health": 80,
-            "strength": 12,
-            "magic": 5,
-            "xp_reward": 50,
-            "gold_reward": 25
-        }
-    elif enemy_type == "dragon":
-        enemy = {
-            "name": "Dragon",
-            "health": 200,
-            "max_health": 200,
-            "strength": 25,
-            "magic": 15,
-            "xp_reward": 200,
-            "gold_reward": 100
-        }
-    else:
+    if _enemy_prototypes is None:
+        load_enemy_catalog()
+
+    prototype = _enemy_prototypes.get(enemy_type.lower())
+    if prototype is None:
         raise InvalidTargetError(f"Unknown enemy type: {enemy_type}")
 
+    return prototype.copy()
+
+
+@lru_cache(maxsize=ENEMY_STAT_CACHE_SIZE)
+def _scaled_enemy(enemy_id, level, catalog_version):
+    """
+    Build one (type, level) stat block - never mutate the result
+
+    catalog_version is only part of the cache key, so blocks built from
+    an older catalog are never handed out again.
+    """
+    min_level, growth = _enemy_scaling[enemy_id]
+    levels_above = max(0, level - min_level)
+    enemy = dict(_enemy_prototypes[enemy_id])
+    for stat, per_level in growth:
+        enemy[stat] += per_level * levels_above
+    enemy["max_health"] = enemy["health"]
     return enemy
 
 
-def get_random_enemy_for_level(character_level):
+def get_scaled_enemy_stats(enemy_type, level):
+    """
+    Get a read-only view of an enemy type's stats at a character level
+
+    Types with <STAT>_PER_LEVEL lines gain that much per level above
+    their MIN_LEVEL; other types are the same at every level. Stat
+    blocks are memoized per (type, level), so any level costs the same
+    after its first enemy.
+
+    Raises: InvalidTargetError if enemy_type not recognized
+    """
+    if _enemy_prototypes is None:
+        load_enemy_catalog()
+
+    enemy_id = enemy_type.lower()
+    if enemy_id in _enemy_scaling:
+        return MappingProxyType(_scaled_enemy(enemy_id, level, _enemy_catalog_version))
+    return get_enemy_prototype(enemy_id)
+
+
+def create_enemy_for_level(enemy_type, level):
+    """
+    Create an enemy with its stats scaled to a character level
+
+    Returns: Enemy dictionary (a fresh copy)
+    Raises: InvalidTargetError if enemy_type not recognized
+    """
+    if _enemy_prototypes is None:
+        load_enemy_catalog()
+
+    enemy_id = enemy_type.lower()
+    if enemy_id in _enemy_scaling:
+        return _scaled_enemy(enemy_id, level, _enemy_catalog_version).copy()
+    return create_enemy(enemy_id)
+
+
+def get_enemy_candidates(character_level):
+    """
+    Get the enemy types that can spawn at a level, with spawn weights
+
+    Uses each enemy's MIN_LEVEL/MAX_LEVEL band. If no band covers the
+    level, the closest band below it is used (or the lowest band).
+
+    Returns: Tuple (list of enemy_ids, list of weights)
+    """
+    cached = _level_candidates.get(character_level)
+    if cached is not None:
+        return cached
+
+    catalog = get_enemy_catalog()
+    ids = []
+    weights = []
+    for enemy_id, data in catalog.items():
+        max_level = data["max_level"]
+        if data["min_level"] <= character_level and (max_level is None or character_level <= max_level):
+            if data["spawn_weight"] > 0:
+                ids.append(enemy_id)
+                weights.append(data["spawn_weight"])
+
+    if not ids:
+        below = [d["min_level"] for d in catalog.values() if d["min_level"] <= character_level]
+        band_start = max(below) if below else min(d["min_level"] for d in catalog.values())
+        for enemy_id, data in catalog.items():
+            if data["min_level"] == band_start:
+                ids.append(enemy_id)
+                weights.append(max(1, data["spawn_weight"]))
+
+    _level_candidates[character_level] = (ids, weights)
+    return ids, weights
+
+
+def _refresh_band_starts():
+    """Recompute level band boundaries if the catalog changed"""
+    global _encounter_version, _band_starts
+
+    catalog = get_enemy_catalog()
+    if _encounter_version == _enemy_catalog_version:
+        return
+
+    # A band starts wherever some enemy's range starts or ends
+    starts = set()
+    for data in catalog.values():
+        starts.add(data["min_level"])
+        if data["max_level"] is not None:
+            starts.add(data["max_level"] + 1)
+
+    _band_starts = sorted(starts)
+    _encounter_tables.clear()
+    _encounter_version = _enemy_catalog_version
+
+
+def get_encounter_table(character_level):
+    """
+    Get the encounter table for the level band containing a level
+
+    Every level inside one band has the same possible enemies, so one
+    alias table per band is built (on first use) and reused.
+
+    Returns: Tuple ([enemy_id, ...], alias table)
+    """
+    _refresh_band_starts()
+
+    # Band -1 holds every level below the lowest MIN_LEVEL
+    band = bisect_right(_band_starts, character_level) - 1
+    table = _encounter_tables.get(band)
+    if table is None:
+        ids, weights = get_enemy_candidates(character_level)
+        table = (ids, build_alias_table(weights))
+        _encounter_tables[band] = table
+    return table
+
+
+def get_random_enemy_for_level(character_level, rng=None):
     """
     Get an appropriate enemy for character's level
 
+    Picks a random enemy whose level band covers the character's level,
+    weighted by SPAWN_WEIGHT, in O(1) using the band's alias table, with
+    its stats scaled to the level (see get_scaled_enemy_stats).
+    With the default data:
     Level 1-2: Goblins
     Level 3-5: Orcs
-    Level 6+: Dragons
+    Level 6+: Dragons, 20 more health and 2 more strength per level
+
+    Args:
+        character_level: Level to pick an enemy for
+        rng: Optional random.Random (seeded simulations); default random module
 
     Returns: Enemy dictionary
     """
-    if character_level <= 2:
-        enemy_type = "goblin"
-    elif character_level <= 5:
-        enemy_type = "orc"
-    else:
-        enemy_type = "dragon"
+    ids, table = get_encounter_table(character_level)
+    if len(ids) == 1:
+        return create_enemy_for_level(ids[0], character_level)
+    return create_enemy_for_level(ids[alias_draw(table, rng or random)], character_level)
+
 
-    return create_enemy(enemy_type)
+# ============================================================================
+# BATTLE EVENTS
+# ============================================================================
+
+# One thing that happened in a battle.
+#   turn:     turn number
+#   actor:    "player", "enemy" or "battle"
+#   action:   start, attack, ability, effect, escape, escape_failed,
+#             victory, defeat, and the enemy's defend, heal, special
+#   damage:   damage dealt (0 if none; negative for healing effects)
+#   hp_after: target's health after the action (None if no target)
+#   detail:   extra data, e.g. {"xp": 25, "gold": 10} for victory
+BattleEvent = namedtuple(
+    "BattleEvent",
+    ["turn", "actor", "action", "damage", "hp_after", "detail"],
+    defaults=(0, None, None)
+)
+
+
+class NullBattleSink:
+    """Event sink that throws every event away (fully headless battles)"""
+
+    def emit(self, event, character, enemy):
+        """Ignore the event"""
+        pass
+
+
+class ListBattleSink:
+    """Event sink that keeps every event in a list"""
+
+    def __init__(self):
+        """Start with no events"""
+        self.events = []
+
+    def emit(self, event, character, enemy):
+        """Store the event"""
+        self.events.append(event)
+
+
+class TextBattleRenderer:
+    """Event sink that prints the classic console battle output"""
+
+    def emit(self, event, character, enemy):
+        """Print the message (and stats) for one event"""
+        action = event.action
+        hero = character.get("name", "Hero")
+
+        if action == "start":
+            display_battle_log("Battle begins!")
+        elif action == "attack":
+            if event.actor == "player":
+                display_battle_log(f"{hero} attacks {enemy['name']} for {event.damage} damage!")
+            else:
+                display_battle_log(f"{enemy['name']} attacks {hero} for {event.damage} damage!")
+        elif action == "ability":
+            display_battle_log(event.detail)
+        elif action == "defend":
+            display_battle_log(f"{enemy['name']} braces for your next attack!")
+        elif action == "heal":
+            display_battle_log(f"{enemy['name']} heals for {-event.damage} HP!")
+        elif action == "special":
+            display_battle_log(f"{enemy['name']} unleashes a special attack on {hero} "
+                               f"for {event.damage} damage!")
+        elif action == "effect":
+            who = hero if event.actor == "player" else enemy["name"]
+            if event.damage > 0:
+                display_battle_log(f"{who} suffers {event.damage} damage from effects!")
+            else:
+                display_battle_log(f"{who} recovers {-event.damage} HP from effects!")
+        elif action == "victory":
+            display_battle_log(
+                f"You defeated {enemy['name']}! "
+                f"Gained {event.detail['xp']} XP and {event.detail['gold']} gold."
+            )
+            if event.detail.get("loot"):
+                display_battle_log(f"Loot: {format_loot(event.detail['loot'])}")
+            return
+        elif action == "defeat":
+            display_battle_log("You were defeated...")
+            return
+        elif action == "escape":
+            display_battle_log("You successfully escaped from battle!")
+            return
+        elif action == "escape_failed":
+            display_battle_log("Escape attempt failed!")
+            return
+
+        display_combat_stats(character, enemy)
+
+
+# Shared sink for headless battles
+NULL_SINK = NullBattleSink()
+
+# Stats a recorded battle keeps so battle_replay can rebuild both sides
+REPLAY_CHARACTER_FIELDS = ("name", "class", "level", "experience", "gold",
+                           "health", "max_health", "strength", "magic")
+REPLAY_ENEMY_FIELDS = ("enemy_id", "name", "health", "max_health", "strength", "magic",
+                       "xp_reward", "gold_reward")
 
 
 # ============================================================================
@@ -106,12 +449,61 @@ class SimpleBattle:
     Manages combat between character and enemy
     """
 
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, sink=None, action_source=None,
+                 seed=None, record=False, profiler=None):
+        """
+        Initialize battle with character and enemy
+
+        sink receives a BattleEvent for everything that happens:
+        None prints the classic console output (TextBattleRenderer),
+        NULL_SINK runs headless, ListBattleSink collects the events.
+
+        action_source(battle) picks the player's action each turn:
+        "attack", "ability" or "escape". None means always attack.
+
+        seed seeds this battle's own RNG (escapes, critical strikes).
+        None picks a random 32-bit seed, kept in self.seed so the
+        battle can still be reproduced. record=True keeps the starting
+        stats and every player action for battle_replay.encode_replay.
+
+        profiler (a battle_profiler.BattleProfiler) times each phase of
+        the battle. Without one there are no timing calls at all.
+        """
+        setup_started = time.perf_counter_ns() if profiler is not None else 0
+
         self.character = character
         self.enemy = enemy
         self.combat_active = True
         self.turn_counter = 1
+        self.action_source = action_source
+
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Cooldowns / status effects - created on first use
+        self.effects = None
+
+        # Enemy AI: compiled decision table (None = always attacks)
+        self.enemy_behavior = get_enemy_behavior(enemy.get("enemy_id"))
+        self.enemy_defending = False
+        self.enemy_heals_left = ENEMY_HEAL_LIMIT
+
+        # Replay recording - snapshot before anything changes
+        self.recorded_actions = [] if record else None
+        self.initial_state = None
+        if record:
+            self.initial_state = (
+                {key: character.get(key) for key in REPLAY_CHARACTER_FIELDS},
+                {key: enemy.get(key) for key in REPLAY_ENEMY_FIELDS},
+            )
+
+        if sink is None:
+            sink = TextBattleRenderer()
+        self.sink = sink
+        # Skip building events at all when nobody is listening
+        self._emit = None if isinstance(sink, NullBattleSink) else sink.emit
 
         # Track that this character is in battle
         self.character.setdefault("in_battle", False)
@@ -120,68 +512,220 @@ class SimpleBattle:
         # Reset ability cooldown flag for this battle
         self.character["ability_on_cooldown"] = False
 
+        # Swap in timed versions of the hot methods (only when profiling)
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self, setup_started)
+
     def start_battle(self):
         """
         Start the combat loop
 
         Returns: Dictionary with battle results:
-                {'winner': 'player'|'enemy', 'xp_gained': int, 'gold_gained': int}
+                {'winner': 'player'|'enemy'|'escaped', 'xp_gained': int,
+                 'gold_gained': int, 'turns': int,
+                 'loot': {item_id: quantity}, 'loot_overflow': {item_id: quantity}}
+                loot_overflow is the part of the loot that didn't fit in
+                the inventory.
 
         Raises: CharacterDeadError if character is already dead
         """
-        if self.character.get("health", 0) <= 0:
-            raise CharacterDeadError("Character is already dead and cannot fight.")
+        self.begin_battle()
 
-        display_battle_log("Battle begins!")
-        display_combat_stats(self.character, self.enemy)
+        if self.can_fast_forward():
+            winner = self.fast_forward()
+        else:
+            winner = self.run_turns()
 
-        while self.combat_active:
-            # Player goes first
-            self.player_turn()
-            winner = self.check_battle_end()
-            if winner is not None:
-                break
+        return self.end_battle(winner)
 
-            # Enemy turn
-            self.enemy_turn()
-            winner = self.check_battle_end()
-            if winner is not None:
-                break
+    def begin_battle(self):
+        """
+        Check the character can fight and announce the battle
+
+        start_battle() calls this; step-by-step runners (battle_scheduler)
+        call begin_battle(), then play_turn() until it returns a winner,
+        then end_battle().
+
+        Raises: CharacterDeadError if character is already dead
+        """
+        if self.character.get("health", 0) <= 0:
+            raise CharacterDeadError("Character is already dead and cannot fight.")
 
-            self.turn_counter += 1
+        if self._emit is not None:
+            self._emit(BattleEvent(self.turn_counter, "battle", "start"),
+                       self.character, self.enemy)
 
+    def end_battle(self, winner):
+        """
+        Finish the battle: apply rewards and build the result dictionary
+        """
         # Battle ended – mark character as no longer in battle
         self.combat_active = False
         self.character["in_battle"] = False
+        if self.effects is not None:
+            # Take off any buffs that were still running
+            self.effects.clear()
 
         if winner == "player":
             rewards = get_victory_rewards(self.enemy)
             xp = rewards["xp"]
             gold = rewards["gold"]
 
-            # Apply rewards using character_manager functions
-            gain_experience(self.character, xp)
-            add_gold(self.character, gold)
+            self.apply_rewards(xp, gold)
+            loot, overflow = self.apply_loot()
 
-            display_battle_log(
-                f"You defeated {self.enemy['name']}! "
-                f"Gained {xp} XP and {gold} gold."
-            )
+            if self._emit is not None:
+                self._emit(BattleEvent(self.turn_counter, "player", "victory",
+                                       detail={"xp": xp, "gold": gold, "loot": loot}),
+                           self.character, self.enemy)
 
             return {
                 "winner": "player",
                 "xp_gained": xp,
-                "gold_gained": gold
+                "gold_gained": gold,
+                "turns": self.turn_counter,
+                "loot": loot,
+                "loot_overflow": overflow
+            }
+        elif winner == "escaped":
+            return {
+                "winner": "escaped",
+                "xp_gained": 0,
+                "gold_gained": 0,
+                "turns": self.turn_counter,
+                "loot": {},
+                "loot_overflow": {}
             }
         else:
-            display_battle_log("You were defeated...")
+            if self._emit is not None:
+                self._emit(BattleEvent(self.turn_counter, "enemy", "defeat"),
+                           self.character, self.enemy)
             return {
                 "winner": "enemy",
                 "xp_gained": 0,
-                "gold_gained": 0
+                "gold_gained": 0,
+                "turns": self.turn_counter,
+                "loot": {},
+                "loot_overflow": {}
             }
 
-    def player_turn(self):
+    def apply_rewards(self, xp, gold):
+        """
+        Give the character XP and gold for winning
+        """
+        # Apply rewards using character_manager functions
+        gain_experience(self.character, xp)
+        add_gold(self.character, gold)
+
+    def apply_loot(self):
+        """
+        Roll the enemy's loot table and add the drops to the inventory
+
+        Returns: Tuple (loot, overflow) - {item_id: quantity} rolled, and
+                 the part of it that didn't fit in the inventory
+        """
+        loot = roll_loot(self.enemy.get("enemy_id"), self.rng)
+        if not loot:
+            return loot, {}
+        return loot, add_items_to_inventory(self.character, loot)
+
+    def run_turns(self):
+        """
+        Step through the battle one turn at a time
+
+        Returns: 'player', 'enemy' or 'escaped'
+        """
+        while self.combat_active:
+            winner = self.play_turn()
+            if winner is not None:
+                return winner
+
+        return None
+
+    def play_turn(self, action=None):
+        """
+        Play one full turn: player, enemy, then turn effects
+
+        action is the player's action for this turn; None asks the
+        action_source (or attacks).
+
+        Returns: 'player', 'enemy' or 'escaped' if the battle ended,
+                 otherwise None
+        """
+        # Player goes first
+        self.player_turn(action)
+        if not self.combat_active:
+            # Player ran away
+            return "escaped"
+        winner = self.check_battle_end()
+        if winner is not None:
+            return winner
+
+        # Enemy turn
+        self.enemy_turn()
+        winner = self.check_battle_end()
+        if winner is not None:
+            return winner
+
+        self.turn_counter += 1
+
+        # Poison / regen / cooldowns for the new turn
+        if self.effects is not None:
+            self.apply_turn_effects()
+            return self.check_battle_end()
+
+        return None
+
+    def can_fast_forward(self):
+        """
+        Check if the battle can be solved with math instead of stepping
+
+        True when both sides only use basic attacks (no action source, so
+        no abilities or escapes and no randomness; an enemy without
+        behavior rules) and nobody is listening for per-turn events.
+        """
+        return (self.action_source is None and self._emit is None
+                and self.enemy_behavior is None
+                and (self.effects is None or self.effects.is_idle()))
+
+    def fast_forward(self):
+        """
+        Resolve a basic-attack-only battle in O(1)
+
+        Damage per hit never changes, so the number of hits each side
+        needs is a ceiling division. Leaves health, turn_counter and
+        combat state exactly as run_turns() would.
+
+        Returns: 'player' or 'enemy'
+        """
+        player_damage = self.calculate_damage(self.character, self.enemy)
+        enemy_damage = self.calculate_damage(self.enemy, self.character)
+        enemy_health = self.enemy.get("health", 0)
+        player_health = self.character.get("health", 0)
+
+        # Hits needed (the player always gets at least one swing)
+        player_hits = max(1, -(-enemy_health // player_damage))
+        enemy_hits = -(-player_health // enemy_damage)
+
+        if player_hits <= enemy_hits:
+            # Enemy falls on the player's attack in turn player_hits
+            self.turn_counter = player_hits
+            self.enemy["health"] = 0
+            self.character["health"] = player_health - (player_hits - 1) * enemy_damage
+            winner = "player"
+        else:
+            # Player falls on the enemy's attack in turn enemy_hits
+            self.turn_counter = enemy_hits
+            self.character["health"] = 0
+            self.enemy["health"] = enemy_health - enemy_hits * player_damage
+            winner = "enemy"
+
+        self.combat_active = False
+        self.character["in_battle"] = False
+        return winner
+
+    def player_turn(self, action=None):
         """
         Handle player's turn
 
@@ -190,6 +734,9 @@ class SimpleBattle:
         2. Special Ability (if available)
         3. Try to Run
 
+        action may be given directly (e.g. by battle_scheduler);
+        otherwise it comes from action_source.
+
         Raises: CombatNotActiveError if called outside of battle
         """
         if not self.combat_active:
@@ -197,32 +744,132 @@ class SimpleBattle:
 
         # For automated testing / simple gameplay:
         # Default action: basic attack
+        if action is None and self.action_source is not None:
+            action = self.action_source(self)
+        if action is None:
+            action = "attack"
+        # Record what was actually played, so replays line up turn for turn
+        if self.recorded_actions is not None:
+            self.recorded_actions.append(action)
+
+        if action == "escape":
+            self.attempt_escape()
+            return
+
+        if action == "ability":
+            health_before = self.enemy["health"]
+            try:
+                message = use_special_ability(self.character, self.enemy, self.rng)
+            except AbilityOnCooldownError:
+                # Can't use it yet - fall back to a basic attack
+                message = None
+            if message is not None:
+                self.start_ability_cooldown()
+                if self._emit is not None:
+                    self._emit(BattleEvent(self.turn_counter, "player", "ability",
+                                           health_before - self.enemy["health"],
+                                           self.enemy["health"], message),
+                               self.character, self.enemy)
+                return
+
         damage = self.calculate_damage(self.character, self.enemy)
         self.apply_damage(self.enemy, damage)
-        display_battle_log(
-            f"{self.character.get('name', 'Hero')} attacks "
-            f"{self.enemy['name']} for {damage} damage!"
-        )
-        display_combat_stats(self.character, self.enemy)
+        if self._emit is not None:
+            self._emit(BattleEvent(self.turn_counter, "player", "attack",
+                                   damage, self.enemy["health"]),
+                       self.character, self.enemy)
+
+    def get_effects(self):
+        """Get this battle's BattleEffects, creating it on first use"""
+        if self.effects is None:
+            self.effects = BattleEffects(self.turn_counter)
+        return self.effects
+
+    def add_effect(self, target, kind, amount, duration, interval=1, stat="strength"):
+        """
+        Put a status effect (battle_effects.POISON / REGEN / BUFF) on
+        the character or the enemy. See BattleEffects.add_effect.
+        """
+        return self.get_effects().add_effect(target, kind, amount, duration,
+                                             interval, stat)
+
+    def start_ability_cooldown(self):
+        """
+        Start the cooldown of the ability that was just used
+
+        Classes with a COOLDOWN get the ability back after that many
+        turns; a cooldown of 0 keeps the old once-per-battle rule.
+        """
+        character_class = self.character.get("class", "")
+        turns = get_class_ability_cooldown(character_class)
+        if turns > 0:
+            self.get_effects().start_cooldown(self.character,
+                                              get_class_ability(character_class),
+                                              turns, self._ability_ready)
+
+    def _ability_ready(self):
+        """Cooldown finished - the ability can be used again"""
+        self.character["ability_on_cooldown"] = False
+
+    def apply_turn_effects(self):
+        """
+        Advance cooldowns and status effects to the current turn
+        """
+        changes = self.effects.advance_turn()
+        if self._emit is None:
+            return
+        for target, change in changes:
+            actor = "player" if target is self.character else "enemy"
+            self._emit(BattleEvent(self.turn_counter, actor, "effect",
+                                   -change, target["health"]),
+                       self.character, self.enemy)
 
     def enemy_turn(self):
         """
-        Handle enemy's turn - simple AI
+        Handle enemy's turn
 
-        Enemy always attacks
+        The enemy's behavior table (enemy_ai) picks attack, defend, heal
+        or special from its health and the turn number; enemies without
+        behavior rules always attack.
 
         Raises: CombatNotActiveError if called outside of battle
         """
         if not self.combat_active:
             raise CombatNotActiveError("Combat is not active.")
 
+        action = "attack"
+        if self.enemy_behavior is not None:
+            # A defend only lasts until the enemy's next turn
+            self.enemy_defending = False
+            code = choose_action(self.enemy_behavior, self.enemy.get("health", 0),
+                                 self.enemy.get("max_health", 0), self.turn_counter)
+            if code == ACTION_DEFEND:
+                self.enemy_defending = True
+                if self._emit is not None:
+                    self._emit(BattleEvent(self.turn_counter, "enemy", "defend"),
+                               self.character, self.enemy)
+                return
+            if code == ACTION_HEAL and self.enemy_heals_left > 0:
+                self.enemy_heals_left -= 1
+                health = self.enemy.get("health", 0)
+                self.enemy["health"] = min(self.enemy.get("max_health", health),
+                                           health + enemy_heal_amount(self.enemy))
+                if self._emit is not None:
+                    self._emit(BattleEvent(self.turn_counter, "enemy", "heal",
+                                           health - self.enemy["health"], self.enemy["health"]),
+                               self.character, self.enemy)
+                return
+            if code == ACTION_SPECIAL:
+                action = "special"
+
         damage = self.calculate_damage(self.enemy, self.character)
+        if action == "special":
+            damage += self.enemy.get("magic", 0)
         self.apply_damage(self.character, damage)
-        display_battle_log(
-            f"{self.enemy['name']} attacks "
-            f"{self.character.get('name', 'Hero')} for {damage} damage!"
-        )
-        display_combat_stats(self.character, self.enemy)
+        if self._emit is not None:
+            self._emit(BattleEvent(self.turn_counter, "enemy", action,
+                                   damage, self.character["health"]),
+                       self.character, self.enemy)
 
     def calculate_damage(self, attacker, defender):
         """
@@ -230,14 +877,13 @@ class SimpleBattle:
 
         Damage formula: attacker['strength'] - (defender['strength'] // 4)
         Minimum damage: 1
+        A defending enemy takes half (still at least 1).
 
         Returns: Integer damage amount
         """
-        atk = attacker.get("strength", 0)
-        defense = defender.get("strength", 0) // 4
-        damage = atk - defense
-        if damage < 1:
-            damage = 1
+        damage = calculate_damage(attacker, defender)
+        if self.enemy_defending and defender is self.enemy:
+            damage = max(1, damage // 2)
         return damage
 
     def apply_damage(self, target, damage):
@@ -275,13 +921,15 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("Combat is not active.")
 
-        success = random.random() < 0.5
+        success = self.rng.random() < 0.5
         if success:
-            display_battle_log("You successfully escaped from battle!")
             self.combat_active = False
             self.character["in_battle"] = False
-        else:
-            display_battle_log("Escape attempt failed!")
+
+        if self._emit is not None:
+            action = "escape" if success else "escape_failed"
+            self._emit(BattleEvent(self.turn_counter, "player", action),
+                       self.character, self.enemy)
 
         return success
 
@@ -290,7 +938,7 @@ class SimpleBattle:
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+def use_special_ability(character, enemy, rng=None):
     """
     Use character's class-specific special ability
 
@@ -300,23 +948,22 @@ def use_special_ability(character, enemy):
     - Rogue: Critical Strike (3x strength damage, 50% chance)
     - Cleric: Heal (restore 30 health)
 
+    rng is used for random abilities (default: random module)
+
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
-    # Simple cooldown tracking: one use per battle
+    # Cooldown flag - SimpleBattle clears it when the class's COOLDOWN
+    # runs out (COOLDOWN 0: once per battle)
     if character.get("ability_on_cooldown", False):
         raise AbilityOnCooldownError("Special ability is on cooldown.")
 
-    char_class = character.get("class", "").lower()
+    # The class registry says which ability each class has
+    ability = get_class_ability(character.get("class", ""))
+    handler = ABILITY_HANDLERS.get(ability)
 
-    if char_class == "warrior":
-        result = warrior_power_strike(character, enemy)
-    elif char_class == "mage":
-        result = mage_fireball(character, enemy)
-    elif char_class == "rogue":
-        result = rogue_critical_strike(character, enemy)
-    elif char_class == "cleric":
-        result = cleric_heal(character)
+    if handler is not None:
+        result = handler(character, enemy, rng or random)
     else:
         # If class not recognized, do nothing special
         result = "Nothing happened..."
@@ -342,10 +989,10 @@ def mage_fireball(character, enemy):
     return f"Mage casts Fireball for {damage} damage!"
 
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, rng=None):
     """Rogue special ability - 50% chance for triple strength damage."""
     base = character.get("strength", 0)
-    if random.random() < 0.5:
+    if (rng or random).random() < 0.5:
         damage = max(1, base * 3)
         enemy["health"] = max(0, enemy.get("health", 0) - damage)
         return f"Rogue lands a Critical Strike for {damage} damage!"
@@ -366,10 +1013,36 @@ def cleric_heal(character):
     return f"Cleric heals for {actual_healed} HP!"
 
 
+# Ability name (ABILITY in data/classes.txt) -> function(character, enemy, rng)
+ABILITY_HANDLERS = {
+    "power_strike": lambda character, enemy, rng: warrior_power_strike(character, enemy),
+    "fireball": lambda character, enemy, rng: mage_fireball(character, enemy),
+    "critical_strike": rogue_critical_strike,
+    "heal": lambda character, enemy, rng: cleric_heal(character),
+}
+
+
 # ============================================================================
 # COMBAT UTILITIES
 # ============================================================================
 
+def calculate_damage(attacker, defender):
+    """
+    Calculate basic attack damage
+
+    Damage formula: attacker['strength'] - (defender['strength'] // 4)
+    Minimum damage: 1
+
+    Returns: Integer damage amount
+    """
+    atk = attacker.get("strength", 0)
+    defense = defender.get("strength", 0) // 4
+    damage = atk - defense
+    if damage < 1:
+        damage = 1
+    return damage
+
+
 def can_character_fight(character):
     """
     Check if character is in condition to fight
@@ -97,6 +97,10 @@ class QuestNotActiveError(QuestError):
     """Raised when trying to complete a quest that isn't active"""
     pass
 
+class QuestDependencyCycleError(QuestError):
+    """Raised when quest prerequisites loop back on themselves"""
+    pass
+
 # Inventory Exceptions
 class InventoryFullError(InventoryError):
     """Raised when trying to add items to a full inventory"""
@@ -0,0 +1,150 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Enemy AI Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module decides what an enemy does on its turn. Enemies get
+BEHAVIOR rules in data/enemies.txt, e.g.:
+
+    BEHAVIOR: hp<30:heal, turn%3=0:special, hp>=90:defend
+
+Rules are only read once, when the enemy catalog loads. They are
+compiled into a flat decision table with one row per health bucket
+(BEHAVIOR_HP_STEP percent wide, plus one for full health) and one
+column per turn of the rules' combined turn cycle. Picking an action
+in battle is then a single list lookup:
+
+    table[hp_bucket * period + turn % period]
+
+Actions:
+    attack   basic attack
+    defend   halves the player's basic attack damage until the enemy's
+             next turn
+    heal     restores 2 x magic health (at most ENEMY_HEAL_LIMIT times
+             per battle - after that it attacks instead)
+    special  basic attack damage + magic
+"""
+
+import math
+
+from game_data import ENEMY_ACTIONS, BEHAVIOR_HP_STEP
+
+# Action codes (index into ENEMY_ACTIONS)
+ACTION_ATTACK = 0
+ACTION_DEFEND = 1
+ACTION_HEAL = 2
+ACTION_SPECIAL = 3
+
+# Health buckets below full health (5% each); bucket HP_BUCKETS is full
+HP_BUCKETS = 100 // BEHAVIOR_HP_STEP
+
+# Heals allowed per battle, so a healer can't stall a battle forever
+ENEMY_HEAL_LIMIT = 3
+
+# ============================================================================
+# COMPILING RULES
+# ============================================================================
+
+def _rule_matches(rule, hp_percent, turn):
+    """Check one rule against a health percentage and turn number"""
+    if rule["hp_below"] is not None and not hp_percent < rule["hp_below"]:
+        return False
+    if rule["hp_at_least"] is not None and not hp_percent >= rule["hp_at_least"]:
+        return False
+    return turn % rule["period"] == rule["phase"]
+
+
+def compile_behavior(rules):
+    """
+    Compile behavior rules into a decision table
+
+    hp thresholds are multiples of the bucket width, so checking each
+    bucket's lowest percentage gives the same answer as checking any
+    health inside it.
+
+    Returns: Tuple (period, table) - table is a flat list of action codes
+             with HP_BUCKETS + 1 rows of period entries; None when the
+             rules never pick anything but attack
+    """
+    if not rules:
+        return None
+
+    period = 1
+    for rule in rules:
+        period = math.lcm(period, rule["period"])
+
+    codes = [ENEMY_ACTIONS.index(rule["action"]) for rule in rules]
+    table = []
+    for bucket in range(HP_BUCKETS + 1):
+        hp_percent = bucket * BEHAVIOR_HP_STEP
+        for turn in range(period):
+            action = ACTION_ATTACK
+            for rule, code in zip(rules, codes):
+                if _rule_matches(rule, hp_percent, turn):
+                    action = code
+                    break
+            table.append(action)
+
+    if not any(table):
+        return None
+    return period, table
+
+# ============================================================================
+# CHOOSING ACTIONS
+# ============================================================================
+
+def hp_bucket(health, max_health):
+    """
+    Decision table row for a health value
+
+    Returns: 0 .. HP_BUCKETS - 1 for each BEHAVIOR_HP_STEP% below full,
+             HP_BUCKETS at full health
+    """
+    if max_health <= 0:
+        return 0
+    return max(0, min(HP_BUCKETS, health * HP_BUCKETS // max_health))
+
+
+def choose_action(behavior, health, max_health, turn):
+    """
+    Pick an enemy's action from its compiled behavior
+
+    Args:
+        behavior: (period, table) from compile_behavior, or None
+        health / max_health: Enemy's current and maximum health
+        turn: Battle turn number
+
+    Returns: Action code (ACTION_ATTACK, ACTION_DEFEND, ...)
+    """
+    if behavior is None:
+        return ACTION_ATTACK
+    period, table = behavior
+    # hp_bucket, inlined - this runs every enemy turn
+    bucket = health * HP_BUCKETS // max_health if max_health > 0 else 0
+    if bucket > HP_BUCKETS:
+        bucket = HP_BUCKETS
+    elif bucket < 0:
+        bucket = 0
+    return table[bucket * period + turn % period]
+
+
+def enemy_heal_amount(enemy):
+    """Health a heal action restores (before capping at max_health)"""
+    return max(1, 2 * enemy.get("magic", 0))
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== ENEMY AI TEST ===")
+
+    # from game_data import parse_behavior_rules
+    # behavior = compile_behavior(parse_behavior_rules("hp<30:heal, turn%3=0:special"))
+    # print(ENEMY_ACTIONS[choose_action(behavior, 20, 100, 1)])   # heal
+    # print(ENEMY_ACTIONS[choose_action(behavior, 90, 100, 3)])   # special
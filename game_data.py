@@ -10,6 +10,7 @@ AI Usage: [AI assisted with explanations, debugging, code structure, and impleme
 This module handles loading and validating game data from text files.
 """
 
+import math
 import os
 from custom_exceptions import (
     InvalidDataFormatError,
@@ -17,6 +18,72 @@ from custom_exceptions import (
     CorruptedDataError
 )
 
+# Initiative for classes/enemies whose data has no SPEED line
+DEFAULT_SPEED = 10
+
+# Enemy behavior rules (BEHAVIOR line in data/enemies.txt)
+ENEMY_ACTIONS = ("attack", "defend", "heal", "special")
+BEHAVIOR_HP_STEP = 5        # hp<N / hp>=N thresholds are multiples of this
+MAX_BEHAVIOR_PERIOD = 12    # longest turn cycle all turn%P rules may combine to
+
+# Enemy stats that can grow with level (<STAT>_PER_LEVEL lines)
+ENEMY_SCALED_STATS = ("health", "strength", "magic", "xp_reward", "gold_reward")
+
+# Built-in classes - the registry falls back to these when data/classes.txt
+# is missing, and create_default_data_files writes them out
+DEFAULT_CLASSES = {
+    "Warrior": {"class": "Warrior", "health": 120, "strength": 15, "magic": 5,
+                "ability": "power_strike", "cooldown": 3, "speed": 10},
+    "Mage": {"class": "Mage", "health": 90, "strength": 8, "magic": 20,
+             "ability": "fireball", "cooldown": 4, "speed": 8},
+    "Rogue": {"class": "Rogue", "health": 100, "strength": 12, "magic": 10,
+              "ability": "critical_strike", "cooldown": 2, "speed": 14},
+    "Cleric": {"class": "Cleric", "health": 110, "strength": 10, "magic": 15,
+               "ability": "heal", "cooldown": 5, "speed": 9}
+}
+
+# Built-in enemies - the enemy catalog falls back to these when
+# data/enemies.txt is missing, and create_default_data_files writes them out
+DEFAULT_ENEMIES = {
+    "goblin": {"enemy_id": "goblin", "name": "Goblin", "health": 50, "strength": 8, "magic": 2,
+               "xp_reward": 25, "gold_reward": 10, "min_level": 1, "max_level": 2, "spawn_weight": 10,
+               "speed": 12, "behavior": [], "per_level": {}},
+    "orc": {"enemy_id": "orc", "name": "Orc", "health": 80, "strength": 12, "magic": 5,
+            "xp_reward": 50, "gold_reward": 25, "min_level": 3, "max_level": 5, "spawn_weight": 10,
+            "speed": 9, "behavior": [], "per_level": {}},
+    "dragon": {"enemy_id": "dragon", "name": "Dragon", "health": 200, "strength": 25, "magic": 15,
+               "xp_reward": 200, "gold_reward": 100, "min_level": 6, "max_level": None, "spawn_weight": 10,
+               "speed": 7,
+               # BEHAVIOR: hp<30:heal, turn%3=0:special
+               "behavior": [
+                   {"action": "heal", "hp_below": 30, "hp_at_least": None, "period": 1, "phase": 0},
+                   {"action": "special", "hp_below": None, "hp_at_least": None, "period": 3, "phase": 0},
+               ],
+               "per_level": {"health": 20, "strength": 2, "magic": 1,
+                             "xp_reward": 20, "gold_reward": 10}}
+}
+
+# Built-in loot tables - loot_system falls back to these when data/loot.txt
+# is missing, and create_default_data_files writes them out (drops of
+# items that aren't in the item catalog are left out, see default_loot_tables)
+DEFAULT_LOOT = {
+    "goblin": {"enemy_id": "goblin", "rolls": 1, "nothing_weight": 60, "drops": [
+        {"item_id": "health_potion", "weight": 30, "min_quantity": 1, "max_quantity": 2},
+        {"item_id": "leather_armor", "weight": 10, "min_quantity": 1, "max_quantity": 1},
+    ]},
+    "orc": {"enemy_id": "orc", "rolls": 1, "nothing_weight": 50, "drops": [
+        {"item_id": "health_potion", "weight": 25, "min_quantity": 1, "max_quantity": 3},
+        {"item_id": "iron_sword", "weight": 15, "min_quantity": 1, "max_quantity": 1},
+        {"item_id": "strength_elixir", "weight": 10, "min_quantity": 1, "max_quantity": 1},
+    ]},
+    "dragon": {"enemy_id": "dragon", "rolls": 2, "nothing_weight": 20, "drops": [
+        {"item_id": "super_health_potion", "weight": 40, "min_quantity": 1, "max_quantity": 2},
+        {"item_id": "steel_sword", "weight": 15, "min_quantity": 1, "max_quantity": 1},
+        {"item_id": "steel_armor", "weight": 15, "min_quantity": 1, "max_quantity": 1},
+        {"item_id": "fire_staff", "weight": 10, "min_quantity": 1, "max_quantity": 1},
+    ]},
+}
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
@@ -31,40 +98,12 @@ def load_quests(filename="data/quests.txt"):
     Raises:
         MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # 1) File doesn’t exist at all
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Quest file not found: {filename}")
-
-    # 2) Try to read file safely
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except OSError as e:
-        # File exists but cannot be read
-        raise CorruptedDataError(f"Could not read quest file: {filename}") from e
-
-    # 3) Split into blocks separated by blank lines
-    blocks = []
-    current = []
-    for line in lines:
-        if line.strip() == "":
-            if current:
-                blocks.append(current)
-                current = []
-        else:
-            current.append(line)
-    if current:
-        blocks.append(current)
-
-    if not blocks:
-        raise InvalidDataFormatError("Quest file is empty or has no valid entries")
+    blocks = read_data_blocks(filename, "quest")
 
-    # 4) Parse each block using helper
     quests = {}
     for block in blocks:
         quest = parse_quest_block(block)
-        quest_id = quest["quest_id"]
-        quests[quest_id] = quest
+        quests[quest["quest_id"]] = quest
 
     return quests
 
@@ -78,38 +117,72 @@ def load_items(filename="data/items.txt"):
     Raises:
         MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item file not found: {filename}")
-
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except OSError as e:
-        raise CorruptedDataError(f"Could not read item file: {filename}") from e
-
-    blocks = []
-    current = []
-    for line in lines:
-        if line.strip() == "":
-            if current:
-                blocks.append(current)
-                current = []
-        else:
-            current.append(line)
-    if current:
-        blocks.append(current)
-
-    if not blocks:
-        raise InvalidDataFormatError("Item file is empty or has no valid entries")
+    blocks = read_data_blocks(filename, "item")
 
     items = {}
     for block in blocks:
         item = parse_item_block(block)
-        item_id = item["item_id"]
-        items[item_id] = item
+        items[item["item_id"]] = item
 
     return items
 
+def load_classes(filename="data/classes.txt"):
+    """
+    Load character class data from file.
+
+    Returns:
+        Dictionary of classes {class_name: class_data_dict}
+
+    Raises:
+        MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    blocks = read_data_blocks(filename, "class")
+
+    classes = {}
+    for block in blocks:
+        class_data = parse_class_block(block)
+        classes[class_data["class"]] = class_data
+
+    return classes
+
+def load_enemies(filename="data/enemies.txt"):
+    """
+    Load enemy data from file.
+
+    Returns:
+        Dictionary of enemies {enemy_id: enemy_data_dict}
+
+    Raises:
+        MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    blocks = read_data_blocks(filename, "enemy")
+
+    enemies = {}
+    for block in blocks:
+        enemy = parse_enemy_block(block)
+        enemies[enemy["enemy_id"]] = enemy
+
+    return enemies
+
+def load_loot_tables(filename="data/loot.txt"):
+    """
+    Load enemy loot tables from file.
+
+    Returns:
+        Dictionary of loot tables {enemy_id: loot_table_dict}
+
+    Raises:
+        MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    blocks = read_data_blocks(filename, "loot")
+
+    tables = {}
+    for block in blocks:
+        table = parse_loot_block(block)
+        tables[table["enemy_id"]] = table
+
+    return tables
+
 def validate_quest_data(quest_dict):
     """
     Validate that quest dictionary has all required fields.
@@ -181,6 +254,160 @@ def validate_item_data(item_dict):
 
     return True
 
+def validate_class_data(class_dict):
+    """
+    Validate that class dictionary has all required fields.
+
+    Returns:
+        True if valid
+    Raises:
+        InvalidDataFormatError if missing required fields or invalid types
+    """
+    required_keys = ["class", "health", "strength", "magic", "ability"]
+
+    for key in required_keys:
+        if key not in class_dict:
+            raise InvalidDataFormatError(f"Missing class field: {key}")
+
+    for key in ["health", "strength", "magic"]:
+        if not isinstance(class_dict[key], int):
+            raise InvalidDataFormatError(f"Class field {key} must be an int")
+
+    if class_dict["health"] <= 0:
+        raise InvalidDataFormatError("Class health must be positive")
+
+    cooldown = class_dict.get("cooldown", 0)
+    if not isinstance(cooldown, int) or cooldown < 0:
+        raise InvalidDataFormatError("Class cooldown must be a non-negative int")
+
+    speed = class_dict.get("speed", DEFAULT_SPEED)
+    if not isinstance(speed, int) or speed <= 0:
+        raise InvalidDataFormatError("Class speed must be a positive int")
+
+    return True
+
+def validate_enemy_data(enemy_dict):
+    """
+    Validate that enemy dictionary has all required fields.
+
+    Returns:
+        True if valid
+    Raises:
+        InvalidDataFormatError if missing required fields or invalid values
+    """
+    required_keys = [
+        "enemy_id", "name", "health", "strength", "magic",
+        "xp_reward", "gold_reward", "min_level", "max_level", "spawn_weight",
+    ]
+
+    for key in required_keys:
+        if key not in enemy_dict:
+            raise InvalidDataFormatError(f"Missing enemy field: {key}")
+
+    int_fields = ["health", "strength", "magic", "xp_reward", "gold_reward",
+                  "min_level", "spawn_weight"]
+    for key in int_fields:
+        if not isinstance(enemy_dict[key], int):
+            raise InvalidDataFormatError(f"Enemy field {key} must be an int")
+
+    if enemy_dict["health"] <= 0:
+        raise InvalidDataFormatError("Enemy health must be positive")
+    if enemy_dict["min_level"] < 1:
+        raise InvalidDataFormatError("Enemy min_level must be at least 1")
+    if enemy_dict["spawn_weight"] < 0:
+        raise InvalidDataFormatError("Enemy spawn_weight cannot be negative")
+
+    speed = enemy_dict.get("speed", DEFAULT_SPEED)
+    if not isinstance(speed, int) or speed <= 0:
+        raise InvalidDataFormatError("Enemy speed must be a positive int")
+
+    # max_level can be None (no upper limit) or an int >= min_level
+    max_level = enemy_dict["max_level"]
+    if max_level is not None:
+        if not isinstance(max_level, int) or max_level < enemy_dict["min_level"]:
+            raise InvalidDataFormatError("Enemy max_level must be NONE or >= min_level")
+
+    validate_behavior_rules(enemy_dict.get("behavior", []))
+
+    for stat, growth in enemy_dict.get("per_level", {}).items():
+        if stat not in ENEMY_SCALED_STATS:
+            raise InvalidDataFormatError(f"Enemy stat {stat} can't scale with level")
+        if not isinstance(growth, int) or growth < 0:
+            raise InvalidDataFormatError(f"Enemy {stat} per level must be a non-negative int")
+
+    return True
+
+def validate_behavior_rules(rules):
+    """
+    Validate a list of enemy behavior rules (see parse_behavior_rules).
+
+    Returns:
+        True if valid
+    Raises:
+        InvalidDataFormatError if a rule is invalid
+    """
+    period = 1
+    for rule in rules:
+        if rule["action"] not in ENEMY_ACTIONS:
+            raise InvalidDataFormatError(f"Unknown enemy action: {rule['action']}")
+        for key in ("hp_below", "hp_at_least"):
+            threshold = rule.get(key)
+            if threshold is None:
+                continue
+            if not 0 <= threshold <= 100 or threshold % BEHAVIOR_HP_STEP:
+                raise InvalidDataFormatError(
+                    f"Behavior hp thresholds must be multiples of {BEHAVIOR_HP_STEP} from 0 to 100"
+                )
+        if rule["period"] < 1 or not 0 <= rule["phase"] < rule["period"]:
+            raise InvalidDataFormatError("Behavior turn%P=R needs P >= 1 and 0 <= R < P")
+        period = math.lcm(period, rule["period"])
+
+    if period > MAX_BEHAVIOR_PERIOD:
+        raise InvalidDataFormatError(
+            f"Behavior turn cycles combine to {period} turns (most is {MAX_BEHAVIOR_PERIOD})"
+        )
+    return True
+
+def validate_loot_data(loot_dict, items=None):
+    """
+    Validate that a loot table dictionary has all required fields.
+
+    Args:
+        loot_dict: Loot table to check
+        items: Optional item catalog {item_id: item_data}; when given,
+               every dropped item must be in it
+
+    Returns:
+        True if valid
+    Raises:
+        InvalidDataFormatError if missing required fields or invalid values
+    """
+    for key in ["enemy_id", "rolls", "nothing_weight", "drops"]:
+        if key not in loot_dict:
+            raise InvalidDataFormatError(f"Missing loot field: {key}")
+
+    if not isinstance(loot_dict["rolls"], int) or loot_dict["rolls"] < 1:
+        raise InvalidDataFormatError("Loot rolls must be at least 1")
+    if not isinstance(loot_dict["nothing_weight"], int) or loot_dict["nothing_weight"] < 0:
+        raise InvalidDataFormatError("Loot nothing weight cannot be negative")
+
+    total = loot_dict["nothing_weight"]
+    for drop in loot_dict["drops"]:
+        if drop["weight"] < 0:
+            raise InvalidDataFormatError("Loot drop weight cannot be negative")
+        if drop["min_quantity"] < 1 or drop["max_quantity"] < drop["min_quantity"]:
+            raise InvalidDataFormatError("Loot quantity must be N or MIN-MAX with 1 <= MIN <= MAX")
+        if items is not None and drop["item_id"] not in items:
+            raise InvalidDataFormatError(
+                f"Loot for {loot_dict['enemy_id']} references unknown item: {drop['item_id']}"
+            )
+        total += drop["weight"]
+
+    if total <= 0:
+        raise InvalidDataFormatError("Loot table weights must add up to more than 0")
+
+    return True
+
 def create_default_data_files():
     """
     Create default data files if they don't exist.
@@ -188,15 +415,23 @@ def create_default_data_files():
     Creates:
         data/quests.txt
         data/items.txt
+        data/classes.txt
+        data/enemies.txt
+        data/loot.txt
 
     Raises:
         Any OSError will propagate (e.g., permission issues)
+        InvalidDataFormatError, CorruptedDataError if an existing item
+        file (which the default loot is checked against) is bad
     """
     data_dir = "data"
     os.makedirs(data_dir, exist_ok=True)
 
     quests_path = os.path.join(data_dir, "quests.txt")
     items_path = os.path.join(data_dir, "items.txt")
+    classes_path = os.path.join(data_dir, "classes.txt")
+    enemies_path = os.path.join(data_dir, "enemies.txt")
+    loot_path = os.path.join(data_dir, "loot.txt")
 
     # Only create if missing so we don't overwrite student-customized data
     if not os.path.exists(quests_path):
@@ -241,12 +476,188 @@ def create_default_data_files():
                 "DESCRIPTION: Restores a small amount of health.\n"
             )
 
+    if not os.path.exists(classes_path):
+        save_classes(DEFAULT_CLASSES, classes_path)
+
+    if not os.path.exists(enemies_path):
+        save_enemies(DEFAULT_ENEMIES, enemies_path)
+
+    if not os.path.exists(loot_path):
+        # Only drops items the item file (default or not) actually has
+        save_loot_tables(default_loot_tables(load_items(items_path)), loot_path)
+
     return True
 
+# ============================================================================
+# DATA SAVING FUNCTIONS
+# ============================================================================
+
+def format_class_block(class_data):
+    """
+    Turn a class dictionary back into a data-file block.
+
+    Returns: String of KEY: VALUE lines (no trailing blank line)
+    """
+    validate_class_data(class_data)
+    return (
+        f"CLASS: {class_data['class']}\n"
+        f"HEALTH: {class_data['health']}\n"
+        f"STRENGTH: {class_data['strength']}\n"
+        f"MAGIC: {class_data['magic']}\n"
+        f"ABILITY: {class_data['ability']}\n"
+        f"COOLDOWN: {class_data.get('cooldown', 0)}\n"
+        f"SPEED: {class_data.get('speed', DEFAULT_SPEED)}\n"
+    )
+
+def format_enemy_block(enemy):
+    """
+    Turn an enemy dictionary back into a data-file block.
+
+    Returns: String of KEY: VALUE lines (no trailing blank line)
+    """
+    validate_enemy_data(enemy)
+    max_level = "NONE" if enemy["max_level"] is None else enemy["max_level"]
+    return (
+        f"ENEMY_ID: {enemy['enemy_id']}\n"
+        f"NAME: {enemy['name']}\n"
+        f"HEALTH: {enemy['health']}\n"
+        f"STRENGTH: {enemy['strength']}\n"
+        f"MAGIC: {enemy['magic']}\n"
+        f"XP_REWARD: {enemy['xp_reward']}\n"
+        f"GOLD_REWARD: {enemy['gold_reward']}\n"
+        f"MIN_LEVEL: {enemy['min_level']}\n"
+        f"MAX_LEVEL: {max_level}\n"
+        f"SPAWN_WEIGHT: {enemy['spawn_weight']}\n"
+        f"SPEED: {enemy.get('speed', DEFAULT_SPEED)}\n"
+    ) + "".join(
+        f"{stat.upper()}_PER_LEVEL: {growth}\n"
+        for stat, growth in enemy.get("per_level", {}).items() if growth
+    ) + (
+        f"BEHAVIOR: {format_behavior_rules(enemy['behavior'])}\n"
+        if enemy.get("behavior") else ""
+    )
+
+def save_classes(classes, filename="data/classes.txt"):
+    """
+    Write a {class_name: class_data} dictionary as a classes data file.
+
+    Raises: InvalidDataFormatError if a class is invalid (nothing is written)
+    """
+    _write_data_blocks(filename, [format_class_block(c) for c in classes.values()])
+    return True
+
+def save_enemies(enemies, filename="data/enemies.txt"):
+    """
+    Write an {enemy_id: enemy_data} dictionary as an enemies data file.
+
+    Raises: InvalidDataFormatError if an enemy is invalid (nothing is written)
+    """
+    _write_data_blocks(filename, [format_enemy_block(e) for e in enemies.values()])
+    return True
+
+def format_loot_block(table):
+    """
+    Turn a loot table dictionary back into a data-file block.
+
+    Returns: String of KEY: VALUE lines (no trailing blank line)
+    """
+    validate_loot_data(table)
+    return (
+        f"ENEMY_ID: {table['enemy_id']}\n"
+        f"ROLLS: {table['rolls']}\n"
+        f"NOTHING: {table['nothing_weight']}\n"
+        f"DROPS: {format_loot_drops(table['drops'])}\n"
+    )
+
+def save_loot_tables(tables, filename="data/loot.txt"):
+    """
+    Write an {enemy_id: loot_table_dict} dictionary as a loot data file.
+
+    Raises: InvalidDataFormatError if a table is invalid (nothing is written)
+    """
+    _write_data_blocks(filename, [format_loot_block(t) for t in tables.values()])
+    return True
+
+def _write_data_blocks(filename, blocks):
+    """Write blocks separated by blank lines, replacing the file in one step"""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = filename + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(blocks))
+    os.replace(temp_path, filename)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def read_data_blocks(filename, label):
+    """
+    Read a KEY: VALUE data file and split it into blank-line separated blocks.
+
+    Args:
+        filename: Path of the data file
+        label: Kind of data (used in error messages, e.g. "class")
+
+    Returns:
+        List of blocks, each a list of lines
+
+    Raises:
+        MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"{label.capitalize()} file not found: {filename}")
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except (OSError, UnicodeDecodeError) as e:
+        raise CorruptedDataError(f"Could not read {label} file: {filename}") from e
+
+    blocks = []
+    current = []
+    for line in lines:
+        if line.strip() == "":
+            if current:
+                blocks.append(current)
+                current = []
+        else:
+            current.append(line)
+    if current:
+        blocks.append(current)
+
+    if not blocks:
+        raise InvalidDataFormatError(f"{label.capitalize()} file is empty or has no valid entries")
+
+    return blocks
+
+def parse_block_fields(lines, label, required_raw_keys):
+    """
+    Parse a block of KEY: VALUE lines into a dict of raw strings.
+
+    Keys are upper-cased. Every key in required_raw_keys must be present.
+
+    Raises:
+        InvalidDataFormatError if a line is malformed or a key is missing
+    """
+    raw = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if ":" not in line:
+            raise InvalidDataFormatError(f"Invalid {label} line format")
+        key, value = line.split(":", 1)
+        raw[key.strip().upper()] = value.strip()
+
+    for k in required_raw_keys:
+        if k not in raw:
+            raise InvalidDataFormatError(f"Missing {label} field: {k}")
+
+    return raw
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary.
@@ -260,34 +671,12 @@ def parse_quest_block(lines):
     Raises:
         InvalidDataFormatError if parsing fails
     """
-    raw = {}
+    raw = parse_block_fields(
+        lines, "quest", ["QUEST_ID", "TITLE", "DESCRIPTION", "REWARD_XP",
+                         "REWARD_GOLD", "REQUIRED_LEVEL", "PREREQUISITE"]
+    )
 
     try:
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            if ":" not in line:
-                raise InvalidDataFormatError("Invalid quest line format")
-            key, value = line.split(":", 1)
-            key = key.strip().upper()
-            value = value.strip()
-            raw[key] = value
-
-        # Required keys in the raw block (as they appear in the file)
-        required_raw_keys = [
-            "QUEST_ID",
-            "TITLE",
-            "DESCRIPTION",
-            "REWARD_XP",
-            "REWARD_GOLD",
-            "REQUIRED_LEVEL",
-            "PREREQUISITE",
-        ]
-        for k in required_raw_keys:
-            if k not in raw:
-                raise InvalidDataFormatError(f"Missing quest field: {k}")
-
         # Build final quest dict with proper types
         quest = {
             "quest_id": raw["QUEST_ID"],
@@ -301,8 +690,8 @@ def parse_quest_block(lines):
             else raw["PREREQUISITE"],
         }
 
-    except (ValueError, KeyError) as e:
-        # Bad numbers or missing keys
+    except ValueError as e:
+        # Bad numbers
         raise InvalidDataFormatError("Invalid quest data format") from e
 
     return quest
@@ -320,37 +709,16 @@ def parse_item_block(lines):
     Raises:
         InvalidDataFormatError if parsing fails
     """
-    raw = {}
+    raw = parse_block_fields(
+        lines, "item", ["ITEM_ID", "NAME", "TYPE", "EFFECT", "COST", "DESCRIPTION"]
+    )
 
-    try:
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            if ":" not in line:
-                raise InvalidDataFormatError("Invalid item line format")
-            key, value = line.split(":", 1)
-            key = key.strip().upper()
-            value = value.strip()
-            raw[key] = value
-
-        required_raw_keys = [
-            "ITEM_ID",
-            "NAME",
-            "TYPE",
-            "EFFECT",
-            "COST",
-            "DESCRIPTION",
-        ]
-        for k in required_raw_keys:
-            if k not in raw:
-                raise InvalidDataFormatError(f"Missing item field: {k}")
-
-        # basic type checking
-        item_type = raw["TYPE"].lower()
-        if item_type not in ("weapon", "armor", "consumable"):
-            raise InvalidDataFormatError("Invalid item type")
+    # basic type checking
+    item_type = raw["TYPE"].lower()
+    if item_type not in ("weapon", "armor", "consumable"):
+        raise InvalidDataFormatError("Invalid item type")
 
+    try:
         item = {
             "item_id": raw["ITEM_ID"],
             "name": raw["NAME"],
@@ -360,11 +728,228 @@ def parse_item_block(lines):
             "description": raw["DESCRIPTION"],
         }
 
-    except (ValueError, KeyError) as e:
+    except ValueError as e:
         raise InvalidDataFormatError("Invalid item data format") from e
 
     return item
 
+def parse_class_block(lines):
+    """
+    Parse a block of lines into a character class dictionary.
+
+    Args:
+        lines: List of strings representing one class
+
+    Returns:
+        Dictionary with class data
+
+    Raises:
+        InvalidDataFormatError if parsing fails
+    """
+    raw = parse_block_fields(
+        lines, "class", ["CLASS", "HEALTH", "STRENGTH", "MAGIC", "ABILITY"]
+    )
+
+    try:
+        class_data = {
+            "class": raw["CLASS"],
+            "health": int(raw["HEALTH"]),
+            "strength": int(raw["STRENGTH"]),
+            "magic": int(raw["MAGIC"]),
+            "ability": raw["ABILITY"].lower(),
+            # Turns before the ability can be used again (0 = once per battle)
+            "cooldown": int(raw.get("COOLDOWN", 0)),
+            "speed": int(raw.get("SPEED", DEFAULT_SPEED)),
+        }
+    except ValueError as e:
+        raise InvalidDataFormatError("Invalid class data format") from e
+
+    validate_class_data(class_data)
+    return class_data
+
+def parse_enemy_block(lines):
+    """
+    Parse a block of lines into an enemy dictionary.
+
+    Args:
+        lines: List of strings representing one enemy type
+
+    Returns:
+        Dictionary with enemy data
+
+    Raises:
+        InvalidDataFormatError if parsing fails
+    """
+    raw = parse_block_fields(lines, "enemy", [
+        "ENEMY_ID", "NAME", "HEALTH", "STRENGTH", "MAGIC",
+        "XP_REWARD", "GOLD_REWARD", "MIN_LEVEL", "MAX_LEVEL", "SPAWN_WEIGHT",
+    ])
+
+    try:
+        enemy = {
+            "enemy_id": raw["ENEMY_ID"].lower(),
+            "name": raw["NAME"],
+            "health": int(raw["HEALTH"]),
+            "strength": int(raw["STRENGTH"]),
+            "magic": int(raw["MAGIC"]),
+            "xp_reward": int(raw["XP_REWARD"]),
+            "gold_reward": int(raw["GOLD_REWARD"]),
+            "min_level": int(raw["MIN_LEVEL"]),
+            "max_level": None
+            if raw["MAX_LEVEL"].upper() == "NONE"
+            else int(raw["MAX_LEVEL"]),
+            "spawn_weight": int(raw["SPAWN_WEIGHT"]),
+            "speed": int(raw.get("SPEED", DEFAULT_SPEED)),
+            "behavior": parse_behavior_rules(raw.get("BEHAVIOR", "")),
+            # Growth per level above MIN_LEVEL, e.g. HEALTH_PER_LEVEL: 20
+            "per_level": {
+                stat: int(raw[f"{stat.upper()}_PER_LEVEL"])
+                for stat in ENEMY_SCALED_STATS if f"{stat.upper()}_PER_LEVEL" in raw
+            },
+        }
+    except ValueError as e:
+        raise InvalidDataFormatError("Invalid enemy data format") from e
+
+    validate_enemy_data(enemy)
+    return enemy
+
+def parse_behavior_rules(value):
+    """
+    Parse a BEHAVIOR value like "hp<30:heal, turn%3=0:special, defend".
+
+    Rules are checked in order and the first match picks the enemy's
+    action; anything unmatched is a basic attack. A rule is
+    CONDITION&CONDITION...:ACTION, or just ACTION (always matches).
+    Conditions:
+        hp<N      health below N% of max_health
+        hp>=N     health at least N% of max_health
+        turn%P=R  turn number leaves remainder R when divided by P
+
+    Returns:
+        List of rule dictionaries
+    Raises:
+        ValueError if a rule is malformed
+    """
+    rules = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        conditions, _, action = entry.rpartition(":")
+        rule = {"action": action.strip().lower(), "hp_below": None,
+                "hp_at_least": None, "period": 1, "phase": 0}
+        for condition in filter(None, (c.strip().lower() for c in conditions.split("&"))):
+            if condition.startswith("hp>="):
+                rule["hp_at_least"] = int(condition[4:])
+            elif condition.startswith("hp<"):
+                rule["hp_below"] = int(condition[3:])
+            elif condition.startswith("turn%"):
+                period, phase = condition[5:].split("=")
+                rule["period"], rule["phase"] = int(period), int(phase)
+            else:
+                raise ValueError(f"Unknown behavior condition: {condition}")
+        rules.append(rule)
+    return rules
+
+def format_behavior_rules(rules):
+    """
+    Turn behavior rule dictionaries back into a BEHAVIOR value.
+    """
+    entries = []
+    for rule in rules:
+        conditions = []
+        if rule.get("hp_below") is not None:
+            conditions.append(f"hp<{rule['hp_below']}")
+        if rule.get("hp_at_least") is not None:
+            conditions.append(f"hp>={rule['hp_at_least']}")
+        if rule.get("period", 1) > 1:
+            conditions.append(f"turn%{rule['period']}={rule['phase']}")
+        prefix = "&".join(conditions)
+        entries.append(f"{prefix}:{rule['action']}" if prefix else rule["action"])
+    return ", ".join(entries)
+
+def parse_loot_drops(value):
+    """
+    Parse a DROPS value like "health_potion:30:1-2, iron_sword:5:1".
+
+    Each entry is ITEM_ID:WEIGHT:QUANTITY where QUANTITY is N or MIN-MAX.
+
+    Returns:
+        List of drop dictionaries
+    Raises:
+        ValueError if an entry is malformed
+    """
+    drops = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        item_id, weight, quantity = entry.split(":")
+        low, _, high = quantity.partition("-")
+        drops.append({
+            "item_id": item_id.strip(),
+            "weight": int(weight),
+            "min_quantity": int(low),
+            "max_quantity": int(high) if high else int(low),
+        })
+    return drops
+
+def format_loot_drops(drops):
+    """
+    Turn drop dictionaries back into a DROPS value.
+    """
+    entries = []
+    for drop in drops:
+        quantity = str(drop["min_quantity"])
+        if drop["max_quantity"] != drop["min_quantity"]:
+            quantity += f"-{drop['max_quantity']}"
+        entries.append(f"{drop['item_id']}:{drop['weight']}:{quantity}")
+    return ", ".join(entries)
+
+def default_loot_tables(items=None):
+    """
+    Copy DEFAULT_LOOT, leaving out drops of items that aren't in items
+    (nothing is left out when items is None).
+
+    Returns: Dictionary {enemy_id: loot_table_dict}
+    """
+    tables = {}
+    for enemy_id, table in DEFAULT_LOOT.items():
+        drops = [dict(drop) for drop in table["drops"]
+                 if items is None or drop["item_id"] in items]
+        tables[enemy_id] = dict(table, drops=drops)
+    return tables
+
+def parse_loot_block(lines):
+    """
+    Parse a block of lines into a loot table dictionary.
+
+    Args:
+        lines: List of strings representing one enemy's loot table
+
+    Returns:
+        Dictionary with loot table data
+
+    Raises:
+        InvalidDataFormatError if parsing fails
+    """
+    raw = parse_block_fields(lines, "loot", ["ENEMY_ID", "DROPS"])
+
+    try:
+        loot = {
+            "enemy_id": raw["ENEMY_ID"].lower(),
+            # Independent draws per victory
+            "rolls": int(raw.get("ROLLS", 1)),
+            # Weight of a draw that drops nothing
+            "nothing_weight": int(raw.get("NOTHING", 0)),
+            "drops": parse_loot_drops(raw["DROPS"]),
+        }
+    except ValueError as e:
+        raise InvalidDataFormatError("Invalid loot data format") from e
+
+    validate_loot_data(loot)
+    return loot
+
 # ============================================================================
 # TESTING
 # ============================================================================
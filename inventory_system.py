@@ -44,6 +44,31 @@ def add_item_to_inventory(character, item_id):
     return True
 
 
+def add_items_to_inventory(character, items):
+    """
+    Add several items at once, keeping whatever doesn't fit
+
+    Args:
+        character: Character dictionary
+        items: Dictionary {item_id: quantity}
+
+    Returns: Dictionary {item_id: quantity} of items that didn't fit
+             (empty if everything was added)
+    """
+    inventory = character.setdefault("inventory", [])
+    space = MAX_INVENTORY_SIZE - len(inventory)
+
+    overflow = {}
+    for item_id, quantity in items.items():
+        fits = min(quantity, max(space, 0))
+        if fits:
+            inventory.extend([item_id] * fits)
+            space -= fits
+        if quantity > fits:
+            overflow[item_id] = quantity - fits
+    return overflow
+
+
 def remove_item_from_inventory(character, item_id):
     """
     Remove an item from character's inventory
@@ -0,0 +1,184 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Loot System Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module rolls item drops for defeated enemies. Loot tables come
+from data/loot.txt, e.g.:
+
+    ENEMY_ID: goblin
+    ROLLS: 1
+    NOTHING: 60
+    DROPS: health_potion:30:1-2, leather_armor:10:1
+
+Each roll picks one outcome by weight (NOTHING is the weight of no
+drop), then a quantity in the entry's range. Every table is compiled
+once into an alias table (weighted_sampling), so a roll is O(1) however
+many entries the table has.
+"""
+
+import random
+
+from custom_exceptions import MissingDataFileError
+
+from game_data import (
+    load_items,
+    load_loot_tables,
+    validate_loot_data,
+    default_loot_tables,
+    DEFAULT_LOOT
+)
+from weighted_sampling import build_alias_table
+
+# Loot registry - filled once by load_loot_catalog()
+_loot_tables = None     # {enemy_id: loot_table_dict}
+_loot_samplers = {}     # {enemy_id: (rolls, outcomes, probabilities, aliases)}
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_loot_catalog(filename="data/loot.txt", items_filename="data/items.txt"):
+    """
+    (Re)load the loot tables and compile their samplers.
+
+    Dropped items are checked against the item catalog when the item
+    file exists. Falls back to DEFAULT_LOOT if the loot file doesn't.
+
+    Returns: Dictionary {enemy_id: loot_table_dict}
+    Raises: InvalidDataFormatError (including unknown items),
+            CorruptedDataError from game_data
+    """
+    try:
+        items = load_items(items_filename)
+    except MissingDataFileError:
+        items = None
+
+    try:
+        tables = load_loot_tables(filename)
+    except MissingDataFileError:
+        tables = default_loot_tables(items)
+
+    set_loot_tables(tables, items)
+    return tables
+
+
+def set_loot_tables(tables, items=None):
+    """
+    Install loot tables {enemy_id: loot_table_dict} directly.
+
+    Raises: InvalidDataFormatError if a table is invalid or (when items
+            is given) drops an item that isn't in it
+    """
+    global _loot_tables
+
+    samplers = {}
+    for enemy_id, table in tables.items():
+        validate_loot_data(table, items)
+        samplers[enemy_id] = compile_loot_table(table)
+
+    _loot_tables = tables
+    _loot_samplers.clear()
+    _loot_samplers.update(samplers)
+
+
+def get_loot_tables():
+    """
+    Get the loot tables, loading them on first use.
+
+    Returns: Dictionary {enemy_id: loot_table_dict}
+    """
+    if _loot_tables is None:
+        load_loot_catalog()
+    return _loot_tables
+
+
+def compile_loot_table(table):
+    """
+    Turn a loot table into a sampler
+
+    Returns: Tuple (rolls, outcomes, probabilities, aliases) - the last
+             two are the alias table; outcomes[i] is None for "nothing"
+             or (item_id, min_quantity, quantity span)
+    """
+    outcomes = []
+    weights = []
+    if table["nothing_weight"] > 0:
+        outcomes.append(None)
+        weights.append(table["nothing_weight"])
+    for drop in table["drops"]:
+        if drop["weight"] > 0:
+            outcomes.append((drop["item_id"], drop["min_quantity"],
+                             drop["max_quantity"] - drop["min_quantity"] + 1))
+            weights.append(drop["weight"])
+
+    if not outcomes:
+        # Every drop was filtered out of a default table
+        return (table["rolls"], [None]) + build_alias_table([1])
+    return (table["rolls"], outcomes) + build_alias_table(weights)
+
+# ============================================================================
+# ROLLING LOOT
+# ============================================================================
+
+def roll_loot(enemy_id, rng=None, loot=None):
+    """
+    Roll the drops for one defeated enemy
+
+    Args:
+        enemy_id: Enemy type (enemies without a loot table drop nothing)
+        rng: Optional random.Random (seeded battles); default random module
+        loot: Optional dictionary to add the drops to (e.g. a grind total)
+
+    Returns: Dictionary {item_id: quantity}
+    """
+    if loot is None:
+        loot = {}
+    if _loot_tables is None:
+        load_loot_catalog()
+
+    sampler = _loot_samplers.get(enemy_id)
+    if sampler is None:
+        return loot
+
+    if rng is None:
+        rng = random
+    rolls, outcomes, probabilities, aliases = sampler
+    columns = len(outcomes)
+    for _ in range(rolls):
+        # alias_draw, inlined - this runs after every won battle
+        u = rng.random() * columns
+        column = int(u)
+        if u - column >= probabilities[column]:
+            column = aliases[column]
+        outcome = outcomes[column]
+        if outcome is None:
+            continue
+        item_id, low, span = outcome
+        quantity = low if span == 1 else low + int(rng.random() * span)
+        loot[item_id] = loot.get(item_id, 0) + quantity
+    return loot
+
+
+def format_loot(loot):
+    """
+    Describe drops for display, e.g. "2x health_potion, 1x iron_sword"
+    """
+    return ", ".join(f"{quantity}x {item_id}" for item_id, quantity in loot.items())
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== LOOT SYSTEM TEST ===")
+
+    # totals = {}
+    # for _ in range(10000):
+    #     roll_loot("orc", loot=totals)
+    # print(format_loot(totals))
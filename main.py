@@ -16,6 +16,8 @@ import character_manager
 import inventory_system
 import quest_handler
 import combat_system
+import auto_grind
+import loot_system
 import game_data
 from custom_exceptions import *
 
@@ -74,24 +76,21 @@ def new_game():
     if not name:
         name = "Hero"
 
+    # Classes come from the class registry (data/classes.txt)
+    class_names = character_manager.list_character_classes()
+
     print("\nChoose your class:")
-    print("1. Warrior")
-    print("2. Mage")
-    print("3. Rogue")
-    print("4. Cleric")
-    class_choice = input("Enter choice (1-4): ").strip()
-
-    class_map = {
-        "1": "Warrior",
-        "2": "Mage",
-        "3": "Rogue",
-        "4": "Cleric"
-    }
-    char_class = class_map.get(class_choice, "Warrior")
+    for idx, class_name in enumerate(class_names, start=1):
+        print(f"{idx}. {class_name}")
+    class_choice = input(f"Enter choice (1-{len(class_names)}): ").strip()
+
+    class_map = {str(idx): class_name for idx, class_name in enumerate(class_names, start=1)}
+    char_class = class_map.get(class_choice, class_names[0])
 
     try:
         character = character_manager.create_character(name, char_class)
         current_character = character
+        quest_handler.attach_quest_frontier(current_character, all_quests)
         print(f"\nCreated {char_class} named {name}!")
         save_game()
         game_loop()
@@ -138,6 +137,7 @@ def load_game():
 
     try:
         current_character = character_manager.load_character(selected_name)
+        quest_handler.attach_quest_frontier(current_character, all_quests)
         print(f"\nLoaded character: {selected_name}")
         game_loop()
     except CharacterNotFoundError as e:
@@ -181,6 +181,8 @@ def game_loop():
             print("Saving game and returning to main menu...")
             save_game()
             game_running = False
+        elif choice == 7:
+            grind()
         else:
             print("Invalid choice.")
 
@@ -199,8 +201,9 @@ def game_menu():
     4. Explore (Find Battles)
     5. Shop
     6. Save and Quit
+    7. Auto-Grind (Explore Many Times)
     
-    Returns: Integer choice (1-6)
+    Returns: Integer choice (1-7)
     """
     while True:
         print("\n=== GAME MENU ===")
@@ -210,12 +213,13 @@ def game_menu():
         print("4. Explore (Find Battles)")
         print("5. Shop")
         print("6. Save and Quit")
-        choice = input("Enter choice (1-6): ").strip()
+        print("7. Auto-Grind (Explore Many Times)")
+        choice = input("Enter choice (1-7): ").strip()
 
-        if choice in {"1", "2", "3", "4", "5", "6"}:
+        if choice in {"1", "2", "3", "4", "5", "6", "7"}:
             return int(choice)
         else:
-            print("Invalid choice. Please enter 1-6.")
+            print("Invalid choice. Please enter 1-7.")
 
 
 # ============================================================================
@@ -391,12 +395,56 @@ def explore():
     try:
         result = battle.start_battle()
         print(f"Battle result: {result['winner']}")
+        if result["loot_overflow"]:
+            print(f"Left behind (inventory full): "
+                  f"{loot_system.format_loot(result['loot_overflow'])}")
     except CharacterDeadError:
         print("You cannot fight because you are dead.")
     finally:
         if current_character.get("health", 0) <= 0:
             handle_character_death()
 
+def grind(count=None, stop_below=None):
+    """
+    Explore count times in a row without a battle screen per fight
+
+    count / stop_below are asked for when not given (stop_below is the
+    health fraction to stop at, e.g. 0.25). Saves once at the end.
+    """
+    global current_character
+
+    print("\n=== AUTO-GRIND ===")
+
+    if not combat_system.can_character_fight(current_character):
+        print("You are not in condition to fight (dead or already in battle).")
+        return
+
+    try:
+        if count is None:
+            count = int(input("How many fights? ").strip())
+        if stop_below is None:
+            percent = input("Stop below what health % (blank = 0)? ").strip()
+            stop_below = int(percent) / 100 if percent else 0.0
+        summary = auto_grind.auto_grind(current_character, count, stop_below)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    enemies = ", ".join(f"{n} {enemy_id}" for enemy_id, n in summary["enemies"].items())
+    print(f"Fought {summary['fights']} battles ({enemies or 'none'}), won {summary['wins']}.")
+    print(f"Rewards: {summary['xp_gained']} XP, {summary['gold_gained']} gold, "
+          f"{summary['levels_gained']} level(s)")
+    if summary["loot"]:
+        print(f"Loot: {loot_system.format_loot(summary['loot'])}")
+    if summary["loot_overflow"]:
+        print(f"Left behind (inventory full): {loot_system.format_loot(summary['loot_overflow'])}")
+    if summary["stopped"] == auto_grind.STOP_LOW_HEALTH:
+        print(f"Stopped to rest at {summary['health']} health.")
+
+    save_game()
+    if current_character.get("health", 0) <= 0:
+        handle_character_death()
+
 def shop():
     """Shop menu for buying/selling items"""
     global current_character, all_items
@@ -462,7 +510,7 @@ def save_game():
         print(f"Error saving game: {e}")
 
 def load_game_data():
-    """Load all quest and item data from files"""
+    """Load quest and item data from files and check the other catalogs"""
     global all_quests, all_items
 
     try:
@@ -477,6 +525,15 @@ def load_game_data():
         # Let main() handle this
         raise
 
+    # Build the quest graph now, so bad prerequisites show up at load time
+    quest_handler.validate_quest_prerequisites(all_quests)
+
+    # Same for classes, enemies and loot tables, which are otherwise
+    # loaded on first use in the middle of a game
+    character_manager.load_class_registry()
+    combat_system.load_enemy_catalog()
+    loot_system.load_loot_catalog()
+
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
@@ -527,7 +584,7 @@ def main():
         print("Creating default game data...")
         game_data.create_default_data_files()
         load_game_data()
-    except InvalidDataFormatError as e:
+    except (InvalidDataFormatError, CorruptedDataError, QuestError) as e:
         print(f"Error loading game data: {e}")
         print("Please check data files for errors.")
         return
@@ -0,0 +1,422 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Party Battle Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module runs party-vs-horde battles: any number of characters
+against any number of enemies, using the same damage and special
+ability functions as SimpleBattle.
+
+Turn order comes from a priority queue keyed on time: a combatant with
+speed s acts every INITIATIVE_SCALE // s time units, so faster
+combatants act more often. Targets are picked from indexed structures
+instead of scanning the other side every action:
+    - AliveSet keeps living combatants in a list with a position map,
+      so removing the dead and picking a random target are both O(1)
+    - the weakest target comes from a lazy min-heap of (health, index)
+      that skips stale entries
+"""
+
+import random
+from heapq import heappush, heappop
+
+from custom_exceptions import (
+    CharacterDeadError,
+    InvalidTargetError,
+    AbilityOnCooldownError
+)
+
+from character_manager import (
+    gain_experience,
+    add_gold,
+    get_class_ability_cooldown,
+    get_class_speed
+)
+from combat_system import (
+    BattleEvent,
+    NullBattleSink,
+    NULL_SINK,
+    calculate_damage,
+    get_enemy_behavior,
+    use_special_ability
+)
+from enemy_ai import (
+    choose_action,
+    enemy_heal_amount,
+    ACTION_DEFEND,
+    ACTION_HEAL,
+    ACTION_SPECIAL,
+    ENEMY_HEAL_LIMIT
+)
+from game_data import DEFAULT_SPEED
+
+# Time units per "round"; speed 10 acts every 100000 units
+INITIATIVE_SCALE = 1000000
+
+PARTY = 0
+HORDE = 1
+
+# BattleEvent actor names for each side (same as SimpleBattle)
+SIDE_ACTORS = ("player", "enemy")
+
+# Target choices
+TARGET_WEAKEST = "weakest"
+TARGET_RANDOM = "random"
+
+# ============================================================================
+# INDEXED TARGET STRUCTURES
+# ============================================================================
+
+class AliveSet:
+    """Living combatant indexes with O(1) remove and random pick"""
+
+    def __init__(self, indexes):
+        """Start with every index in indexes alive"""
+        self.items = list(indexes)
+        self.position = {index: pos for pos, index in enumerate(self.items)}
+
+    def __len__(self):
+        """Number of living combatants"""
+        return len(self.items)
+
+    def __contains__(self, index):
+        """True if the combatant is still alive"""
+        return index in self.position
+
+    def remove(self, index):
+        """Remove a combatant by swapping the last one into its place"""
+        pos = self.position.pop(index)
+        last = self.items.pop()
+        if last != index:
+            self.items[pos] = last
+            self.position[last] = pos
+
+    def pick(self, rng):
+        """Random living combatant"""
+        return self.items[rng.randrange(len(self.items))]
+
+
+class WeakestHeap:
+    """
+    Lazy min-heap of (health, index) for one side
+
+    Every health change pushes a new entry; entries whose health no
+    longer matches (or whose combatant died) are dropped when they reach
+    the top.
+    """
+
+    def __init__(self, combatants, indexes):
+        """Build the heap from the starting health values"""
+        self.combatants = combatants
+        self.heap = [(combatants[i]["health"], i) for i in indexes]
+        self.heap.sort()
+
+    def update(self, index):
+        """Record a combatant's new health"""
+        heappush(self.heap, (self.combatants[index]["health"], index))
+
+    def weakest(self, alive):
+        """Index of the living combatant with the least health"""
+        heap = self.heap
+        combatants = self.combatants
+        while heap:
+            health, index = heap[0]
+            if index in alive and combatants[index]["health"] == health:
+                return index
+            heappop(heap)
+        return None
+
+# ============================================================================
+# PARTY BATTLE
+# ============================================================================
+
+def combatant_speed(combatant):
+    """
+    Initiative speed of a character or enemy
+
+    Enemies carry 'speed' from data/enemies.txt; characters use their
+    class's SPEED unless the dictionary has its own 'speed'.
+    """
+    speed = combatant.get("speed")
+    if speed is None:
+        if "class" in combatant:
+            speed = get_class_speed(combatant["class"])
+        else:
+            speed = DEFAULT_SPEED
+    return max(1, speed)
+
+
+class PartyBattle:
+    """
+    Party-vs-horde battle with an initiative queue
+    """
+
+    def __init__(self, party, horde, sink=NULL_SINK, action_source=None,
+                 targeting=TARGET_WEAKEST, seed=None):
+        """
+        Set up a battle between a list of characters and a list of enemies
+
+        sink gets BattleEvents like SimpleBattle's, called as
+        sink.emit(event, party_member, horde_member).
+
+        action_source(battle, character) picks each party member's action:
+        "attack" or "ability". None means always attack. Enemies follow
+        their behavior rules (enemy_ai), counting their own actions as
+        turns.
+
+        targeting is TARGET_WEAKEST (lowest health) or TARGET_RANDOM.
+
+        Raises: InvalidTargetError if either side is empty or an enemy
+                starts dead (its rewards would be paid out for free)
+                CharacterDeadError if every party member is dead
+                ValueError for an unknown targeting mode
+        """
+        if not party or not horde:
+            raise InvalidTargetError("Both sides need at least one combatant.")
+        if any(enemy.get("health", 0) <= 0 for enemy in horde):
+            raise InvalidTargetError("Enemy is already defeated and cannot fight.")
+        if targeting not in (TARGET_WEAKEST, TARGET_RANDOM):
+            raise ValueError(f"Unknown targeting: {targeting}")
+
+        self.party = party
+        self.horde = horde
+        self.combatants = list(party) + list(horde)
+        self.party_size = len(party)
+        self.action_source = action_source
+        self.targeting = targeting
+        self.action_count = 0
+        self.combat_active = True
+
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.sink = sink
+        self._emit = None if isinstance(sink, NullBattleSink) else sink.emit
+
+        count = len(self.combatants)
+        party_alive = [i for i in range(self.party_size)
+                       if self.combatants[i].get("health", 0) > 0]
+        if not party_alive:
+            raise CharacterDeadError("Every party member is dead and cannot fight.")
+        horde_alive = list(range(self.party_size, count))
+
+        self.alive = (AliveSet(party_alive), AliveSet(horde_alive))
+        self.weakest = (WeakestHeap(self.combatants, party_alive),
+                        WeakestHeap(self.combatants, horde_alive))
+
+        # Initiative queue of (time of next action, -speed, index):
+        # ties go to the faster combatant, then the party, then list order
+        self.delays = [INITIATIVE_SCALE // combatant_speed(c) for c in self.combatants]
+        self.queue = [(self.delays[i], -combatant_speed(self.combatants[i]), i)
+                      for i in party_alive + horde_alive]
+        self.queue.sort()
+
+        # Own-action counters for ability cooldowns and enemy behavior turns
+        self.actions_taken = [0] * count
+        self.ability_ready_at = {}
+
+        # Enemy AI state (behaviors are None for party members and attackers)
+        self.behaviors = [None] * self.party_size + [
+            get_enemy_behavior(enemy.get("enemy_id")) for enemy in horde
+        ]
+        self.defending = [False] * count
+        self.heals_left = [ENEMY_HEAL_LIMIT] * count
+
+        for character in party:
+            character["in_battle"] = True
+            character["ability_on_cooldown"] = False
+
+    def side_of(self, index):
+        """PARTY or HORDE"""
+        return PARTY if index < self.party_size else HORDE
+
+    def start_battle(self):
+        """
+        Run the battle until one side is wiped out
+
+        Returns: Dictionary with battle results:
+                {'winner': 'party'|'horde', 'actions': int,
+                 'survivors': int, 'xp_gained': int, 'gold_gained': int}
+                XP and gold are split evenly between surviving party members.
+        """
+        if self._emit is not None:
+            self._emit(BattleEvent(0, "battle", "start"), self.party[0], self.horde[0])
+
+        alive = self.alive
+        queue = self.queue
+        while alive[PARTY] and alive[HORDE]:
+            time, negative_speed, index = heappop(queue)
+            if index not in alive[self.side_of(index)]:
+                # Died since it was queued
+                continue
+            self.take_action(index)
+            heappush(queue, (time + self.delays[index], negative_speed, index))
+
+        return self.finish()
+
+    def choose_target(self, side):
+        """Index of the combatant on `side` to attack next"""
+        if self.targeting == TARGET_WEAKEST:
+            return self.weakest[side].weakest(self.alive[side])
+        return self.alive[side].pick(self.rng)
+
+    def take_action(self, index):
+        """
+        One combatant acts: attack or use its special ability
+        """
+        self.action_count += 1
+        self.actions_taken[index] += 1
+        actor = self.combatants[index]
+        side = self.side_of(index)
+        other = HORDE if side == PARTY else PARTY
+        target_index = self.choose_target(other)
+        target = self.combatants[target_index]
+
+        action = "attack"
+        if side == PARTY:
+            self.refresh_cooldown(index)
+            if self.action_source is not None:
+                action = self.action_source(self, actor)
+        elif self.behaviors[index] is not None:
+            action = self.choose_enemy_action(index)
+            if action in ("defend", "heal"):
+                return
+
+        message = None
+        if action == "ability":
+            health_before = target["health"]
+            try:
+                message = use_special_ability(actor, target, self.rng)
+            except AbilityOnCooldownError:
+                message = None
+            if message is not None:
+                self.start_cooldown(index)
+                damage = health_before - target["health"]
+                # Heals change the actor's own health
+                self.weakest[side].update(index)
+
+        if message is None:
+            if action != "special":
+                action = "attack"
+            damage = calculate_damage(actor, target)
+            if action == "special":
+                damage += actor.get("magic", 0)
+            elif self.defending[target_index]:
+                damage = max(1, damage // 2)
+            target["health"] = max(0, target.get("health", 0) - damage)
+
+        self.weakest[other].update(target_index)
+        if target["health"] <= 0:
+            self.alive[other].remove(target_index)
+
+        if self._emit is not None:
+            if side == PARTY:
+                pair = (actor, target)
+            else:
+                pair = (target, actor)
+            self._emit(BattleEvent(self.action_count, SIDE_ACTORS[side], action,
+                                   damage, target["health"], message), *pair)
+
+    def choose_enemy_action(self, index):
+        """
+        Look up a horde member's action in its behavior table
+
+        Defend and heal are carried out here; returns the action name
+        ("attack", "special", "defend" or "heal").
+        """
+        enemy = self.combatants[index]
+        self.defending[index] = False
+        code = choose_action(self.behaviors[index], enemy.get("health", 0),
+                             enemy.get("max_health", 0), self.actions_taken[index])
+
+        if code == ACTION_DEFEND:
+            self.defending[index] = True
+            if self._emit is not None:
+                self._emit(BattleEvent(self.action_count, "enemy", "defend"),
+                           self.party[0], enemy)
+            return "defend"
+
+        if code == ACTION_HEAL and self.heals_left[index] > 0:
+            self.heals_left[index] -= 1
+            health = enemy.get("health", 0)
+            enemy["health"] = min(enemy.get("max_health", health),
+                                  health + enemy_heal_amount(enemy))
+            self.weakest[HORDE].update(index)
+            if self._emit is not None:
+                self._emit(BattleEvent(self.action_count, "enemy", "heal",
+                                       health - enemy["health"], enemy["health"]),
+                           self.party[0], enemy)
+            return "heal"
+
+        return "special" if code == ACTION_SPECIAL else "attack"
+
+    def start_cooldown(self, index):
+        """Party member just used their ability - start its cooldown"""
+        turns = get_class_ability_cooldown(self.combatants[index].get("class", ""))
+        if turns > 0:
+            self.ability_ready_at[index] = self.actions_taken[index] + turns
+
+    def refresh_cooldown(self, index):
+        """Clear ability_on_cooldown once enough of the member's own actions passed"""
+        ready_at = self.ability_ready_at.get(index)
+        if ready_at is not None and self.actions_taken[index] >= ready_at:
+            del self.ability_ready_at[index]
+            self.combatants[index]["ability_on_cooldown"] = False
+
+    def finish(self):
+        """Mark the battle over, hand out rewards and build the result"""
+        self.combat_active = False
+        for character in self.party:
+            character["in_battle"] = False
+
+        # Party order, so the reward remainder always goes to the same heroes
+        survivors = [self.combatants[i] for i in sorted(self.alive[PARTY].items)]
+        result = {
+            "winner": "party" if survivors else "horde",
+            "actions": self.action_count,
+            "survivors": len(survivors),
+            "xp_gained": 0,
+            "gold_gained": 0,
+        }
+
+        if survivors:
+            xp = sum(enemy.get("xp_reward", 0) for enemy in self.horde)
+            gold = sum(enemy.get("gold_reward", 0) for enemy in self.horde)
+            # Even shares; the first (xp % survivors) heroes get 1 extra
+            # XP (same for gold), so nothing is lost to rounding
+            xp_share, xp_extra = divmod(xp, len(survivors))
+            gold_share, gold_extra = divmod(gold, len(survivors))
+            for position, character in enumerate(survivors):
+                gain_experience(character, xp_share + (position < xp_extra))
+                add_gold(character, gold_share + (position < gold_extra))
+            result["xp_gained"] = xp
+            result["gold_gained"] = gold
+
+        if self._emit is not None:
+            action = "victory" if survivors else "defeat"
+            detail = {"xp": result["xp_gained"], "gold": result["gold_gained"]}
+            self._emit(BattleEvent(self.action_count, SIDE_ACTORS[PARTY if survivors else HORDE],
+                                   action, detail=detail),
+                       self.party[0], self.horde[0])
+
+        return result
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== PARTY BATTLE TEST ===")
+
+    # from character_manager import create_character
+    # from combat_system import create_enemy
+    # party = [create_character(f"Hero{i}", "Warrior") for i in range(3)]
+    # horde = [create_enemy("goblin") for _ in range(5)]
+    # print(PartyBattle(party, horde).start_battle())
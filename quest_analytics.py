@@ -0,0 +1,426 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Analytics Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module is a stand-alone analytics layer over quest completion.
+The game itself is unchanged: saves, create_character and quest_handler
+keep completed quests as QuestSets of ids. Bitsets are built from those
+when a roster is analysed, and can be stored as analytics snapshots
+next to (not instead of) the save files.
+
+A QuestIndex gives every quest in the catalog a fixed bit (its
+position in data/quests.txt - add new quests at the end to keep
+existing bits where they are). A character's completed quests then
+become one int, and:
+
+    completion percentage   popcount / number of quests
+    rewards earned          dot product of the bits with the XP and
+                            gold reward vectors (NumPy; without it the
+                            set bits' rewards are added up instead)
+
+Stored bitsets (QuestIndex.to_bytes, save_roster_snapshot) start with
+the number of quests they cover and a fingerprint of those quest ids,
+so data written for a different catalog is rejected instead of
+decoding to the wrong quests.
+
+For a whole roster, each character's bits are packed into one row of a
+NumPy uint8 array (number of quests / 8 bytes per character, instead of
+a list of strings), and completion counts, percentages, rewards and
+completion funnels are computed with vectorized bit operations.
+
+NumPy is needed for the roster functions (and makes rewards_earned a
+real dot product).
+"""
+
+import hashlib
+import struct
+
+from custom_exceptions import InvalidSaveDataError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Stored bitset header: number of quests covered, fingerprint of their ids
+BITSET_HEADER = struct.Struct("<I8s")
+
+# Roster snapshot: BITSET_HEADER, then the number of rows, then the rows
+SNAPSHOT_ROWS = struct.Struct("<Q")
+
+# Rows unpacked at a time when a roster function needs one byte per bit
+ROSTER_CHUNK = 65536
+
+# The index get_quest_index built last (reused while the catalog is the same)
+_quest_index = None
+
+# Set bits in every byte value, for row popcounts (built on first use)
+_popcount = None
+
+# ============================================================================
+# QUEST INDEX
+# ============================================================================
+
+class QuestIndex:
+    """
+    Fixed bit position and reward vectors for every quest in a catalog
+    """
+
+    def __init__(self, quest_data_dict):
+        """Number the quests in catalog order"""
+        self.quests = quest_data_dict
+        self.ids = list(quest_data_dict)
+        self.size = len(self.ids)
+        self.row_bytes = (self.size + 7) // 8
+        self.position = {quest_id: bit for bit, quest_id in enumerate(self.ids)}
+        self.reward_xp = [int(quest.get("reward_xp", 0)) for quest in quest_data_dict.values()]
+        self.reward_gold = [int(quest.get("reward_gold", 0)) for quest in quest_data_dict.values()]
+        self._fingerprints = {}
+        self._reward_vectors = None
+
+    def reward_vectors(self):
+        """
+        Rewards as a NumPy matrix, built on first use
+
+        Returns: int64 array of shape (size, 2) - columns are XP and gold
+        """
+        if self._reward_vectors is None:
+            self._reward_vectors = np.array([self.reward_xp, self.reward_gold],
+                                            dtype=np.int64).reshape(2, self.size).T.copy()
+        return self._reward_vectors
+
+    def fingerprint(self, count=None):
+        """
+        Fingerprint of the first count quest ids (default: all of them)
+
+        Returns: 8 bytes - the same for any catalog that starts with the
+                 same quests in the same order
+        """
+        if count is None:
+            count = self.size
+        fingerprint = self._fingerprints.get(count)
+        if fingerprint is None:
+            ids = "\n".join(self.ids[:count]).encode("utf-8")
+            fingerprint = hashlib.blake2b(ids, digest_size=8).digest()
+            self._fingerprints[count] = fingerprint
+        return fingerprint
+
+    def encode(self, quest_ids):
+        """
+        Bitset of quest ids (ids that aren't in the catalog are skipped)
+
+        Returns: int with bit position[quest_id] set for each quest
+        """
+        position = self.position
+        bits = 0
+        for quest_id in quest_ids:
+            bit = position.get(quest_id)
+            if bit is not None:
+                bits |= 1 << bit
+        return bits
+
+    def decode(self, bits):
+        """
+        Quest ids in a bitset
+
+        Returns: List of quest ids in catalog order
+        """
+        ids = self.ids
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(ids[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    def to_row(self, bits):
+        """Bitset as row_bytes bytes (bit i is bit i % 8 of byte i // 8)"""
+        return bits.to_bytes(self.row_bytes, "little")
+
+    def to_bytes(self, bits):
+        """Bitset for storing: BITSET_HEADER, then the to_row bytes"""
+        return BITSET_HEADER.pack(self.size, self.fingerprint()) + self.to_row(bits)
+
+    def from_bytes(self, data):
+        """
+        Bitset from to_bytes output
+
+        Bytes written before quests were added at the end of the catalog
+        still load; any other catalog change is rejected.
+
+        Raises: InvalidSaveDataError if the bytes are damaged or were
+                written for a different quest catalog
+        """
+        count = self.read_header(data, "Quest bitset")
+        if len(data) != BITSET_HEADER.size + (count + 7) // 8:
+            raise InvalidSaveDataError("Quest bitset has the wrong length")
+
+        bits = int.from_bytes(data[BITSET_HEADER.size:], "little")
+        if bits >> count:
+            raise InvalidSaveDataError("Quest bitset has bits past the end of its catalog")
+        return bits
+
+    def read_header(self, data, label):
+        """
+        Check the BITSET_HEADER at the start of stored data
+
+        Returns: Number of quests the stored bits cover
+        Raises: InvalidSaveDataError if the header is missing or was
+                written for a different quest catalog
+        """
+        try:
+            count, fingerprint = BITSET_HEADER.unpack_from(data)
+        except struct.error as e:
+            raise InvalidSaveDataError(f"{label} is too short") from e
+        if count > self.size or fingerprint != self.fingerprint(count):
+            raise InvalidSaveDataError(f"{label} was written for a different quest catalog")
+        return count
+
+
+def get_quest_index(quest_data_dict):
+    """
+    Get the index of a quest catalog, building it on first use
+
+    The last index is reused while it was built from this same
+    dictionary and the number of quests hasn't changed.
+
+    Returns: QuestIndex
+    """
+    global _quest_index
+
+    index = _quest_index
+    if index is None or index.quests is not quest_data_dict or index.size != len(quest_data_dict):
+        index = QuestIndex(quest_data_dict)
+        _quest_index = index
+    return index
+
+# ============================================================================
+# ONE CHARACTER
+# ============================================================================
+
+def completion_bits(character, index):
+    """
+    Bitset of a character's completed quests
+
+    Returns: int (see QuestIndex.encode)
+    """
+    return index.encode(character.get("completed_quests", ()))
+
+
+def completion_percentage(bits, index):
+    """
+    Bitset version of quest_handler.get_quest_completion_percentage
+
+    Returns: Float between 0 and 100
+    """
+    if index.size == 0:
+        return 0.0
+    return bits.bit_count() / index.size * 100.0
+
+
+def rewards_earned(bits, index):
+    """
+    Bitset version of quest_handler.get_total_quest_rewards_earned
+
+    The bits are unpacked and multiplied with QuestIndex.reward_vectors.
+    Without NumPy the rewards of the set bits are added up instead.
+
+    Returns: Dictionary with 'total_xp' and 'total_gold'
+    """
+    if np is not None and bits:
+        row = np.unpackbits(np.frombuffer(index.to_row(bits), dtype=np.uint8),
+                            count=index.size, bitorder="little")
+        total_xp, total_gold = (row @ index.reward_vectors()).tolist()
+        return {"total_xp": total_xp, "total_gold": total_gold}
+
+    reward_xp = index.reward_xp
+    reward_gold = index.reward_gold
+    total_xp = 0
+    total_gold = 0
+    while bits:
+        low = bits & -bits
+        bit = low.bit_length() - 1
+        total_xp += reward_xp[bit]
+        total_gold += reward_gold[bit]
+        bits ^= low
+    return {"total_xp": total_xp, "total_gold": total_gold}
+
+# ============================================================================
+# ROSTERS (NumPy)
+# ============================================================================
+
+def _require_numpy():
+    """Raise a helpful error if NumPy isn't installed"""
+    if np is None:
+        raise ImportError("quest_analytics roster functions need NumPy: pip install numpy")
+
+
+def _popcount_table():
+    """256-entry lookup table of set bits per byte value"""
+    global _popcount
+    if _popcount is None:
+        _popcount = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint16)
+    return _popcount
+
+
+def pack_roster(characters, index):
+    """
+    Pack the completed quests of many characters into a bit matrix
+
+    Args:
+        characters: Iterable of character dictionaries (e.g.
+                    roster_transfer.iter_roster_characters)
+
+    Returns: NumPy uint8 array of shape (characters, index.row_bytes)
+    """
+    _require_numpy()
+    rows = [index.to_row(completion_bits(character, index)) for character in characters]
+    packed = np.frombuffer(b"".join(rows), dtype=np.uint8)
+    return packed.reshape(len(rows), index.row_bytes).copy()
+
+
+def _unpacked_chunks(packed, index):
+    """Yield (start, rows x quests 0/1 uint8 array) a chunk at a time"""
+    for start in range(0, len(packed), ROSTER_CHUNK):
+        yield start, np.unpackbits(packed[start:start + ROSTER_CHUNK], axis=1,
+                                   count=index.size, bitorder="little")
+
+
+def roster_completion_percentages(packed, index):
+    """
+    Completion percentage of every character (row popcounts)
+
+    Returns: NumPy float64 array, one entry per row
+    """
+    _require_numpy()
+    if index.size == 0:
+        return np.zeros(len(packed))
+    counts = _popcount_table()[packed].sum(axis=1, dtype=np.int64)
+    return counts * (100.0 / index.size)
+
+
+def roster_rewards_earned(packed, index):
+    """
+    Quest XP and gold every character has earned (bits . reward vectors)
+
+    Returns: Tuple (xp, gold) of NumPy int64 arrays, one entry per row
+    """
+    _require_numpy()
+    totals = np.zeros((len(packed), 2), dtype=np.int64)
+    rewards = index.reward_vectors()
+    for start, bits in _unpacked_chunks(packed, index):
+        totals[start:start + len(bits)] = bits @ rewards
+    return totals[:, 0].copy(), totals[:, 1].copy()
+
+
+def quest_completion_counts(packed, index):
+    """
+    How many characters completed each quest
+
+    Returns: Dictionary {quest_id: count} in catalog order
+    """
+    _require_numpy()
+    counts = np.zeros(index.size, dtype=np.int64)
+    for _, bits in _unpacked_chunks(packed, index):
+        counts += bits.sum(axis=0, dtype=np.int64)
+    return dict(zip(index.ids, counts.tolist()))
+
+
+def completion_funnel(packed, index, quest_ids):
+    """
+    Completion funnel through a sequence of quests
+
+    Step k counts the characters who completed every quest in
+    quest_ids[:k + 1] - pass a prerequisite chain
+    (quest_handler.get_quest_prerequisite_chain) to see where players
+    drop off along a quest line.
+
+    Returns: List of (quest_id, count)
+    Raises: KeyError if a quest id isn't in the index
+    """
+    _require_numpy()
+    still_in = np.ones(len(packed), dtype=bool)
+    funnel = []
+    for quest_id in quest_ids:
+        bit = index.position[quest_id]
+        still_in &= (packed[:, bit >> 3] & (1 << (bit & 7))) != 0
+        funnel.append((quest_id, int(still_in.sum())))
+    return funnel
+
+
+# ============================================================================
+# ROSTER SNAPSHOTS
+# ============================================================================
+
+def save_roster_snapshot(path, packed, index):
+    """
+    Store a packed roster (pack_roster output) in a file
+
+    Returns: True if successful
+    Raises: ValueError if packed wasn't packed with this index
+            OSError (let it propagate)
+    """
+    _require_numpy()
+    if packed.ndim != 2 or packed.shape[1] != index.row_bytes:
+        raise ValueError("Packed roster rows don't match the quest index")
+    with open(path, "wb") as f:
+        f.write(BITSET_HEADER.pack(index.size, index.fingerprint()))
+        f.write(SNAPSHOT_ROWS.pack(len(packed)))
+        f.write(np.ascontiguousarray(packed, dtype=np.uint8).tobytes())
+    return True
+
+
+def load_roster_snapshot(path, index):
+    """
+    Load a save_roster_snapshot file for use with index
+
+    Snapshots taken before quests were added at the end of the catalog
+    still load (the new quests read as not completed).
+
+    Returns: NumPy uint8 array of shape (characters, index.row_bytes)
+    Raises: InvalidSaveDataError if the file is damaged or was written
+            for a different quest catalog
+            OSError (let it propagate)
+    """
+    _require_numpy()
+    with open(path, "rb") as f:
+        data = f.read()
+
+    count = index.read_header(data, "Roster snapshot")
+    try:
+        (rows,) = SNAPSHOT_ROWS.unpack_from(data, BITSET_HEADER.size)
+    except struct.error as e:
+        raise InvalidSaveDataError("Roster snapshot is too short") from e
+    stored_bytes = (count + 7) // 8
+    start = BITSET_HEADER.size + SNAPSHOT_ROWS.size
+    if len(data) != start + rows * stored_bytes:
+        raise InvalidSaveDataError("Roster snapshot has the wrong length")
+
+    stored = np.frombuffer(data, dtype=np.uint8, offset=start).reshape(rows, stored_bytes)
+    if count % 8 and rows and (stored[:, -1] >> (count % 8)).any():
+        raise InvalidSaveDataError("Roster snapshot has bits past the end of its catalog")
+    packed = np.zeros((rows, index.row_bytes), dtype=np.uint8)
+    packed[:, :stored_bytes] = stored
+    return packed
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== QUEST ANALYTICS TEST ===")
+
+    # from game_data import load_quests
+    # from roster_transfer import iter_roster_characters
+    # quests = load_quests()
+    # index = get_quest_index(quests)
+    # packed = pack_roster(iter_roster_characters("data/roster.jsonl.gz"), index)
+    # print(roster_completion_percentages(packed, index).mean())
+    # print(completion_funnel(packed, index, ["first_steps", "goblin_hunter", "orc_menace"]))
+    # save_roster_snapshot("data/roster_quests.bits", packed, index)
@@ -0,0 +1,368 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Graph Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module turns the quest catalog's PREREQUISITE links into a
+dependency graph, once. Each quest has at most one prerequisite, so the
+graph is a forest: building it follows every quest's links upward until
+it reaches a quest that is already placed, which takes O(quests) in
+total and catches missing prerequisites and cycles at load time.
+
+After that:
+    depth               quests above a quest (0 = no prerequisite)
+    topological order   every quest after its prerequisite
+    prerequisite chain  earliest prerequisite ... quest (cached per quest)
+    ancestors           every quest that must be done first (cached per quest)
+
+QuestFrontier keeps one character's available quests (the ones
+get_available_quests returns) up to date from those indexes instead of
+checking the whole catalog each time:
+    complete a quest    its dependents unlock
+    accept a quest      it leaves the frontier
+    abandon a quest     it comes back
+    level up            unlocked quests waiting on REQUIRED_LEVEL move in,
+                        cheapest level first (checked when next asked)
+"""
+
+from heapq import heappush, heappop
+
+from custom_exceptions import QuestNotFoundError, QuestDependencyCycleError
+
+# The graph get_quest_graph built last (reused while the catalog is the same)
+_quest_graph = None
+
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+def get_prerequisite(quest):
+    """
+    Prerequisite quest id of a quest dictionary
+
+    Returns: Quest id, or None when the quest has no prerequisite
+    """
+    prereq = quest.get("prerequisite", "NONE")
+    if not prereq or prereq == "NONE":
+        return None
+    return prereq
+
+
+class QuestGraph:
+    """
+    Prerequisite graph of one quest catalog
+
+    Describes the catalog as it was when the graph was built - build a
+    new one (or call get_quest_graph again) after editing prerequisites.
+    """
+
+    def __init__(self, quest_data_dict):
+        """
+        Build the graph, checking every prerequisite link
+
+        Raises: QuestNotFoundError if a prerequisite isn't in the catalog
+                QuestDependencyCycleError if prerequisites form a loop
+        """
+        self.quests = quest_data_dict
+        self.size = len(quest_data_dict)
+        self.position = {quest_id: i for i, quest_id in enumerate(quest_data_dict)}
+        self.parent = {}
+        self.children = {quest_id: [] for quest_id in quest_data_dict}
+        for quest_id, quest in quest_data_dict.items():
+            prereq = get_prerequisite(quest)
+            if prereq is not None and prereq not in quest_data_dict:
+                raise QuestNotFoundError(
+                    f"Quest '{quest_id}' has invalid prerequisite '{prereq}'."
+                )
+            self.parent[quest_id] = prereq
+            if prereq is not None:
+                self.children[prereq].append(quest_id)
+
+        self.depth = {}
+        for quest_id in quest_data_dict:
+            self._place(quest_id)
+
+        # Sorting by depth keeps catalog order within a depth
+        self.order = sorted(quest_data_dict, key=self.depth.__getitem__)
+        self._chains = {}
+        self._ancestors = {}
+
+    def _place(self, quest_id):
+        """Give quest_id and its unplaced prerequisites their depths"""
+        path = []
+        on_path = set()
+        current = quest_id
+        while current is not None and current not in self.depth:
+            if current in on_path:
+                cycle = path[path.index(current):] + [current]
+                raise QuestDependencyCycleError(
+                    "Quest prerequisites form a cycle: " + " -> ".join(reversed(cycle))
+                )
+            path.append(current)
+            on_path.add(current)
+            current = self.parent[current]
+
+        depth = -1 if current is None else self.depth[current]
+        for placed in reversed(path):
+            depth += 1
+            self.depth[placed] = depth
+
+    def _check(self, quest_id):
+        """Raise QuestNotFoundError for a quest outside the catalog"""
+        if quest_id not in self.parent:
+            raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
+
+    def prerequisite_chain(self, quest_id):
+        """
+        Prerequisite chain of a quest, earliest first
+
+        Returns: Tuple (earliest_prereq, ..., quest_id)
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        chain = self._chains.get(quest_id)
+        if chain is not None:
+            return chain
+        self._check(quest_id)
+
+        # Walk up to the nearest quest with a cached chain, then extend it
+        # back down, caching each step
+        path = []
+        current = quest_id
+        while current is not None and current not in self._chains:
+            path.append(current)
+            current = self.parent[current]
+        chain = () if current is None else self._chains[current]
+        for step in reversed(path):
+            chain = chain + (step,)
+            self._chains[step] = chain
+        return chain
+
+    def ancestors(self, quest_id):
+        """
+        Every quest that has to be completed before quest_id
+
+        Returns: frozenset of quest ids
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        ancestors = self._ancestors.get(quest_id)
+        if ancestors is None:
+            ancestors = frozenset(self.prerequisite_chain(quest_id)[:-1])
+            self._ancestors[quest_id] = ancestors
+        return ancestors
+
+    def get_depth(self, quest_id):
+        """
+        Number of quests above quest_id (0 = no prerequisite)
+
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        self._check(quest_id)
+        return self.depth[quest_id]
+
+    def dependents(self, quest_id):
+        """
+        Quests whose prerequisite is quest_id
+
+        Returns: List of quest ids (catalog order)
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        self._check(quest_id)
+        return self.children[quest_id]
+
+    def topological_order(self):
+        """
+        Every quest id, each after its prerequisite
+
+        Returns: List of quest ids (shallowest first)
+        """
+        return list(self.order)
+
+
+def get_quest_graph(quest_data_dict):
+    """
+    Get the graph of a quest catalog, building it on first use
+
+    The last graph is reused while it was built from this same
+    dictionary and the number of quests hasn't changed. Editing a
+    quest's prerequisite or required level in place isn't noticed -
+    call invalidate_quest_graph() after doing that.
+
+    Returns: QuestGraph
+    Raises: QuestNotFoundError, QuestDependencyCycleError (see QuestGraph)
+    """
+    global _quest_graph
+
+    graph = _quest_graph
+    if graph is None or graph.quests is not quest_data_dict or graph.size != len(quest_data_dict):
+        graph = QuestGraph(quest_data_dict)
+        _quest_graph = graph
+    return graph
+
+
+def invalidate_quest_graph():
+    """
+    Forget the cached graph, so the next get_quest_graph builds a new one
+    (frontiers built on the old graph rebuild themselves when next used)
+    """
+    global _quest_graph
+    _quest_graph = None
+
+
+def walk_prerequisite_chain(quest_id, quest_data_dict):
+    """
+    Follow one quest's prerequisite links without building a graph
+
+    Only this chain is checked, so a broken quest elsewhere in the
+    catalog doesn't affect it.
+
+    Returns: List of quest ids [earliest_prereq, ..., quest_id]
+    Raises: QuestNotFoundError if a quest in the chain doesn't exist
+            QuestDependencyCycleError if the chain loops
+    """
+    chain = []
+    seen = set()
+    current = quest_id
+    while current is not None:
+        if current in seen:
+            cycle = chain[chain.index(current):] + [current]
+            raise QuestDependencyCycleError(
+                "Quest prerequisites form a cycle: " + " -> ".join(reversed(cycle))
+            )
+        quest = quest_data_dict.get(current)
+        if quest is None:
+            raise QuestNotFoundError(f"Quest '{current}' not found.")
+        seen.add(current)
+        chain.append(current)
+        current = get_prerequisite(quest)
+
+    chain.reverse()
+    return chain
+
+
+# ============================================================================
+# AVAILABLE-QUEST FRONTIER
+# ============================================================================
+
+class QuestFrontier:
+    """
+    Quests one character can accept right now, updated incrementally
+
+    Quests whose prerequisite is done are either available or waiting
+    (in a min-heap by required level) for the character to level up.
+    Direct edits to active_quests / completed_quests that change their
+    length are noticed and the frontier is rebuilt.
+    """
+
+    def __init__(self, character, quest_data_dict):
+        """
+        Build the frontier for a character's current progress
+
+        Raises: QuestNotFoundError, QuestDependencyCycleError (see QuestGraph)
+        """
+        self.graph = get_quest_graph(quest_data_dict)
+        self.rebuild(character)
+
+    def rebuild(self, character):
+        """Work the frontier out from scratch (O(quests))"""
+        self.active = set(character.get("active_quests", []))
+        self.completed = set(character.get("completed_quests", []))
+        self.lengths = quest_list_lengths(character)
+        self.level = character.get("level", 1)
+        self.available = {}     # quest ids, used as an ordered set
+        self.waiting = []       # heap of (required_level, position, quest_id)
+
+        parent = self.graph.parent
+        for quest_id in self.graph.quests:
+            prereq = parent[quest_id]
+            if prereq is None or prereq in self.completed:
+                self._unlock(quest_id)
+
+    def _unlock(self, quest_id):
+        """Add a quest whose prerequisite is done"""
+        if quest_id in self.active or quest_id in self.completed:
+            return
+        required_level = self.graph.quests[quest_id].get("required_level", 1)
+        if required_level <= self.level:
+            self.available[quest_id] = None
+        else:
+            heappush(self.waiting, (required_level, self.graph.position[quest_id], quest_id))
+
+    def _in_step(self, character, active_change, completed_change):
+        """
+        True if the character's lists changed by exactly this one step
+        (otherwise the frontier is rebuilt and the step is already in it)
+        """
+        lengths = quest_list_lengths(character)
+        expected = (self.lengths[0] + active_change, self.lengths[1] + completed_change)
+        if lengths != expected:
+            self.rebuild(character)
+            return False
+        self.lengths = lengths
+        return True
+
+    def accepted(self, character, quest_id):
+        """Update after quest_id was added to active_quests"""
+        if self._in_step(character, 1, 0):
+            self.active.add(quest_id)
+            self.available.pop(quest_id, None)
+
+    def completed_quest(self, character, quest_id):
+        """Update after quest_id moved from active to completed"""
+        if self._in_step(character, -1, 1):
+            self.active.discard(quest_id)
+            self.completed.add(quest_id)
+            for dependent in self.graph.children[quest_id]:
+                self._unlock(dependent)
+
+    def abandoned(self, character, quest_id):
+        """Update after quest_id was removed from active_quests"""
+        if self._in_step(character, -1, 0):
+            self.active.discard(quest_id)
+            self._unlock(quest_id)
+
+    def sync(self, character):
+        """Catch up with level-ups (and direct list edits)"""
+        level = character.get("level", 1)
+        if quest_list_lengths(character) != self.lengths or level < self.level:
+            self.rebuild(character)
+            return
+        if level > self.level:
+            self.level = level
+            waiting = self.waiting
+            while waiting and waiting[0][0] <= level:
+                self.available[heappop(waiting)[2]] = None
+
+    def available_ids(self, character):
+        """
+        Quest ids the character can accept, in catalog order
+
+        Returns: List of quest ids (O(k log k) for k results)
+        """
+        self.sync(character)
+        return sorted(self.available, key=self.graph.position.__getitem__)
+
+
+def quest_list_lengths(character):
+    """Lengths of a character's (active_quests, completed_quests)"""
+    return (len(character.get("active_quests", ())),
+            len(character.get("completed_quests", ())))
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== QUEST GRAPH TEST ===")
+
+    # from game_data import load_quests
+    # graph = get_quest_graph(load_quests())
+    # print(graph.topological_order())
+    # print(graph.prerequisite_chain("dragon_slayer"))
+    # hero = {"level": 1, "active_quests": [], "completed_quests": []}
+    # frontier = QuestFrontier(hero, graph.quests)
+    # print(frontier.available_ids(hero))
@@ -12,6 +12,7 @@ This module handles quest management, dependencies, and completion.
 
 from custom_exceptions import (
     QuestNotFoundError,
+    QuestDependencyCycleError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
@@ -19,12 +20,28 @@ from custom_exceptions import (
 )
 
 from character_manager import gain_experience, add_gold
+from quest_graph import get_quest_graph, walk_prerequisite_chain, QuestFrontier
+from quest_set import as_quest_set
+
+# Character key holding an attached QuestFrontier (never saved)
+FRONTIER_KEY = "quest_frontier"
 
 
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
 
+def use_quest_sets(character):
+    """
+    Make sure a character's active_quests / completed_quests are QuestSets
+    
+    Missing lists start empty; plain lists (older code, hand-built
+    dictionaries) are swapped for QuestSets with the same order, once.
+    """
+    character["active_quests"] = as_quest_set(character.get("active_quests"))
+    character["completed_quests"] = as_quest_set(character.get("completed_quests"))
+
+
 def accept_quest(character, quest_id, quest_data_dict):
     """
     Accept a new quest
@@ -51,8 +68,7 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
 
     quest = quest_data_dict[quest_id]
-    character.setdefault("active_quests", [])
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
 
     # Level requirement
     required_level = quest.get("required_level", 1)
@@ -79,6 +95,9 @@ def accept_quest(character, quest_id, quest_data_dict):
             )
 
     character["active_quests"].append(quest_id)
+    frontier = character.get(FRONTIER_KEY)
+    if frontier is not None:
+        frontier.accepted(character, quest_id)
     return True
 
 
@@ -103,18 +122,20 @@ def complete_quest(character, quest_id, quest_data_dict):
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
 
-    character.setdefault("active_quests", [])
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
 
     if quest_id not in character["active_quests"]:
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active.")
 
     quest = quest_data_dict[quest_id]
 
-    # Remove from active, add to completed
+    # Remove from active, add to completed (both O(1) on QuestSets)
     character["active_quests"].remove(quest_id)
     if quest_id not in character["completed_quests"]:
         character["completed_quests"].append(quest_id)
+    frontier = character.get(FRONTIER_KEY)
+    if frontier is not None:
+        frontier.completed_quest(character, quest_id)
 
     # Rewards
     reward_xp = int(quest.get("reward_xp", 0))
@@ -138,12 +159,15 @@ def abandon_quest(character, quest_id):
     Returns: True if abandoned
     Raises: QuestNotActiveError if quest not active
     """
-    character.setdefault("active_quests", [])
+    use_quest_sets(character)
 
     if quest_id not in character["active_quests"]:
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active.")
 
     character["active_quests"].remove(quest_id)
+    frontier = character.get(FRONTIER_KEY)
+    if frontier is not None:
+        frontier.abandoned(character, quest_id)
     return True
 
 def get_active_quests(character, quest_data_dict):
@@ -152,7 +176,7 @@ def get_active_quests(character, quest_data_dict):
     
     Returns: List of quest dictionaries for active quests
     """
-    character.setdefault("active_quests", [])
+    use_quest_sets(character)
     result = []
 
     for qid in character["active_quests"]:
@@ -167,7 +191,7 @@ def get_completed_quests(character, quest_data_dict):
     
     Returns: List of quest dictionaries for completed quests
     """
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
     result = []
 
     for qid in character["completed_quests"]:
@@ -182,8 +206,17 @@ def get_available_quests(character, quest_data_dict):
     
     Available = meets level req + prerequisite done + not completed + not active
     
+    With a frontier attached (attach_quest_frontier) this only touches
+    the quests it returns; otherwise every quest is checked.
+    
     Returns: List of quest dictionaries
     """
+    frontier = character.get(FRONTIER_KEY)
+    if frontier is not None:
+        if frontier.graph is not get_quest_graph(quest_data_dict):
+            frontier = attach_quest_frontier(character, quest_data_dict)
+        return [quest_data_dict[qid] for qid in frontier.available_ids(character)]
+
     available = []
 
     for qid in quest_data_dict:
@@ -192,6 +225,24 @@ def get_available_quests(character, quest_data_dict):
 
     return available
 
+
+def attach_quest_frontier(character, quest_data_dict):
+    """
+    Keep an incremental available-quest frontier on a character
+    
+    accept_quest, complete_quest and abandon_quest update it in place,
+    and get_available_quests reads from it. It is stored under
+    character["quest_frontier"], which is not part of the save format.
+    
+    Returns: The QuestFrontier
+    Raises: QuestNotFoundError, QuestDependencyCycleError if the
+            catalog's prerequisites are broken
+    """
+    use_quest_sets(character)
+    frontier = QuestFrontier(character, quest_data_dict)
+    character[FRONTIER_KEY] = frontier
+    return frontier
+
 # ============================================================================
 # QUEST TRACKING
 # ============================================================================
@@ -202,7 +253,7 @@ def is_quest_completed(character, quest_id):
     
     Returns: True if completed, False otherwise
     """
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
     return quest_id in character["completed_quests"]
 
 
@@ -212,7 +263,7 @@ def is_quest_active(character, quest_id):
     
     Returns: True if active, False otherwise
     """
-    character.setdefault("active_quests", [])
+    use_quest_sets(character)
     return quest_id in character["active_quests"]
 
 def can_accept_quest(character, quest_id, quest_data_dict):
@@ -226,8 +277,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
         return False
 
     quest = quest_data_dict[quest_id]
-    character.setdefault("active_quests", [])
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
 
     # Level requirement
     required_level = quest.get("required_level", 1)
@@ -257,27 +307,22 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
-    Raises: QuestNotFoundError if quest doesn't exist
+    The chain comes from the catalog's QuestGraph (built once, cached
+    per quest). If the graph can't be built because some other quest is
+    broken, just this quest's links are followed instead.
+
+    Raises: QuestNotFoundError if quest (or a prerequisite in its chain)
+            doesn't exist
+            QuestDependencyCycleError if its chain of prerequisites loops
     """
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
 
-    chain = []
-    current_id = quest_id
-
-    while True:
-        if current_id not in quest_data_dict:
-            raise QuestNotFoundError(f"Quest '{current_id}' not found.")
-        chain.append(current_id)
-        quest = quest_data_dict[current_id]
-        prereq = quest.get("prerequisite", "NONE")
-        if not prereq or prereq == "NONE":
-            break
-        current_id = prereq
-
-    # We built from final → earliest; reverse to get earliest first
-    chain.reverse()
-    return chain
+    try:
+        graph = get_quest_graph(quest_data_dict)
+    except (QuestNotFoundError, QuestDependencyCycleError):
+        return walk_prerequisite_chain(quest_id, quest_data_dict)
+    return list(graph.prerequisite_chain(quest_id))
 
 
 # ============================================================================
@@ -294,7 +339,7 @@ def get_quest_completion_percentage(character, quest_data_dict):
     if total_quests == 0:
         return 0.0
 
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
     completed = sum(1 for qid in character["completed_quests"]
                     if qid in quest_data_dict)
 
@@ -306,7 +351,7 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
     
     Returns: Dictionary with 'total_xp' and 'total_gold'
     """
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
     total_xp = 0
     total_gold = 0
 
@@ -379,8 +424,7 @@ def display_character_quest_progress(character, quest_data_dict):
     - Completion percentage
     - Total rewards earned
     """
-    character.setdefault("active_quests", [])
-    character.setdefault("completed_quests", [])
+    use_quest_sets(character)
 
     active_count = len(character["active_quests"])
     completed_count = len(character["completed_quests"])
@@ -402,18 +446,14 @@ def validate_quest_prerequisites(quest_data_dict):
     """
     Validate that all quest prerequisites exist
     
-    Checks that every prerequisite (that's not "NONE") refers to a real quest
+    Checks that every prerequisite (that's not "NONE") refers to a real
+    quest, and that no prerequisites loop back on themselves
     
     Returns: True if all valid
     Raises: QuestNotFoundError if invalid prerequisite found
+            QuestDependencyCycleError if prerequisites form a cycle
     """
-    for quest_id, quest in quest_data_dict.items():
-        prereq = quest.get("prerequisite", "NONE")
-        if prereq and prereq != "NONE":
-            if prereq not in quest_data_dict:
-                raise QuestNotFoundError(
-                    f"Quest '{quest_id}' has invalid prerequisite '{prereq}'."
-                )
+    get_quest_graph(quest_data_dict)
     return True
 
 
@@ -0,0 +1,125 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Set Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module holds QuestSet, the ordered set behind a character's
+active_quests and completed_quests. It is backed by a dict (which keeps
+insertion order), so membership checks, append and remove are O(1)
+while display and saving still see quests in the order they were added.
+
+It keeps the list methods the rest of the game uses (append, remove,
+in, len, iteration, indexing), so code written for plain lists keeps
+working. Saves are unchanged: a QuestSet is written as the same
+comma-separated quest ids as the list was.
+"""
+
+# ============================================================================
+# QUEST SET
+# ============================================================================
+
+class QuestSet:
+    """
+    Insertion-ordered set of quest ids with list-style methods
+    """
+
+    __slots__ = ("_quests",)
+    __hash__ = None
+
+    def __init__(self, quest_ids=()):
+        """Start with quest_ids (duplicates are kept once, first position)"""
+        self._quests = dict.fromkeys(quest_ids)
+
+    def __contains__(self, quest_id):
+        """O(1) membership"""
+        return quest_id in self._quests
+
+    def __len__(self):
+        """Number of quests"""
+        return len(self._quests)
+
+    def __iter__(self):
+        """Quest ids in the order they were added"""
+        return iter(self._quests)
+
+    def __getitem__(self, index):
+        """
+        Quest id (or list of ids for a slice) by position
+
+        O(n) - kept for list-style callers such as random.choice
+        """
+        return list(self._quests)[index]
+
+    def __eq__(self, other):
+        """Equal to a QuestSet, list or tuple with the same ids in order"""
+        if isinstance(other, (QuestSet, list, tuple)):
+            return list(self._quests) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        """Debug display"""
+        return f"QuestSet({list(self._quests)!r})"
+
+    def append(self, quest_id):
+        """Add quest_id at the end (no-op if it's already in the set)"""
+        self._quests[quest_id] = None
+
+    add = append
+
+    def extend(self, quest_ids):
+        """Append every id in quest_ids"""
+        for quest_id in quest_ids:
+            self._quests[quest_id] = None
+
+    def remove(self, quest_id):
+        """
+        Remove quest_id in O(1)
+
+        Raises: ValueError if quest_id isn't in the set (like list.remove)
+        """
+        try:
+            del self._quests[quest_id]
+        except KeyError:
+            raise ValueError(f"{quest_id!r} is not in the quest set") from None
+
+    def discard(self, quest_id):
+        """Remove quest_id if present"""
+        self._quests.pop(quest_id, None)
+
+    def clear(self):
+        """Remove every quest"""
+        self._quests.clear()
+
+    def copy(self):
+        """Independent copy with the same order"""
+        return QuestSet(self._quests)
+
+    def to_save_string(self):
+        """Comma-separated ids, as written to save files"""
+        return ",".join(self._quests)
+
+
+def as_quest_set(quest_ids):
+    """
+    QuestSet for a list (or None) of quest ids; a QuestSet is returned as is
+    """
+    if isinstance(quest_ids, QuestSet):
+        return quest_ids
+    return QuestSet(quest_ids or ())
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== QUEST SET TEST ===")
+
+    # done = QuestSet(["first_steps", "goblin_hunter"])
+    # done.append("orc_menace")
+    # done.remove("goblin_hunter")
+    # print("orc_menace" in done, done.to_save_string())
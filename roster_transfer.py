@@ -0,0 +1,306 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Roster Transfer Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module moves whole rosters of characters between environments.
+A save directory is exported to JSON Lines (one character per line,
+optionally gzip-compressed) and imported back. Everything is streamed
+through generators so memory use stays flat no matter how many saves
+there are.
+"""
+
+import gzip
+import json
+import os
+from itertools import islice
+from multiprocessing import Pool
+
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+from character_manager import (
+    SAVE_FIELDS,
+    load_character,
+    save_character,
+    validate_character_data,
+    iter_saved_characters
+)
+from quest_set import QuestSet
+
+# How many records each worker process takes at a time
+DEFAULT_CHUNK_SIZE = 256
+
+# Call the progress callback after this many records
+PROGRESS_EVERY = 1000
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def open_roster_file(path, mode):
+    """
+    Open a JSONL roster file for text reading ("r") or writing ("w").
+
+    Paths ending in .gz are gzip-compressed.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def character_to_record(character):
+    """
+    Build the exported record for a character (save fields only)
+    """
+    record = {}
+    for key in SAVE_FIELDS:
+        value = character[key]
+        if key in ("inventory", "active_quests", "completed_quests"):
+            # QuestSets are exported as plain JSON lists
+            value = list(value)
+        record[key] = value
+    return record
+
+
+def matches_filters(character, min_level=None, character_class=None):
+    """
+    Check a character against the optional roster filters
+
+    Returns: True if character should be included
+    """
+    if min_level is not None and character["level"] < min_level:
+        return False
+    if character_class is not None and character["class"] != character_class:
+        return False
+    return True
+
+
+def _new_counters():
+    """Fresh progress counters"""
+    return {"read": 0, "transferred": 0, "skipped": 0, "failed": 0}
+
+
+def _count_result(counters, status, progress):
+    """Update counters for one record and report progress if due"""
+    counters["read"] += 1
+    counters[status] += 1
+    if progress is not None and counters["read"] % PROGRESS_EVERY == 0:
+        progress(dict(counters))
+
+
+def _map_tasks(function, tasks, workers, chunk_size):
+    """
+    Yield function(task) for every task, on a process pool if workers > 1
+
+    Results come back in task order so exports are deterministic.
+    Pool.imap would read the whole task generator up front, so tasks are
+    handed to the pool chunk_size * workers at a time - memory stays
+    bounded by that window, not by the size of the roster.
+    """
+    if workers is None or workers <= 1:
+        for task in tasks:
+            yield function(task)
+        return
+
+    tasks = iter(tasks)
+    window = chunk_size * workers
+    with Pool(processes=workers) as pool:
+        while True:
+            batch = list(islice(tasks, window))
+            if not batch:
+                break
+            for result in pool.imap(function, batch, chunk_size):
+                yield result
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def _export_task(task):
+    """
+    Pool helper - load one save and turn it into a JSON line
+
+    Returns: (status, line) where status is transferred/skipped/failed
+    """
+    name, save_directory, min_level, character_class = task
+    try:
+        character = load_character(name, save_directory)
+    except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+        return ("failed", None)
+
+    if not matches_filters(character, min_level, character_class):
+        return ("skipped", None)
+
+    return ("transferred", json.dumps(character_to_record(character)))
+
+
+def iter_export_lines(save_directory="data/save_games", min_level=None,
+                      character_class=None, workers=1,
+                      chunk_size=DEFAULT_CHUNK_SIZE, counters=None, progress=None):
+    """
+    Yield one JSON line per exported character.
+
+    Args:
+        save_directory: Directory containing save files
+        min_level: Only export characters at this level or higher
+        character_class: Only export characters of this class
+        workers: Worker processes used to load saves (1 = no pool)
+        counters: Optional dict updated with read/transferred/skipped/failed
+        progress: Optional callable given a copy of the counters
+                  every PROGRESS_EVERY records
+    """
+    if counters is None:
+        counters = _new_counters()
+
+    tasks = ((name, save_directory, min_level, character_class)
+             for name in iter_saved_characters(save_directory))
+
+    for status, line in _map_tasks(_export_task, tasks, workers, chunk_size):
+        _count_result(counters, status, progress)
+        if line is not None:
+            yield line
+
+
+def export_roster(output_path, save_directory="data/save_games", min_level=None,
+                  character_class=None, workers=1, progress=None):
+    """
+    Export a whole save directory to a JSONL file (gzip if path ends in .gz)
+
+    Returns: Dictionary of counters (read, transferred, skipped, failed)
+    """
+    counters = _new_counters()
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open_roster_file(output_path, "w") as f:
+        for line in iter_export_lines(save_directory, min_level, character_class,
+                                      workers, counters=counters, progress=progress):
+            f.write(line)
+            f.write("\n")
+
+    return counters
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def check_roster_name(name):
+    """
+    Make sure an imported name is safe to use in a save file path
+
+    Raises: InvalidSaveDataError if the name is not a non-empty string or
+            contains a path separator, '..' or a control character (a
+            newline would also break the line-based save format)
+    """
+    if not isinstance(name, str) or not name.strip():
+        raise InvalidSaveDataError("Roster character has no name")
+    if not name.isprintable():
+        raise InvalidSaveDataError(f"Roster character name has control characters: {name!r}")
+    separators = {os.sep, "/", os.altsep} - {None}
+    if ".." in name or any(sep in name for sep in separators):
+        raise InvalidSaveDataError(f"Roster character name is not a plain name: {name!r}")
+
+
+def parse_roster_line(line):
+    """
+    Turn one JSONL line back into a validated character dictionary
+
+    Raises: InvalidSaveDataError if the line is not a valid character
+    """
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise InvalidSaveDataError("Roster line is not valid JSON") from e
+
+    if not isinstance(record, dict):
+        raise InvalidSaveDataError("Roster line is not a character record")
+
+    validate_character_data(record)
+    check_roster_name(record["name"])
+    record["active_quests"] = QuestSet(record["active_quests"])
+    record["completed_quests"] = QuestSet(record["completed_quests"])
+    return record
+
+
+def iter_roster_characters(input_path, min_level=None, character_class=None):
+    """
+    Yield characters from a JSONL roster file one at a time
+
+    Invalid lines and filtered-out characters are skipped.
+    """
+    with open_roster_file(input_path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                character = parse_roster_line(line)
+            except InvalidSaveDataError:
+                continue
+            if matches_filters(character, min_level, character_class):
+                yield character
+
+
+def _import_task(task):
+    """
+    Pool helper - parse one JSON line and save it
+
+    Returns: status string (transferred/skipped/failed)
+    """
+    line, save_directory, min_level, character_class = task
+    try:
+        character = parse_roster_line(line)
+    except InvalidSaveDataError:
+        return "failed"
+
+    if not matches_filters(character, min_level, character_class):
+        return "skipped"
+
+    try:
+        save_character(character, save_directory)
+    except (OSError, ValueError):
+        return "failed"
+    return "transferred"
+
+
+def import_roster(input_path, save_directory="data/save_games", min_level=None,
+                  character_class=None, workers=1, progress=None):
+    """
+    Import characters from a JSONL roster file into a save directory
+
+    Existing saves with the same name are overwritten.
+
+    Returns: Dictionary of counters (read, transferred, skipped, failed)
+    """
+    counters = _new_counters()
+    os.makedirs(save_directory, exist_ok=True)
+
+    with open_roster_file(input_path, "r") as f:
+        tasks = ((line, save_directory, min_level, character_class)
+                 for line in f if line.strip())
+        for status in _map_tasks(_import_task, tasks, workers, DEFAULT_CHUNK_SIZE):
+            _count_result(counters, status, progress)
+
+    return counters
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== ROSTER TRANSFER TEST ===")
+
+    # counts = export_roster("data/roster.jsonl.gz", min_level=5)
+    # print(f"Exported: {counts}")
+    # counts = import_roster("data/roster.jsonl.gz", "data/imported_saves")
+    # print(f"Imported: {counts}")
@@ -0,0 +1,487 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Archive Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module is a packed save backend for character_manager.
+Every save lives in one append-only pack file instead of one small
+file per character. An offset index maps each name to its newest record
+and reads go through mmap, so loading a character only touches its slice.
+
+Record layout (little endian):
+    4 bytes  tag       b"SAVE" or b"DELE" (delete tombstone)
+    2 bytes  name length
+    4 bytes  payload length
+    name bytes (utf-8), then payload bytes (save text, utf-8)
+
+A sidecar "<pack>.idx" file caches the index so big archives open
+without rescanning every record.
+
+Appends (and compaction) hold an fcntl lock on the pack file, so
+several processes can share one archive: each append goes at the real
+end of the file, and every read first picks up records other processes
+added.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl - fall back to in-process locks only
+    fcntl = None
+
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+from character_manager import (
+    format_character_save,
+    parse_character_save,
+    iter_saved_characters,
+    load_character as load_character_file
+)
+
+DEFAULT_ARCHIVE_PATH = "data/save_games.pack"
+
+RECORD_HEADER = struct.Struct("<4sHI")
+MAX_NAME_BYTES = 0xFFFF     # name length is an unsigned short in the header
+TAG_SAVE = b"SAVE"
+TAG_DELETE = b"DELE"
+
+# Sidecar index format (bump when the .idx layout changes)
+INDEX_VERSION = 2
+
+# Open archives, keyed by absolute pack path
+_open_archives = {}
+
+# ============================================================================
+# ARCHIVE CLASS
+# ============================================================================
+
+class SaveArchive:
+    """
+    One open pack file plus its in-memory offset index
+
+    index maps character name -> (payload_offset, payload_length)
+    """
+
+    def __init__(self, archive_path=DEFAULT_ARCHIVE_PATH):
+        """Open (or create) the pack file and build its index"""
+        self.archive_path = archive_path
+        self.index_path = archive_path + ".idx"
+        self.index = {}
+        self.live_bytes = 0
+        self.end_offset = 0
+        self._map = None
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+
+        archive_dir = os.path.dirname(archive_path)
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+        self._open()
+
+    def _open(self):
+        """Open the pack file and build the index from scratch"""
+        self._file = open(self.archive_path, "a+b")
+        if self._lock_depth and fcntl is not None:
+            # Reopened while locked - lock the new file too
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        self.index = {}
+        self.live_bytes = 0
+        self.end_offset = 0
+        self._load_index_file()
+        self.refresh()
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the archive for writing: an in-process lock for threads plus
+        an fcntl lock on the pack file for other processes (re-entrant)
+        """
+        with self._lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None and self._file is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self):
+        """
+        Catch up with other processes: reopen the pack if it was replaced
+        (compacted) and index any records appended since the last scan
+        """
+        while True:
+            try:
+                on_disk = os.stat(self.archive_path)
+            except FileNotFoundError:
+                return
+            if on_disk.st_ino == os.fstat(self._file.fileno()).st_ino:
+                break
+            self.close(write_index=False)
+            self._open()
+        if on_disk.st_size != self.end_offset:
+            self.refresh()
+
+    # ------------------------------------------------------------------
+    # Index building
+    # ------------------------------------------------------------------
+
+    def _load_index_file(self):
+        """Load the sidecar index if it matches the pack file"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except (OSError, UnicodeDecodeError):
+            return
+
+        try:
+            if lines[0] != f"INDEX_VERSION:{INDEX_VERSION}":
+                return
+            header = dict(line.split(":", 1) for line in lines[1:3])
+            pack_inode = int(header["PACK_INODE"])
+            pack_size = int(header["PACK_SIZE"])
+            index = {}
+            for line in lines[3:]:
+                if not line:
+                    continue
+                # Names are JSON strings, so tabs and newlines are escaped
+                name, offset, length = line.rsplit("\t", 2)
+                name = json.loads(name)
+                if not isinstance(name, str):
+                    return
+                index[name] = (int(offset), int(length))
+        except (ValueError, KeyError):
+            # Bad sidecar - just rescan the pack instead
+            return
+
+        # Written for a different (e.g. since compacted) pack file
+        pack = os.fstat(self._file.fileno())
+        if pack_inode != pack.st_ino or pack_size > pack.st_size:
+            return
+
+        self.index = index
+        self.end_offset = pack_size
+        self.live_bytes = sum(length for _, length in index.values())
+
+    def _write_index_file(self):
+        """Save the index so the next open can skip the scan"""
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(f"INDEX_VERSION:{INDEX_VERSION}\n")
+            f.write(f"PACK_INODE:{os.fstat(self._file.fileno()).st_ino}\n")
+            f.write(f"PACK_SIZE:{self.end_offset}\n")
+            for name, (offset, length) in self.index.items():
+                f.write(f"{json.dumps(name)}\t{offset}\t{length}\n")
+        os.replace(temp_path, self.index_path)
+
+    def _remap(self):
+        """Map the pack file again after it grew"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.flush()
+        if os.path.getsize(self.archive_path) > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def refresh(self):
+        """
+        Index any records appended since the last scan
+
+        A torn record at the end (e.g. after a crash mid-write) is cut off
+        so later appends stay reachable - the pack is locked meanwhile so
+        a record another process is still writing is never mistaken for one.
+        """
+        with self._locked():
+            self._scan()
+
+    def _scan(self):
+        """refresh() body - call with the archive locked"""
+        self._remap()
+        size = len(self._map) if self._map is not None else 0
+        offset = self.end_offset
+
+        while offset + RECORD_HEADER.size <= size:
+            tag, name_len, payload_len = RECORD_HEADER.unpack_from(self._map, offset)
+            name_start = offset + RECORD_HEADER.size
+            payload_start = name_start + name_len
+            record_end = payload_start + payload_len
+            if tag not in (TAG_SAVE, TAG_DELETE) or record_end > size:
+                break
+
+            try:
+                name = self._map[name_start:payload_start].decode("utf-8")
+            except UnicodeDecodeError:
+                break
+
+            old = self.index.pop(name, None)
+            if old is not None:
+                self.live_bytes -= old[1]
+            if tag == TAG_SAVE:
+                self.index[name] = (payload_start, payload_len)
+                self.live_bytes += payload_len
+            offset = record_end
+
+        if offset < size:
+            # Drop the torn tail
+            self._file.truncate(offset)
+            self._remap()
+
+        self.end_offset = offset
+
+    # ------------------------------------------------------------------
+    # Record access
+    # ------------------------------------------------------------------
+
+    def _append(self, tag, name, payload):
+        """
+        Append one record and return where its payload starts
+
+        Call with the archive locked, after _sync(), so the record lands
+        at the real end of the file.
+
+        Raises: InvalidSaveDataError if the name is too long for a record
+        """
+        name_bytes = name.encode("utf-8")
+        if len(name_bytes) > MAX_NAME_BYTES:
+            raise InvalidSaveDataError(
+                f"Character name is too long for the archive ({len(name_bytes)} bytes)"
+            )
+        record = RECORD_HEADER.pack(tag, len(name_bytes), len(payload)) + name_bytes + payload
+        self._file.seek(0, os.SEEK_END)
+        record_start = self._file.tell()
+        self._file.write(record)
+        self._file.flush()
+        self.end_offset = record_start + len(record)
+        return record_start + RECORD_HEADER.size + len(name_bytes)
+
+    def save(self, character):
+        """Append a new record for the character"""
+        payload = format_character_save(character).encode("utf-8")
+        name = character["name"]
+        with self._locked():
+            self._sync()
+            payload_start = self._append(TAG_SAVE, name, payload)
+
+            old = self.index.get(name)
+            if old is not None:
+                self.live_bytes -= old[1]
+            self.index[name] = (payload_start, len(payload))
+            self.live_bytes += len(payload)
+        return True
+
+    def names(self):
+        """Return the names of every character with a live record"""
+        with self._lock:
+            # Another process may have saved, deleted or compacted since
+            self._sync()
+            return list(self.index)
+
+    def read(self, name):
+        """Return the raw save text for a character"""
+        with self._lock:
+            # Another process may have saved, deleted or compacted since
+            self._sync()
+            if name not in self.index:
+                raise CharacterNotFoundError(f"Save not found in archive for: {name}")
+
+            offset, length = self.index[name]
+            if self._map is None or offset + length > len(self._map):
+                self._remap()
+
+            try:
+                return self._map[offset:offset + length].decode("utf-8")
+            except (TypeError, ValueError) as e:
+                raise SaveFileCorruptedError(f"Could not read archived save for: {name}") from e
+
+    def delete(self, name):
+        """Append a tombstone so the character disappears"""
+        with self._locked():
+            self._sync()
+            if name not in self.index:
+                raise CharacterNotFoundError(f"Save not found in archive for: {name}")
+
+            self._append(TAG_DELETE, name, b"")
+            offset, length = self.index.pop(name)
+            self.live_bytes -= length
+        return True
+
+    def compact(self):
+        """
+        Rewrite the pack with only the newest record for each character
+
+        Returns: Number of bytes reclaimed
+        """
+        with self._locked():
+            self._sync()
+            self._remap()
+            old_size = self.end_offset
+            temp_path = self.archive_path + ".compact"
+            new_index = {}
+            offset = 0
+
+            with open(temp_path, "wb") as out:
+                for name, (payload_start, length) in self.index.items():
+                    name_bytes = name.encode("utf-8")
+                    out.write(RECORD_HEADER.pack(TAG_SAVE, len(name_bytes), length))
+                    out.write(name_bytes)
+                    out.write(self._map[payload_start:payload_start + length])
+                    new_start = offset + RECORD_HEADER.size + len(name_bytes)
+                    new_index[name] = (new_start, length)
+                    offset = new_start + length
+                out.flush()
+                os.fsync(out.fileno())
+
+            # Swap files while still holding the lock on the old one, so
+            # no other process can append to it after the copy
+            os.replace(temp_path, self.archive_path)
+            self.close(write_index=False)
+            self._open()
+            self._write_index_file()
+        return old_size - offset
+
+    def close(self, write_index=True):
+        """Flush the index and release the mapping and file handle"""
+        if self._file is None:
+            return
+        if write_index:
+            self._write_index_file()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        self._file = None
+
+
+def get_archive(archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Get the open SaveArchive for a pack path, opening it on first use
+    """
+    key = os.path.abspath(archive_path)
+    archive = _open_archives.get(key)
+    if archive is None:
+        archive = SaveArchive(archive_path)
+        _open_archives[key] = archive
+    return archive
+
+
+def close_archive(archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Close an open archive and write its index file
+
+    Returns: True if an archive was open
+    """
+    archive = _open_archives.pop(os.path.abspath(archive_path), None)
+    if archive is None:
+        return False
+    archive.close()
+    return True
+
+# ============================================================================
+# CHARACTER_MANAGER-STYLE API
+# ============================================================================
+
+def save_character(character, archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Save character into the pack file.
+
+    Returns: True if successful
+    Raises: InvalidSaveDataError if the name is too long to store
+            PermissionError, IOError (let them propagate)
+    """
+    return get_archive(archive_path).save(character)
+
+
+def load_character(character_name, archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Load character from the pack file.
+
+    Raises:
+        CharacterNotFoundError if character has no live record
+        SaveFileCorruptedError if the record can't be read
+        InvalidSaveDataError if data format is wrong
+    """
+    text = get_archive(archive_path).read(character_name)
+    return parse_character_save(text.split("\n"))
+
+
+def delete_character(character_name, archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Delete a character from the pack file.
+
+    Returns: True if deleted successfully
+    Raises: CharacterNotFoundError if character doesn't exist
+    """
+    return get_archive(archive_path).delete(character_name)
+
+
+def list_saved_characters(archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Get list of all character names stored in the pack file.
+    """
+    return get_archive(archive_path).names()
+
+
+def compact_archive(archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Reclaim space used by overwritten and deleted records.
+
+    Returns: Number of bytes reclaimed
+    """
+    return get_archive(archive_path).compact()
+
+
+def import_save_directory(save_directory="data/save_games",
+                          archive_path=DEFAULT_ARCHIVE_PATH):
+    """
+    Copy every readable *_save.txt file into the pack file.
+
+    Returns: Dictionary with 'imported' count and 'failed' list of names
+    """
+    archive = get_archive(archive_path)
+    imported = 0
+    failed = []
+
+    for name in iter_saved_characters(save_directory):
+        try:
+            archive.save(load_character_file(name, save_directory))
+            imported += 1
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+            failed.append(name)
+
+    archive._write_index_file()
+    return {"imported": imported, "failed": failed}
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SAVE ARCHIVE TEST ===")
+
+    # char = {"name": "Packed", "class": "Mage", "level": 1, "health": 90,
+    #         "max_health": 90, "strength": 8, "magic": 20, "experience": 0,
+    #         "gold": 100, "inventory": [], "active_quests": [],
+    #         "completed_quests": []}
+    # save_character(char, "data/test.pack")
+    # print(load_character("Packed", "data/test.pack"))
+    # print(f"Reclaimed {compact_archive('data/test.pack')} bytes")
+    # close_archive("data/test.pack")
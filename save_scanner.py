@@ -0,0 +1,159 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Scanner Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module checks every save file in a save directory for corruption.
+Saves are checked in parallel on a process pool and results are streamed
+back as soon as each one finishes.
+"""
+
+import os
+from multiprocessing import Pool
+
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+from character_manager import (
+    load_character,
+    validate_character_data,
+    iter_saved_characters
+)
+
+# Status used for saves that loaded and validated cleanly
+STATUS_OK = "ok"
+
+# How many names each worker process takes at a time
+DEFAULT_CHUNK_SIZE = 256
+
+# ============================================================================
+# SCANNING
+# ============================================================================
+
+def scan_save(character_name, save_directory="data/save_games"):
+    """
+    Check a single save file.
+
+    Returns:
+        Tuple of (character_name, status, reason)
+        status is "ok" or the name of the exception that was raised
+        reason is "" for ok saves, otherwise the error message
+    """
+    try:
+        character = load_character(character_name, save_directory)
+        validate_character_data(character)
+    except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+        return (character_name, type(e).__name__, str(e))
+
+    return (character_name, STATUS_OK, "")
+
+
+def _scan_save_task(task):
+    """Pool helper - unpack (character_name, save_directory) and scan it."""
+    character_name, save_directory = task
+    return scan_save(character_name, save_directory)
+
+
+def iter_scan_results(save_directory="data/save_games", workers=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Scan every save in a directory, yielding results as they complete.
+
+    Args:
+        save_directory: Directory containing save files
+        workers: Number of worker processes (None = one per CPU,
+                 1 = scan in this process without a pool)
+        chunk_size: Names handed to a worker at a time
+
+    Yields:
+        (character_name, status, reason) tuples in completion order
+    """
+    tasks = ((name, save_directory) for name in iter_saved_characters(save_directory))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for task in tasks:
+            yield _scan_save_task(task)
+        return
+
+    with Pool(processes=workers) as pool:
+        for result in pool.imap_unordered(_scan_save_task, tasks, chunk_size):
+            yield result
+
+
+def scan_save_directory(save_directory="data/save_games", workers=None,
+                        report_path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Scan a whole save directory and build a summary.
+
+    If report_path is given the report is written to that file while
+    results stream in, so failures are on disk even if the scan is
+    interrupted.
+
+    Returns:
+        Dictionary with 'total', 'counts' {status: count} and
+        'failures' [(character_name, status, reason), ...]
+    """
+    counts = {STATUS_OK: 0}
+    failures = []
+    total = 0
+
+    report = None
+    if report_path is not None:
+        report_dir = os.path.dirname(report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        report = open(report_path, "w", encoding="utf-8")
+
+    try:
+        for name, status, reason in iter_scan_results(save_directory, workers, chunk_size):
+            total += 1
+            counts[status] = counts.get(status, 0) + 1
+            if status != STATUS_OK:
+                failures.append((name, status, reason))
+                if report is not None:
+                    report.write(f"{status}: {name} - {reason}\n")
+
+        if report is not None:
+            report.write("\n=== SUMMARY ===\n")
+            report.write(f"TOTAL: {total}\n")
+            for status, count in sorted(counts.items()):
+                report.write(f"{status.upper()}: {count}\n")
+    finally:
+        if report is not None:
+            report.close()
+
+    return {"total": total, "counts": counts, "failures": failures}
+
+
+def display_scan_summary(summary):
+    """
+    Display a scan summary in a readable format
+    """
+    print("\n=== SAVE SCAN ===")
+    print(f"Saves scanned: {summary['total']}")
+    for status, count in sorted(summary["counts"].items()):
+        print(f"{status}: {count}")
+    for name, status, reason in summary["failures"]:
+        print(f"- {name}: {status} ({reason})")
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SAVE SCANNER TEST ===")
+
+    # summary = scan_save_directory("data/save_games",
+    #                               report_path="data/save_scan_report.txt")
+    # display_scan_summary(summary)
@@ -0,0 +1,376 @@
+"""
+Test Battle Simulation
+Tests for the bulk / simulated battle tools
+"""
+
+import pytest
+import sys
+import os
+import random
+import asyncio
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import CharacterDeadError, CorruptedDataError
+import battle_simulator
+import battle_batch
+import battle_replay
+import battle_scheduler
+import balance_optimizer
+import game_data
+import character_manager
+import combat_system
+
+# ============================================================================
+# MONTE-CARLO SIMULATOR TESTS
+# ============================================================================
+
+def test_simulation_is_reproducible_across_workers():
+    """Test that the same seed gives the same stats with or without a pool"""
+    config = {"classes": ["Rogue", "Warrior"], "enemies": ["orc"], "policy": "cautious"}
+
+    single = battle_simulator.simulate_battles(config, 600, workers=1, seed=11)
+    pooled = battle_simulator.simulate_battles(config, 600, workers=2, seed=11)
+
+    assert single == pooled
+
+def test_simulation_statistics_add_up(capsys):
+    """Test that every battle is counted once and nothing is printed"""
+    results = battle_simulator.simulate_battles(
+        {"classes": ["Rogue"], "enemies": ["orc", "dragon"], "policy": "ability"},
+        300, workers=1, seed=5
+    )
+
+    for stats in results.values():
+        assert stats["wins"] + stats["losses"] + stats["escapes"] == 300
+        assert sum(stats["turn_histogram"].values()) == 300
+        assert sum(stats["hp_histogram"]) == 300
+        assert 0.0 <= stats["win_rate"] <= 1.0
+    assert results[("Rogue", "dragon", 1)]["win_rate"] == 0.0
+    assert capsys.readouterr().out == ""
+
+def test_simulated_battles_start_from_a_clean_character():
+    """Test that loot and quest changes don't leak between battles"""
+    template = battle_simulator.build_character("Warrior", 5)
+    for seed in range(20):
+        character = battle_simulator.copy_character(template)
+        character["active_quests"].append("first_steps")
+        combat_system.SimpleBattle(character, combat_system.create_enemy("goblin"),
+                                   sink=combat_system.NULL_SINK, seed=seed).start_battle()
+    assert template["inventory"] == []
+    assert template["active_quests"] == []
+
+def test_simulated_enemies_scale_with_level():
+    """Test that replacement base stats still get the per-level growth"""
+    scaled = combat_system.create_enemy_for_level("dragon", 10)
+    base = combat_system.get_enemy_prototype("dragon")
+    assert battle_simulator.build_enemy("dragon", 10) == scaled
+
+    enemy = battle_simulator.build_enemy("dragon", 10, {"health": 150, "strength": 30})
+    assert enemy["health"] == enemy["max_health"] == 150 + scaled["health"] - base["health"]
+    assert enemy["strength"] == 30 + scaled["strength"] - base["strength"]
+    assert enemy["magic"] == scaled["magic"]
+
+def test_simulation_rejects_unknown_policy():
+    """Test that a bad policy name is reported"""
+    with pytest.raises(ValueError):
+        battle_simulator.simulate_battles({"policy": "dance"}, 1, workers=1)
+
+# ============================================================================
+# NUMPY BATCH RESOLVER TESTS
+# ============================================================================
+
+def _random_fighters(seed, count):
+    """Random player/enemy pairs with no rewards (so HP isn't reset by level-ups)"""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        player = {"name": "P", "health": rng.randint(1, 300), "strength": rng.randint(0, 40),
+                  "magic": 0, "level": 1, "experience": 0, "gold": 0}
+        enemy = {"name": "E", "health": rng.randint(1, 300), "strength": rng.randint(0, 40),
+                 "magic": 0, "xp_reward": 0, "gold_reward": 0}
+        player["max_health"] = player["health"]
+        enemy["max_health"] = enemy["health"]
+        pairs.append((player, enemy))
+    return pairs
+
+def test_batch_resolver_matches_simple_battle():
+    """Test that vectorized battles end exactly like SimpleBattle"""
+    pytest.importorskip("numpy")
+    pairs = _random_fighters(21, 400)
+    batch = battle_batch.resolve_battles(
+        battle_batch.stats_from_dicts([p for p, _ in pairs]),
+        battle_batch.stats_from_dicts([e for _, e in pairs]),
+    )
+
+    for i, (player, enemy) in enumerate(pairs):
+        result = combat_system.SimpleBattle(player, enemy, sink=combat_system.NULL_SINK).start_battle()
+        expected_winner = battle_batch.WINNER_PLAYER if result["winner"] == "player" else battle_batch.WINNER_ENEMY
+        assert batch["winner"][i] == expected_winner
+        assert batch["turns"][i] == result["turns"]
+        assert batch["player_health"][i] == player["health"]
+        assert batch["enemy_health"][i] == enemy["health"]
+
+def test_batch_resolver_runs_enemy_behaviors():
+    """Test that batched enemy behaviors end exactly like SimpleBattle"""
+    pytest.importorskip("numpy")
+    rng = random.Random(22)
+    pairs = []
+    for player, _ in _random_fighters(23, 600):
+        enemy = combat_system.create_enemy(rng.choice(["goblin", "dragon"]))
+        enemy.update(health=rng.randint(1, enemy["max_health"]), strength=rng.randint(0, 40),
+                     xp_reward=0, gold_reward=0)
+        pairs.append((player, enemy))
+
+    enemies = [e for _, e in pairs]
+    batch = battle_batch.resolve_battles(battle_batch.stats_from_dicts([p for p, _ in pairs]),
+                                         battle_batch.stats_from_dicts(enemies),
+                                         battle_batch.behaviors_from_dicts(enemies))
+
+    for i, (player, enemy) in enumerate(pairs):
+        result = combat_system.SimpleBattle(player, enemy, sink=combat_system.NULL_SINK).start_battle()
+        assert batch["turns"][i] == result["turns"]
+        assert batch["player_health"][i] == player["health"]
+        assert batch["enemy_health"][i] == enemy["health"]
+
+def test_batch_resolver_rejects_dead_players():
+    """Test that a dead player can't be put into a batch"""
+    np = pytest.importorskip("numpy")
+    with pytest.raises(CharacterDeadError):
+        battle_batch.resolve_battles({"strength": np.array([5]), "health": np.array([0])},
+                                     {"strength": np.array([5]), "health": np.array([10])})
+
+# ============================================================================
+# SEEDED BATTLE / REPLAY TESTS
+# ============================================================================
+
+def test_same_seed_gives_same_battle():
+    """Test that a battle's own seed makes escapes and crits repeatable"""
+    def run(seed):
+        hero = character_manager.create_character("Seeded", "Rogue")
+        sink = combat_system.ListBattleSink()
+        combat_system.SimpleBattle(hero, combat_system.create_enemy("orc"), sink=sink,
+                                   action_source=battle_simulator.policy_cautious,
+                                   seed=seed).start_battle()
+        return sink.events
+
+    assert run(123) == run(123)
+    assert any(run(seed) != run(123) for seed in range(5))
+
+def test_replay_reproduces_recorded_battles():
+    """Test that replays re-run to the exact same result and stats"""
+    rng = random.Random(3)
+    for i in range(200):
+        character_class = rng.choice(["Warrior", "Mage", "Rogue", "Cleric"])
+        hero = battle_simulator.build_character(character_class, rng.randint(1, 6))
+        enemy = combat_system.create_enemy(rng.choice(["goblin", "orc", "dragon"]))
+        policy = rng.choice([None, battle_simulator.policy_ability,
+                             battle_simulator.policy_cautious])
+
+        battle = combat_system.SimpleBattle(hero, enemy, sink=combat_system.NULL_SINK,
+                                            action_source=policy, record=True)
+        result = battle.start_battle()
+        data = battle_replay.encode_replay(battle)
+        assert len(data) < 120
+
+        replayed, replay_hero, replay_enemy = battle_replay.replay_battle(data)
+        assert replayed == result
+        for key in ("health", "level", "experience", "gold"):
+            assert replay_hero[key] == hero[key]
+        assert replay_enemy["health"] == enemy["health"]
+
+def test_replay_keeps_default_attack_turns():
+    """Test that turns the action source left to the default attack are recorded"""
+    script = iter([None, None, "ability"])
+    hero = character_manager.create_character("Gaps", "Cleric")
+    battle = combat_system.SimpleBattle(hero, combat_system.create_enemy("orc"),
+                                        sink=combat_system.NULL_SINK,
+                                        action_source=lambda b: next(script, None),
+                                        seed=1, record=True)
+    result = battle.start_battle()
+    assert battle.recorded_actions[:3] == ["attack", "attack", "ability"]
+
+    replayed, replay_hero, _ = battle_replay.replay_battle(battle_replay.encode_replay(battle))
+    assert replayed == result
+    assert replay_hero["health"] == hero["health"]
+
+def test_replay_keeps_full_seeds_and_checks_stats():
+    """Test seeds past 32 bits, big levels, bad stats and version 2 replays"""
+    for seed in (2**32 + 7, 2**70 + 1, -3):
+        hero = character_manager.create_character("Seeded", "Rogue")
+        battle = combat_system.SimpleBattle(hero, combat_system.create_enemy("orc"),
+                                            sink=combat_system.NULL_SINK,
+                                            action_source=battle_simulator.policy_cautious,
+                                            seed=seed, record=True)
+        result = battle.start_battle()
+        data = battle_replay.encode_replay(battle)
+        assert battle_replay.decode_replay(data)["seed"] == seed
+        assert battle_replay.replay_battle(data)[0] == result
+
+    hero = character_manager.create_character("Veteran", "Warrior")
+    hero["level"] = 70000
+    battle = combat_system.SimpleBattle(hero, combat_system.create_enemy("goblin"),
+                                        sink=combat_system.NULL_SINK, seed=1, record=True)
+    battle.start_battle()
+    assert battle_replay.decode_replay(battle_replay.encode_replay(battle))["character"]["level"] == 70000
+
+    battle.initial_state[0]["gold"] = -1
+    with pytest.raises(ValueError):
+        battle_replay.encode_replay(battle)
+
+    old = (battle_replay.struct.pack("<4sBBI", b"QCRP", 2, 0, 9)
+           + b"".join(bytes([len(s)]) + s for s in (b"Old", b"Mage", b"Goblin", b"goblin"))
+           + battle_replay.OLD_CHARACTER_STATS.pack(3, 0, 100, 90, 90, 8, 20)
+           + battle_replay.ENEMY_STATS.pack(50, 50, 8, 2, 25, 10))
+    replay = battle_replay.decode_replay(old)
+    assert replay["seed"] == 9 and replay["character"]["level"] == 3
+    assert replay["enemy"]["enemy_id"] == "goblin" and replay["actions"] is None
+
+def test_replay_log_round_trip(tmp_path):
+    """Test that replays can be appended to and read back from a log"""
+    log = tmp_path / "battles.qcr"
+    replays = []
+    for seed in range(3):
+        hero = character_manager.create_character("Logged", "Mage")
+        battle = combat_system.SimpleBattle(hero, combat_system.create_enemy("goblin"),
+                                            sink=combat_system.NULL_SINK,
+                                            action_source=battle_simulator.policy_ability,
+                                            seed=seed, record=True)
+        battle.start_battle()
+        replays.append(battle_replay.encode_replay(battle))
+
+    battle_replay.write_replays(str(log), replays)
+    assert list(battle_replay.iter_replays(str(log))) == replays
+
+    with pytest.raises(CorruptedDataError):
+        battle_replay.decode_replay(replays[0][:20])
+
+# ============================================================================
+# ASYNC SCHEDULER TESTS
+# ============================================================================
+
+def _scheduled_battles(count, character_class="Rogue"):
+    """Seeded headless battles for the scheduler tests"""
+    return [combat_system.SimpleBattle(character_manager.create_character(f"Async{i}", character_class),
+                                       combat_system.create_enemy("orc"),
+                                       sink=combat_system.NULL_SINK, seed=i)
+            for i in range(count)]
+
+def test_scheduler_interleaves_and_matches_sync_results():
+    """Test that async battles give the same results as running them one by one"""
+    order = []
+
+    async def thinking_ai(battle):
+        order.append(battle.seed)
+        await asyncio.sleep(0.0005 * (battle.seed % 3))
+        return battle_simulator.policy_cautious(battle)
+
+    battles = _scheduled_battles(50)
+    results, report = battle_scheduler.run_battles(battles, thinking_ai)
+
+    expected = [battle.start_battle() for battle in
+                [combat_system.SimpleBattle(b.character, b.enemy, sink=combat_system.NULL_SINK,
+                                            action_source=battle_simulator.policy_cautious, seed=b.seed)
+                 for b in _scheduled_battles(50)]]
+    assert results == expected
+    # Every battle got its first turn before any battle got its second
+    assert sorted(order[:50]) == list(range(50))
+    assert report["completed"] == 50 and report["timeouts"] == 0
+    assert report["decision_latency"]["count"] == report["turns"]
+    assert report["battle_latency"]["p50"] <= report["battle_latency"]["max"]
+
+def test_scheduler_times_out_to_basic_attack():
+    """Test that a silent action source can't stall a battle"""
+    async def silent(battle):
+        await asyncio.sleep(60)
+
+    battle = _scheduled_battles(1, "Warrior")[0]
+    results, report = battle_scheduler.run_battles([battle], silent, turn_timeout=0.01)
+    assert results[0]["winner"] == "player"
+    assert report["timeouts"] == report["turns"] == results[0]["turns"]
+
+def test_scheduler_times_out_blocking_sources():
+    """Test that a plain function that blocks gets the same turn timeout"""
+    def stuck(battle):
+        time.sleep(0.2)
+        return "escape"
+
+    battle = _scheduled_battles(1, "Warrior")[0]
+    results, report = battle_scheduler.run_battles([battle], stuck, turn_timeout=0.01)
+    assert results[0]["winner"] == "player"
+    assert report["timeouts"] == report["turns"] == results[0]["turns"]
+
+def test_scheduler_discards_input_for_a_missed_turn():
+    """Test that queued input that came after a timeout isn't played next turn"""
+    async def scenario():
+        queue = asyncio.Queue()
+        source = battle_scheduler.queue_action_source(queue)
+        battle = _scheduled_battles(1)[0]
+        scheduler = battle_scheduler.BattleScheduler(turn_timeout=0.05)
+
+        actions = [await scheduler.next_action(battle, source)]
+        await queue.put("escape")       # too late for the missed turn
+        actions.append(await scheduler.next_action(battle, source))
+        # Input sent while a turn is waiting is that turn's action
+        asyncio.get_running_loop().call_later(0.005, queue.put_nowait, "ability")
+        actions.append(await scheduler.next_action(battle, source))
+        return actions, scheduler.metrics.timeouts
+
+    actions, timeouts = asyncio.run(scenario())
+    assert actions == ["attack", "attack", "ability"]
+    assert timeouts == 2
+
+def test_scheduler_queue_source_and_failures():
+    """Test human-style queued input and that one failing battle doesn't stop the rest"""
+    async def scenario():
+        queue = asyncio.Queue()
+        living, dead = _scheduled_battles(2)
+        dead.character["health"] = 0
+        scheduler = battle_scheduler.BattleScheduler(turn_timeout=1.0)
+        task = asyncio.ensure_future(scheduler.run_all(
+            [living, dead], [battle_scheduler.queue_action_source(queue), None]))
+        for _ in range(20):
+            await queue.put("escape")
+        return await task, scheduler.metrics.report()
+
+    (escaped, error), report = asyncio.run(scenario())
+    assert escaped["winner"] == "escaped" and escaped["turns"] == 3
+    assert isinstance(error, CharacterDeadError)
+    assert report["completed"] == 1 and report["failed"] == 1
+
+# ============================================================================
+# BALANCE OPTIMIZER TESTS
+# ============================================================================
+
+def test_optimizer_caches_evaluated_stats():
+    """Test that re-scoring the same stats doesn't simulate again"""
+    targets = [{"enemy": "orc", "levels": [3], "win_rate": 0.5, "avg_turns": 5}]
+    optimizer = balance_optimizer.BalanceOptimizer(targets, classes=["Warrior", "Mage"],
+                                                   battles=50, workers=1)
+    first = optimizer.evaluate(optimizer.class_stats, optimizer.enemy_stats)
+    second = optimizer.evaluate(optimizer.class_stats, optimizer.enemy_stats)
+    assert first == second
+    assert optimizer.simulated_combos == 2 and optimizer.cache_hits == 2
+
+    # Changing one class only re-simulates that class's combination
+    optimizer.class_stats["Mage"]["strength"] += 5
+    optimizer.evaluate(optimizer.class_stats, optimizer.enemy_stats)
+    assert optimizer.simulated_combos == 3
+
+def test_balance_run_improves_and_writes_files(tmp_path):
+    """Test a short search lowers the loss and writes loadable data files"""
+    targets = [{"enemy": "goblin", "levels": [1], "win_rate": 0.5, "avg_turns": 8}]
+    result = balance_optimizer.balance(targets, str(tmp_path), classes=["Warrior"],
+                                       battles=100, workers=1, max_rounds=4)
+
+    assert result["loss"] < result["initial_loss"]
+    enemies = game_data.load_enemies(str(tmp_path / "enemies.txt"))
+    classes = game_data.load_classes(str(tmp_path / "classes.txt"))
+    assert enemies["goblin"]["health"] == result["enemy_stats"]["goblin"]["health"]
+    assert classes["Warrior"]["strength"] == result["class_stats"]["Warrior"]["strength"]
+    assert set(enemies) == {"goblin", "orc", "dragon"}
+    assert "BALANCE REPORT" in (tmp_path / "balance_report.txt").read_text()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,770 @@
+"""
+Test Combat Features
+Tests for data-driven classes and the extended battle engine
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import combat_system
+import game_data
+import battle_effects
+import party_battle
+import battle_profiler
+import auto_grind
+import loot_system
+import inventory_system
+import enemy_ai
+
+# ============================================================================
+# CLASS REGISTRY TESTS
+# ============================================================================
+
+def test_class_registry_loads_from_file(tmp_path):
+    """Test that new classes can be added through the data file"""
+    class_file = tmp_path / "classes.txt"
+    class_file.write_text(
+        "CLASS: Paladin\nHEALTH: 130\nSTRENGTH: 13\nMAGIC: 9\nABILITY: heal\n"
+    )
+    try:
+        character_manager.load_class_registry(str(class_file))
+        char = character_manager.create_character("Holy", "Paladin")
+        assert char["max_health"] == 130
+        assert character_manager.get_class_ability("paladin") == "heal"
+        with pytest.raises(InvalidCharacterClassError):
+            character_manager.create_character("Test", "Warrior")
+    finally:
+        character_manager.load_class_registry()
+
+def test_created_characters_do_not_share_lists():
+    """Test that template clones are independent"""
+    a = character_manager.create_character("A", "Rogue")
+    b = character_manager.create_character("B", "Rogue")
+    a["inventory"].append("iron_sword")
+    assert b["inventory"] == []
+    assert a["name"] == "A"
+
+def test_special_ability_dispatch_uses_registry():
+    """Test that abilities are dispatched by class"""
+    char = character_manager.create_character("Caster", "Mage")
+    enemy = combat_system.create_enemy("orc")
+    combat_system.use_special_ability(char, enemy)
+    assert enemy["health"] == enemy["max_health"] - char["magic"] * 2
+
+def test_invalid_class_file_raises():
+    """Test that a class block with bad numbers is rejected"""
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_class_block(["CLASS: Bad", "HEALTH: x", "STRENGTH: 1",
+                                     "MAGIC: 1", "ABILITY: heal"])
+
+def test_default_classes_come_from_one_table(tmp_path, monkeypatch):
+    """Test that the shipped, generated and fallback classes all match"""
+    assert game_data.load_classes("data/classes.txt") == game_data.DEFAULT_CLASSES
+    assert character_manager.DEFAULT_CLASSES is game_data.DEFAULT_CLASSES
+
+    monkeypatch.chdir(tmp_path)
+    game_data.create_default_data_files()
+    assert game_data.load_classes("data/classes.txt") == game_data.DEFAULT_CLASSES
+    assert list(game_data.load_quests("data/quests.txt")) == ["quest_intro", "quest_hunt_goblins"]
+    assert game_data.load_items("data/items.txt")["potion_small"]["cost"] == 30
+
+# ============================================================================
+# ENEMY REGISTRY TESTS
+# ============================================================================
+
+def test_default_enemies_come_from_one_table(tmp_path, monkeypatch):
+    """Test that the shipped, generated and fallback enemies all match"""
+    assert game_data.load_enemies("data/enemies.txt") == game_data.DEFAULT_ENEMIES
+    assert combat_system.DEFAULT_ENEMIES is game_data.DEFAULT_ENEMIES
+
+    monkeypatch.chdir(tmp_path)
+    game_data.create_default_data_files()
+    assert game_data.load_enemies("data/enemies.txt") == game_data.DEFAULT_ENEMIES
+
+def test_bad_class_or_enemy_file_fails_at_startup(tmp_path, monkeypatch):
+    """Test that load_game_data checks the class and enemy files up front"""
+    import main
+    monkeypatch.chdir(tmp_path)
+    try:
+        game_data.create_default_data_files()
+        main.load_game_data()
+
+        for name, bad in (("classes.txt", "CLASS: Bad\nHEALTH: x\n"),
+                          ("enemies.txt", "ENEMY_ID: slime\nNAME: Slime\n")):
+            path = os.path.join("data", name)
+            with open(path) as f:
+                good = f.read()
+            with open(path, "w") as f:
+                f.write(bad)
+            with pytest.raises(InvalidDataFormatError):
+                main.load_game_data()
+            with open(path, "w") as f:
+                f.write(good)
+    finally:
+        monkeypatch.undo()
+        character_manager.load_class_registry()
+        combat_system.load_enemy_catalog()
+        loot_system.load_loot_catalog()
+
+def test_enemy_registry_default_bands():
+    """Test that the default catalog keeps the classic level bands"""
+    assert combat_system.get_random_enemy_for_level(1)["name"] == "Goblin"
+    assert combat_system.get_random_enemy_for_level(4)["name"] == "Orc"
+    assert combat_system.get_random_enemy_for_level(50)["name"] == "Dragon"
+
+def test_enemy_instances_are_copies_of_frozen_prototypes():
+    """Test that damaging one enemy doesn't affect the next"""
+    first = combat_system.create_enemy("Goblin")
+    first["health"] = 0
+    assert combat_system.create_enemy("goblin")["health"] == 50
+
+    prototype = combat_system.get_enemy_prototype("goblin")
+    with pytest.raises(TypeError):
+        prototype["health"] = 1
+
+def test_enemy_registry_loads_custom_enemies(tmp_path):
+    """Test that new enemy types can be added through the data file"""
+    enemy_file = tmp_path / "enemies.txt"
+    enemy_file.write_text(
+        "ENEMY_ID: slime\nNAME: Slime\nHEALTH: 20\nSTRENGTH: 3\nMAGIC: 0\n"
+        "XP_REWARD: 5\nGOLD_REWARD: 1\nMIN_LEVEL: 1\nMAX_LEVEL: NONE\nSPAWN_WEIGHT: 1\n"
+    )
+    try:
+        combat_system.load_enemy_catalog(str(enemy_file))
+        assert combat_system.get_random_enemy_for_level(99)["name"] == "Slime"
+        with pytest.raises(InvalidTargetError):
+            combat_system.create_enemy("goblin")
+    finally:
+        combat_system.load_enemy_catalog()
+
+def test_invalid_enemy_band_rejected():
+    """Test that an enemy whose max level is below its min level is rejected"""
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_enemy_block([
+            "ENEMY_ID: bad", "NAME: Bad", "HEALTH: 1", "STRENGTH: 1", "MAGIC: 1",
+            "XP_REWARD: 1", "GOLD_REWARD: 1", "MIN_LEVEL: 5", "MAX_LEVEL: 2", "SPAWN_WEIGHT: 1",
+        ])
+
+def test_alias_table_matches_weights():
+    """Test that alias draws follow the spawn weights"""
+    from weighted_sampling import build_alias_table, alias_draw
+    weights = [1, 3, 6, 0]
+    table = build_alias_table(weights)
+    rng = random.Random(7)
+    counts = [0] * len(weights)
+    for _ in range(20000):
+        counts[alias_draw(table, rng)] += 1
+    assert counts[3] == 0
+    for count, weight in zip(counts, weights):
+        assert abs(count / 20000 - weight / 10) < 0.02
+
+def test_encounter_tables_seeded_and_rebuilt(tmp_path):
+    """Test seeded encounters and lazy rebuild when the catalog changes"""
+    enemy_file = tmp_path / "enemies.txt"
+    enemy_file.write_text(
+        "ENEMY_ID: slime\nNAME: Slime\nHEALTH: 20\nSTRENGTH: 3\nMAGIC: 0\n"
+        "XP_REWARD: 5\nGOLD_REWARD: 1\nMIN_LEVEL: 2\nMAX_LEVEL: 4\nSPAWN_WEIGHT: 1\n\n"
+        "ENEMY_ID: bat\nNAME: Bat\nHEALTH: 10\nSTRENGTH: 2\nMAGIC: 0\n"
+        "XP_REWARD: 3\nGOLD_REWARD: 1\nMIN_LEVEL: 3\nMAX_LEVEL: NONE\nSPAWN_WEIGHT: 3\n"
+    )
+    assert combat_system.get_random_enemy_for_level(3)["name"] == "Orc"
+    try:
+        combat_system.load_enemy_catalog(str(enemy_file))
+        pick = combat_system.get_random_enemy_for_level
+        assert pick(1)["name"] == "Slime"
+        assert pick(2)["name"] == "Slime"
+        assert pick(9)["name"] == "Bat"
+
+        first = [pick(3, random.Random(5))["name"] for _ in range(3)]
+        second = [pick(3, random.Random(5))["name"] for _ in range(3)]
+        assert first == second
+        rng = random.Random(1)
+        names = [pick(4, rng)["name"] for _ in range(4000)]
+        assert 0.7 < names.count("Bat") / len(names) < 0.8
+    finally:
+        combat_system.load_enemy_catalog()
+    assert combat_system.get_random_enemy_for_level(3)["name"] == "Orc"
+
+# ============================================================================
+# HEADLESS BATTLE TESTS
+# ============================================================================
+
+def test_headless_battle_prints_nothing(capsys):
+    """Test that a battle with the null sink produces no output"""
+    char = character_manager.create_character("Quiet", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    result = combat_system.SimpleBattle(char, enemy, sink=combat_system.NULL_SINK).start_battle()
+
+    assert result["winner"] == "player"
+    assert capsys.readouterr().out == ""
+
+def test_list_sink_records_structured_events():
+    """Test that the list sink gets one event per action"""
+    char = character_manager.create_character("Logger", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    sink = combat_system.ListBattleSink()
+    combat_system.SimpleBattle(char, enemy, sink=sink).start_battle()
+
+    actions = [event.action for event in sink.events]
+    assert actions[0] == "start"
+    assert actions[-1] == "victory"
+    first_hit = sink.events[1]
+    assert first_hit.actor == "player"
+    assert first_hit.hp_after == enemy["max_health"] - first_hit.damage
+    detail = sink.events[-1].detail
+    assert (detail["xp"], detail["gold"]) == (25, 10)
+
+def test_text_renderer_prints_defeat(capsys):
+    """Test that the console renderer handles a lost battle"""
+    char = character_manager.create_character("Doomed", "Mage")
+    char["health"] = 1
+    enemy = combat_system.create_enemy("orc")
+    result = combat_system.SimpleBattle(char, enemy).start_battle()
+
+    assert result["winner"] == "enemy"
+    assert "You were defeated..." in capsys.readouterr().out
+
+# ============================================================================
+# FAST-FORWARD TESTS
+# ============================================================================
+
+def _random_matchup(rng):
+    """A random character (any level) and enemy"""
+    char = character_manager.create_character("Prop", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"]))
+    char["health"] = rng.randint(1, char["max_health"])
+    char["strength"] = rng.randint(0, 60)
+    char["experience"] = rng.randint(0, 99)
+    enemy = combat_system.create_enemy(rng.choice(["goblin", "orc", "dragon"]))
+    enemy["health"] = rng.randint(1, enemy["max_health"])
+    enemy["strength"] = rng.randint(0, 60)
+    return char, enemy
+
+def test_fast_forward_matches_turn_loop():
+    """Property test: the O(1) result equals stepping turn by turn"""
+    rng = random.Random(1234)
+    for i in range(2000):
+        char, enemy = _random_matchup(rng)
+        char2, enemy2 = dict(char), dict(enemy)
+        char2["inventory"] = list(char["inventory"])
+
+        # Same seed so both battles roll the same loot
+        fast = combat_system.SimpleBattle(char, enemy, sink=combat_system.NULL_SINK, seed=i)
+        # Enemies with behavior rules (the dragon) are always stepped
+        attacker_only = combat_system.get_enemy_behavior(enemy["enemy_id"]) is None
+        assert fast.can_fast_forward() == attacker_only
+        fast_result = fast.start_battle()
+
+        slow = combat_system.SimpleBattle(char2, enemy2, sink=combat_system.ListBattleSink(),
+                                          seed=i)
+        assert not slow.can_fast_forward()
+        slow_result = slow.start_battle()
+
+        assert fast_result == slow_result
+        assert char == char2
+        assert enemy == enemy2
+
+def test_fast_forward_not_used_with_action_source():
+    """Test that abilities/escapes fall back to stepping"""
+    char = character_manager.create_character("Stepper", "Rogue")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("orc"),
+                                        sink=combat_system.NULL_SINK,
+                                        action_source=lambda b: "ability")
+    assert not battle.can_fast_forward()
+
+# ============================================================================
+# COOLDOWN / STATUS EFFECT TESTS
+# ============================================================================
+
+def test_timer_wheel_returns_items_on_their_turn():
+    """Test near and far (overflow heap) timers come due on the right turn"""
+    wheel = battle_effects.TimerWheel(start_turn=0, size=8)
+    for turn in (3, 8, 20, 100):
+        wheel.schedule(turn, turn)
+    seen = {}
+    for _ in range(100):
+        for item in wheel.advance():
+            seen[item] = wheel.current_turn
+    assert seen == {3: 3, 8: 8, 20: 20, 100: 100}
+    assert wheel.pending == 0
+    with pytest.raises(ValueError):
+        wheel.schedule(100, "past")
+
+def test_many_effects_match_step_by_step_totals():
+    """Test hundreds of poisons/regens against a simple per-effect count"""
+    rng = random.Random(4)
+    target = {"health": 10**6, "max_health": 10**6}
+    effects = battle_effects.BattleEffects(start_turn=0)
+    added = []
+    for _ in range(300):
+        kind = rng.choice([battle_effects.POISON, battle_effects.REGEN])
+        amount, duration, interval = rng.randint(1, 9), rng.randint(1, 60), rng.randint(1, 4)
+        effects.add_effect(target, kind, amount, duration, interval)
+        added.append((kind, amount, duration, interval))
+    target["health"] = 500000
+
+    expected = 500000
+    for turn in range(1, 70):
+        effects.advance_turn()
+        for kind, amount, duration, interval in added:
+            if turn <= duration and turn % interval == 0:
+                expected += amount if kind == battle_effects.REGEN else -amount
+        assert target["health"] == expected
+    assert effects.is_idle()
+
+def test_buffs_are_removed_after_battle():
+    """Test buffs change stats during battle only, and disable fast-forward"""
+    char = character_manager.create_character("Buffed", "Warrior")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(char, enemy, sink=combat_system.NULL_SINK)
+    battle.add_effect(char, battle_effects.BUFF, 20, duration=50)
+    assert char["strength"] == 35
+    assert not battle.can_fast_forward()
+
+    # 32 damage a hit instead of 12: orc (80 HP) falls on turn 3, not 7
+    assert battle.start_battle()["turns"] == 3
+    assert char["strength"] == 15
+
+def test_poison_can_finish_a_battle():
+    """Test that effect damage is applied each turn and can end the fight"""
+    char = character_manager.create_character("Poisoner", "Mage")
+    enemy = combat_system.create_enemy("dragon")
+    sink = combat_system.ListBattleSink()
+    battle = combat_system.SimpleBattle(char, enemy, sink=sink)
+    battle.add_effect(enemy, battle_effects.POISON, 100, duration=5)
+    result = battle.start_battle()
+
+    # Dragon (200 HP) takes 2 per hit: 198, poisoned to 98, 96, poisoned to 0
+    effect_events = [e for e in sink.events if e.action == "effect"]
+    assert [(e.turn, e.actor, e.damage) for e in effect_events] == [(2, "enemy", 100), (3, "enemy", 96)]
+    assert result["winner"] == "player" and result["turns"] == 3
+
+def test_ability_comes_back_after_cooldown():
+    """Test per-class cooldowns measured in turns"""
+    assert character_manager.get_class_ability_cooldown("warrior") == 3
+    char = character_manager.create_character("Cooldown", "Warrior")
+    enemy = combat_system.create_enemy("dragon")
+    enemy["health"] = enemy["max_health"] = 10**6
+    char["health"] = char["max_health"] = 10**6
+    sink = combat_system.ListBattleSink()
+    battle = combat_system.SimpleBattle(char, enemy, sink=sink,
+                                        action_source=lambda b: "ability")
+    for _ in range(10):
+        battle.player_turn()
+        battle.turn_counter += 1
+        battle.apply_turn_effects()
+    ability_turns = [e.turn for e in sink.events if e.action == "ability"]
+    assert ability_turns == [1, 4, 7, 10]
+
+def test_class_without_cooldown_is_once_per_battle():
+    """Test that COOLDOWN is optional and defaults to 0"""
+    class_data = game_data.parse_class_block([
+        "CLASS: Monk", "HEALTH: 100", "STRENGTH: 10", "MAGIC: 10", "ABILITY: heal",
+    ])
+    assert class_data["cooldown"] == 0
+
+# ============================================================================
+# PARTY BATTLE TESTS
+# ============================================================================
+
+def test_one_on_one_party_battle_matches_simple_battle():
+    """Test that a 1v1 at equal speed plays out exactly like SimpleBattle"""
+    rng = random.Random(9)
+    for _ in range(200):
+        hero, enemy = _random_matchup(rng)
+        hero["speed"] = enemy["speed"] = 10
+        hero2, enemy2 = dict(hero), dict(enemy)
+
+        simple = combat_system.SimpleBattle(hero, enemy, sink=combat_system.NULL_SINK).start_battle()
+        party = party_battle.PartyBattle([hero2], [enemy2]).start_battle()
+
+        assert party["winner"] == ("party" if simple["winner"] == "player" else "horde")
+        assert hero2["health"] == hero["health"]
+        assert enemy2["health"] == enemy["health"]
+
+def test_faster_combatants_act_more_often():
+    """Test that the initiative queue follows speed"""
+    hero = character_manager.create_character("Fast", "Warrior")
+    hero["speed"] = 30
+    hero["health"] = hero["max_health"] = 10**6
+    enemy = combat_system.create_enemy("dragon")
+    enemy["speed"] = 10
+    sink = combat_system.ListBattleSink()
+    party_battle.PartyBattle([hero], [enemy], sink=sink).start_battle()
+
+    actors = [e.actor for e in sink.events if e.action == "attack"]
+    assert actors[:8] == ["player", "player", "player", "enemy"] * 2
+
+def test_weakest_targeting_and_rewards():
+    """Test that the weakest enemy is always attacked and rewards are split"""
+    party = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(2)]
+    horde = [combat_system.create_enemy("goblin") for _ in range(4)]
+    for i, goblin in enumerate(horde):
+        goblin["health"] = 10 + i * 10
+    sink = combat_system.ListBattleSink()
+    result = party_battle.PartyBattle(party, horde, sink=sink).start_battle()
+
+    assert result["winner"] == "party"
+    assert result["xp_gained"] == 100 and result["gold_gained"] == 40
+    assert [p["gold"] for p in party] == [120, 120]
+    hits = [e for e in sink.events if e.actor == "player"]
+    # 13 damage a hit: goblin at 10 dies, then the 20 HP one takes two hits
+    assert [e.hp_after for e in hits][:3] == [0, 7, 0]
+
+def test_uneven_rewards_hand_out_the_remainder():
+    """Test that rewards that don't divide evenly are still paid in full"""
+    party = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(3)]
+    for hero in party:
+        hero["health"] = hero["max_health"] = 10**6
+    horde = [combat_system.create_enemy("goblin")]
+    horde[0]["xp_reward"], horde[0]["gold_reward"] = 8, 10
+    result = party_battle.PartyBattle(party, horde).start_battle()
+
+    assert result["xp_gained"] == 8 and result["gold_gained"] == 10
+    assert [p["experience"] for p in party] == [3, 3, 2]
+    assert [p["gold"] - 100 for p in party] == [4, 3, 3]
+
+def test_party_battle_rejects_dead_enemies():
+    """Test that a horde with a defeated enemy can't be fought for its rewards"""
+    hero = character_manager.create_character("Looter", "Warrior")
+    for healths in ([0], [50, 0], [-5, -5]):
+        horde = [combat_system.create_enemy("goblin") for _ in healths]
+        for goblin, health in zip(horde, healths):
+            goblin["health"] = health
+        with pytest.raises(InvalidTargetError):
+            party_battle.PartyBattle([hero], horde)
+    assert hero["experience"] == 0 and hero["gold"] == 100
+
+def test_alive_set_swap_remove():
+    """Test O(1) removal keeps the index map consistent"""
+    alive = party_battle.AliveSet(range(6))
+    for index in (0, 5, 2):
+        alive.remove(index)
+    assert sorted(alive.items) == [1, 3, 4]
+    assert all(alive.items[alive.position[i]] == i for i in alive.items)
+    assert 2 not in alive and 4 in alive
+
+# ============================================================================
+# PROFILER TESTS
+# ============================================================================
+
+def test_profiler_counts_every_phase():
+    """Test that each phase is timed once per call"""
+    profiler = battle_profiler.BattleProfiler()
+    sink = combat_system.ListBattleSink()
+    char = character_manager.create_character("Timed", "Warrior")
+    result = combat_system.SimpleBattle(char, combat_system.create_enemy("orc"), sink=sink,
+                                        profiler=profiler).start_battle()
+
+    turns = result["turns"]
+    assert profiler.counts["setup"] == 1
+    assert profiler.counts["turn"] == turns
+    assert profiler.counts["damage"] == 2 * turns - 1
+    assert profiler.counts["end_check"] == 2 * turns - 1
+    assert profiler.counts["rewards"] == 1
+    assert profiler.counts["display"] == len(sink.events)
+    for phase in battle_profiler.PHASES:
+        assert sum(profiler.histogram(phase).values()) == profiler.counts[phase]
+    assert profiler.summary()["turn"]["p50_ns"] <= profiler.summary()["turn"]["max_ns"]
+
+def test_profiler_disabled_leaves_methods_alone():
+    """Test that battles without a profiler keep the plain class methods"""
+    battle = combat_system.SimpleBattle(character_manager.create_character("Plain", "Mage"),
+                                        combat_system.create_enemy("goblin"),
+                                        sink=combat_system.NULL_SINK)
+    for name in battle_profiler.PHASE_METHODS.values():
+        assert name not in vars(battle)
+
+def test_profiler_merge_and_fast_forward():
+    """Test headless fast-forward timing and merging profilers"""
+    first, second = battle_profiler.BattleProfiler(), battle_profiler.BattleProfiler()
+    for profiler in (first, second):
+        combat_system.SimpleBattle(character_manager.create_character("Quick", "Rogue"),
+                                   combat_system.create_enemy("goblin"),
+                                   sink=combat_system.NULL_SINK, profiler=profiler).start_battle()
+    first.merge(second)
+    assert first.counts["fast_forward"] == 2 and first.counts["turn"] == 0
+    assert first.counts["display"] == 0
+
+# ============================================================================
+# AUTO-GRIND TESTS
+# ============================================================================
+
+def test_auto_grind_matches_separate_battles():
+    """Test that a grind ends like the same fights played one by one"""
+    hero = character_manager.create_character("Grinder", "Warrior")
+    summary = auto_grind.auto_grind(hero, 3, rng=random.Random(4))
+
+    other = character_manager.create_character("Grinder", "Warrior")
+    rng = random.Random(4)
+    for _ in range(3):
+        enemy = combat_system.get_random_enemy_for_level(1, rng)
+        combat_system.SimpleBattle(other, enemy, sink=combat_system.NULL_SINK).start_battle()
+
+    assert summary["fights"] == summary["wins"] == 3
+    assert summary["stopped"] == auto_grind.STOP_COMPLETED
+    assert summary["enemies"] == {"goblin": 3}
+    assert hero["health"] == other["health"] == summary["health"]
+    assert hero["experience"] == other["experience"] == summary["xp_gained"]
+    assert hero["gold"] == other["gold"]
+
+def test_auto_grind_applies_rewards_once(monkeypatch):
+    """Test that a long grind calls gain_experience and add_gold once"""
+    calls = []
+    monkeypatch.setattr(auto_grind, "gain_experience",
+                        lambda c, xp: calls.append(("xp", xp)) or c)
+    monkeypatch.setattr(auto_grind, "add_gold",
+                        lambda c, gold: calls.append(("gold", gold)) or c["gold"])
+    hero = character_manager.create_character("Grinder", "Warrior")
+    hero["strength"] = 100
+    summary = auto_grind.auto_grind(hero, 10000)
+    assert summary["wins"] == 10000
+    assert calls == [("xp", 250000), ("gold", 100000)]
+    # Loot from all 10000 goblins went in at once, the rest overflowed
+    assert len(hero["inventory"]) == inventory_system.MAX_INVENTORY_SIZE
+    assert (sum(summary["loot"].values())
+            == len(hero["inventory"]) + sum(summary["loot_overflow"].values()))
+
+def test_auto_grind_stops_on_low_health_and_death():
+    """Test the health threshold, defeat and dead-character cases"""
+    hero = character_manager.create_character("Grinder", "Mage")
+    summary = auto_grind.auto_grind(hero, 100, stop_below=0.5)
+    assert summary["stopped"] == auto_grind.STOP_LOW_HEALTH
+    assert 0 < hero["health"] < hero["max_health"] * 0.5
+
+    summary = auto_grind.auto_grind(hero, 100)
+    assert summary["stopped"] == auto_grind.STOP_DEFEATED
+    assert summary["wins"] == summary["fights"] - 1
+    assert hero["health"] == 0 and hero["gold"] > 0
+    with pytest.raises(CharacterDeadError):
+        auto_grind.auto_grind(hero, 1)
+
+# ============================================================================
+# LOOT TESTS
+# ============================================================================
+
+def test_loot_tables_check_item_catalog(tmp_path):
+    """Test that loot tables load from file and must use known items"""
+    loot_file = tmp_path / "loot.txt"
+    loot_file.write_text("ENEMY_ID: goblin\nNOTHING: 0\nDROPS: iron_sword:1:2-3\n")
+    try:
+        tables = loot_system.load_loot_catalog(str(loot_file))
+        assert tables["goblin"]["drops"][0]["max_quantity"] == 3
+        assert 2 <= loot_system.roll_loot("goblin")["iron_sword"] <= 3
+        assert loot_system.roll_loot("orc") == {}
+
+        loot_file.write_text("ENEMY_ID: goblin\nDROPS: golden_apple:1:1\n")
+        with pytest.raises(InvalidDataFormatError):
+            loot_system.load_loot_catalog(str(loot_file))
+    finally:
+        loot_system.load_loot_catalog()
+
+def test_default_loot_file_uses_known_items(tmp_path, monkeypatch):
+    """Test that the generated loot file matches DEFAULT_LOOT and the item file"""
+    import main
+    shipped_items = os.path.abspath("data/items.txt")
+    monkeypatch.chdir(tmp_path)
+    try:
+        os.makedirs("data")
+        with open(shipped_items) as source, open("data/items.txt", "w") as f:
+            f.write(source.read())
+        game_data.create_default_data_files()
+        assert game_data.load_loot_tables("data/loot.txt") == game_data.DEFAULT_LOOT
+        main.load_game_data()
+
+        # With the generated item file, drops it doesn't have are left out
+        for name in ("items.txt", "loot.txt"):
+            os.remove(os.path.join("data", name))
+        game_data.create_default_data_files()
+        items = game_data.load_items("data/items.txt")
+        tables = game_data.load_loot_tables("data/loot.txt")
+        assert set(tables) == set(game_data.DEFAULT_LOOT)
+        assert all(drop["item_id"] in items
+                   for table in tables.values() for drop in table["drops"])
+        main.load_game_data()
+
+        # A bad loot file is caught at startup, not mid-game
+        with open("data/loot.txt", "w") as f:
+            f.write("ENEMY_ID: goblin\nDROPS: golden_apple:1:1\n")
+        with pytest.raises(InvalidDataFormatError):
+            main.load_game_data()
+    finally:
+        monkeypatch.undo()
+        loot_system.load_loot_catalog()
+
+def test_loot_rolls_follow_weights():
+    """Test that seeded rolls match the table's weights and quantities"""
+    rng = random.Random(8)
+    totals = {}
+    for _ in range(20000):
+        loot_system.roll_loot("orc", rng, totals)
+    # Orc: 25/100 potions (1-3, mean 2), 15/100 swords, 10/100 elixirs
+    assert abs(totals["health_potion"] / 20000 - 0.5) < 0.03
+    assert abs(totals["iron_sword"] / 20000 - 0.15) < 0.02
+    assert abs(totals["strength_elixir"] / 20000 - 0.10) < 0.02
+
+def test_add_items_to_inventory_keeps_overflow():
+    """Test that bulk adds fill the inventory and return the rest"""
+    char = character_manager.create_character("Packer", "Rogue")
+    char["inventory"] = ["health_potion"] * (inventory_system.MAX_INVENTORY_SIZE - 3)
+    overflow = inventory_system.add_items_to_inventory(char, {"iron_sword": 2, "fire_staff": 4})
+    assert len(char["inventory"]) == inventory_system.MAX_INVENTORY_SIZE
+    assert char["inventory"][-3:] == ["iron_sword", "iron_sword", "fire_staff"]
+    assert overflow == {"fire_staff": 3}
+
+def test_victory_loot_goes_to_inventory():
+    """Test that a won battle's loot is in the result and the inventory"""
+    dropped = 0
+    for seed in range(20):
+        char = character_manager.create_character("Looter", "Warrior")
+        char["strength"] = 500
+        result = combat_system.SimpleBattle(char, combat_system.create_enemy("dragon"),
+                                            sink=combat_system.NULL_SINK, seed=seed).start_battle()
+        assert result["winner"] == "player"
+        assert sum(result["loot"].values()) == len(char["inventory"])
+        for item_id, quantity in result["loot"].items():
+            assert char["inventory"].count(item_id) == quantity
+        dropped += len(char["inventory"])
+    assert dropped > 0
+
+# ============================================================================
+# ENEMY AI TESTS
+# ============================================================================
+
+def test_behavior_table_matches_rule_walk():
+    """Property test: the decision table gives the first matching rule"""
+    rules = game_data.parse_behavior_rules(
+        "hp<25&turn%2=1:heal, turn%3=0:special, hp>=90:defend, hp<50&turn%4=2:defend"
+    )
+    assert game_data.parse_behavior_rules(game_data.format_behavior_rules(rules)) == rules
+    behavior = enemy_ai.compile_behavior(rules)
+    assert behavior[0] == 12
+
+    for health in range(0, 201):
+        for turn in range(1, 30):
+            expected = "attack"
+            for rule in rules:
+                percent = health * 100 / 200
+                if rule["hp_below"] is not None and not percent < rule["hp_below"]:
+                    continue
+                if rule["hp_at_least"] is not None and not percent >= rule["hp_at_least"]:
+                    continue
+                if turn % rule["period"] == rule["phase"]:
+                    expected = rule["action"]
+                    break
+            code = enemy_ai.choose_action(behavior, health, 200, turn)
+            assert game_data.ENEMY_ACTIONS[code] == expected
+
+def test_bad_behavior_rules_are_rejected():
+    """Test that behavior rules are checked when the enemy file loads"""
+    block = ["ENEMY_ID: imp", "NAME: Imp", "HEALTH: 10", "STRENGTH: 3", "MAGIC: 1",
+             "XP_REWARD: 1", "GOLD_REWARD: 1", "MIN_LEVEL: 1", "MAX_LEVEL: 2",
+             "SPAWN_WEIGHT: 1"]
+    for behavior in ["hp<33:heal", "dance", "turn%5=0:special, turn%7=1:defend",
+                     "turn%3=3:heal", "mana<5:heal"]:
+        with pytest.raises(InvalidDataFormatError):
+            game_data.parse_enemy_block(block + [f"BEHAVIOR: {behavior}"])
+    assert game_data.parse_enemy_block(block)["behavior"] == []
+    assert combat_system.get_enemy_behavior("goblin") is None
+
+def test_enemy_actions_in_battle():
+    """Test defend, heal (with its limit) and special in a stepped battle"""
+    catalog = {key: dict(value) for key, value in combat_system.get_enemy_catalog().items()}
+    troll = dict(catalog["orc"], enemy_id="troll", name="Troll", health=200, magic=5,
+                 behavior=game_data.parse_behavior_rules(
+                     "hp<95&turn%3=1:heal, turn%3=2:defend, special"))
+    try:
+        combat_system.set_enemy_catalog(dict(catalog, troll=troll))
+        char = character_manager.create_character("Tank", "Warrior")
+        char["health"] = char["max_health"] = 1000
+        sink = combat_system.ListBattleSink()
+        battle = combat_system.SimpleBattle(char, combat_system.create_enemy("troll"), sink=sink)
+        assert not battle.can_fast_forward()
+        battle.start_battle()
+
+        enemy_events = [e for e in sink.events if e.actor == "enemy"]
+        actions = [e.action for e in enemy_events]
+        assert actions[:4] == ["heal", "defend", "special", "heal"]
+        assert enemy_events[0].damage == -10
+        # Warrior does 15 - 12 // 4 = 12 damage, 6 against a defend
+        hits = [e.damage for e in sink.events if e.actor == "player" and e.action == "attack"]
+        assert hits[:4] == [12, 12, 6, 12]
+        assert enemy_events[2].damage == 12 - 15 // 4 + 5
+        # Turn 10 would be a fourth heal - it attacks instead
+        assert actions.count("heal") == enemy_ai.ENEMY_HEAL_LIMIT
+        assert actions[9] == "attack"
+    finally:
+        combat_system.load_enemy_catalog()
+
+def test_party_battle_and_auto_grind_use_behaviors():
+    """Test that the dragon's rules run in party battles and auto-grind"""
+    hero = character_manager.create_character("Slayer", "Warrior")
+    hero.update(strength=40, health=2000, max_health=2000)
+    sink = combat_system.ListBattleSink()
+    party_battle.PartyBattle([hero], [combat_system.create_enemy("dragon")], sink=sink).start_battle()
+    assert "special" in [event.action for event in sink.events]
+
+    hero = character_manager.create_character("Slayer", "Warrior")
+    hero.update(strength=40, health=2000, max_health=2000)
+    health_lost = auto_grind.stepped_health_lost(hero, combat_system.get_enemy_prototype("dragon"))
+    stepped = dict(hero)
+    combat_system.SimpleBattle(stepped, combat_system.create_enemy("dragon"),
+                               sink=combat_system.NULL_SINK).run_turns()
+    assert stepped["health"] == hero["health"] - health_lost
+
+# ============================================================================
+# ENEMY LEVEL SCALING TESTS
+# ============================================================================
+
+def test_scaled_enemy_stats_follow_formula():
+    """Test that a high-level dragon grows by its per-level stats"""
+    base = combat_system.get_enemy_prototype("dragon")
+    dragon = combat_system.create_enemy_for_level("dragon", 500)
+    levels_above = 500 - combat_system.get_enemy_catalog()["dragon"]["min_level"]
+    assert dragon["health"] == dragon["max_health"] == base["health"] + 20 * levels_above
+    assert dragon["strength"] == base["strength"] + 2 * levels_above
+    assert dragon["xp_reward"] == base["xp_reward"] + 20 * levels_above
+    assert combat_system.create_enemy_for_level("dragon", 6) == combat_system.create_enemy("dragon")
+    assert combat_system.create_enemy_for_level("goblin", 300) == combat_system.create_enemy("goblin")
+
+    # Copies are fresh; the cached block is untouched
+    dragon["health"] = 0
+    assert combat_system.get_scaled_enemy_stats("dragon", 500)["health"] > 0
+    assert combat_system.get_random_enemy_for_level(500)["health"] == base["health"] + 20 * levels_above
+
+def test_scaled_enemy_cache_is_bounded_and_reloaded():
+    """Test that the stat cache stays bounded and drops an old catalog"""
+    for level in range(1, combat_system.ENEMY_STAT_CACHE_SIZE + 500):
+        combat_system.get_scaled_enemy_stats("dragon", level)
+    info = combat_system._scaled_enemy.cache_info()
+    assert info.currsize <= combat_system.ENEMY_STAT_CACHE_SIZE
+
+    catalog = {key: dict(value) for key, value in combat_system.get_enemy_catalog().items()}
+    try:
+        combat_system.set_enemy_catalog(dict(catalog, dragon=dict(catalog["dragon"],
+                                                                  per_level={"health": 1})))
+        dragon = combat_system.create_enemy_for_level("dragon", 16)
+        assert dragon["health"] == catalog["dragon"]["health"] + 10
+        assert dragon["strength"] == catalog["dragon"]["strength"]
+    finally:
+        combat_system.load_enemy_catalog()
+
+def test_per_level_fields_round_trip():
+    """Test parsing, formatting and checking <STAT>_PER_LEVEL lines"""
+    block = ["ENEMY_ID: imp", "NAME: Imp", "HEALTH: 10", "STRENGTH: 3", "MAGIC: 1",
+             "XP_REWARD: 1", "GOLD_REWARD: 1", "MIN_LEVEL: 1", "MAX_LEVEL: 2",
+             "SPAWN_WEIGHT: 1", "HEALTH_PER_LEVEL: 4", "GOLD_REWARD_PER_LEVEL: 2"]
+    imp = game_data.parse_enemy_block(block)
+    assert imp["per_level"] == {"health": 4, "gold_reward": 2}
+    assert game_data.parse_enemy_block(game_data.format_enemy_block(imp).splitlines()) == imp
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_enemy_block(block + ["MAGIC_PER_LEVEL: -1"])
+    assert game_data.parse_enemy_block(block[:-2])["per_level"] == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
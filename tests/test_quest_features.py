@@ -0,0 +1,331 @@
+"""
+Test Quest Features
+Tests for the quest dependency graph and quest progress tracking
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import game_data
+import quest_graph
+import quest_handler
+import quest_set
+import quest_analytics
+import roster_transfer
+
+
+def make_quest(quest_id, prerequisite="NONE", required_level=1):
+    """Minimal quest dictionary"""
+    return {"quest_id": quest_id, "title": quest_id.title(), "description": "Test",
+            "reward_xp": 10, "reward_gold": 5, "required_level": required_level,
+            "prerequisite": prerequisite}
+
+
+def make_catalog(links):
+    """Quest catalog from {quest_id: prerequisite}"""
+    return {quest_id: make_quest(quest_id, prereq) for quest_id, prereq in links.items()}
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def test_quest_graph_order_depth_and_chains():
+    """Test topological order, depths and cached chains on the real catalog"""
+    quests = game_data.load_quests("data/quests.txt")
+    graph = quest_graph.QuestGraph(quests)
+
+    order = graph.topological_order()
+    assert sorted(order) == sorted(quests)
+    position = {quest_id: i for i, quest_id in enumerate(order)}
+    for quest_id in quests:
+        chain = graph.prerequisite_chain(quest_id)
+        assert chain[-1] == quest_id
+        assert graph.get_depth(quest_id) == len(chain) - 1
+        assert graph.ancestors(quest_id) == set(chain[:-1])
+        for earlier, later in zip(chain, chain[1:]):
+            assert quests[later]["prerequisite"] == earlier
+            assert position[earlier] < position[later]
+            assert later in graph.dependents(earlier)
+
+    assert graph.prerequisite_chain(order[-1]) is graph.prerequisite_chain(order[-1])
+    assert quest_handler.get_quest_prerequisite_chain(order[-1], quests) == list(
+        graph.prerequisite_chain(order[-1]))
+
+def test_quest_graph_long_chain():
+    """Test a chain deeper than the recursion limit"""
+    links = {"q0": "NONE"}
+    for i in range(1, 5000):
+        links[f"q{i}"] = f"q{i - 1}"
+    graph = quest_graph.QuestGraph(make_catalog(links))
+    assert graph.get_depth("q4999") == 4999
+    assert len(graph.prerequisite_chain("q4999")) == 5000
+    assert graph.prerequisite_chain("q2500") == tuple(f"q{i}" for i in range(2501))
+
+def test_quest_cycles_are_rejected():
+    """Test that a prerequisite loop raises instead of hanging"""
+    quests = make_catalog({"a": "c", "b": "a", "c": "b", "d": "NONE"})
+    with pytest.raises(QuestDependencyCycleError):
+        quest_graph.QuestGraph(quests)
+    with pytest.raises(QuestDependencyCycleError):
+        quest_handler.get_quest_prerequisite_chain("a", quests)
+    with pytest.raises(QuestError):
+        quest_handler.validate_quest_prerequisites(make_catalog({"a": "a"}))
+
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.validate_quest_prerequisites(make_catalog({"a": "missing"}))
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain("nope", make_catalog({"a": "NONE"}))
+
+def test_quest_graph_rebuilt_for_new_catalog():
+    """Test that get_quest_graph reuses a graph only for the same catalog"""
+    quests = make_catalog({"a": "NONE", "b": "a"})
+    graph = quest_graph.get_quest_graph(quests)
+    assert quest_graph.get_quest_graph(quests) is graph
+
+    quests["c"] = make_quest("c", "b")
+    assert quest_handler.get_quest_prerequisite_chain("c", quests) == ["a", "b", "c"]
+    assert quest_graph.get_quest_graph(dict(quests)) is not graph
+
+def test_prerequisite_chain_ignores_unrelated_broken_quests():
+    """Test that one broken quest doesn't break chain lookups for the others"""
+    quests = make_catalog({"a": "NONE", "b": "a", "lost": "missing", "x": "y", "y": "x"})
+    assert quest_handler.get_quest_prerequisite_chain("b", quests) == ["a", "b"]
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain("lost", quests)
+    with pytest.raises(QuestDependencyCycleError):
+        quest_handler.get_quest_prerequisite_chain("x", quests)
+
+def test_quest_graph_invalidated_after_in_place_edit():
+    """Test that invalidate_quest_graph picks up an edited prerequisite"""
+    quests = make_catalog({"a": "NONE", "b": "NONE", "c": "b"})
+    assert quest_handler.get_quest_prerequisite_chain("c", quests) == ["b", "c"]
+
+    quests["b"]["prerequisite"] = "a"
+    quest_graph.invalidate_quest_graph()
+    assert quest_handler.get_quest_prerequisite_chain("c", quests) == ["a", "b", "c"]
+
+
+# ============================================================================
+# QUEST FRONTIER TESTS
+# ============================================================================
+
+def full_scan(character, quests):
+    """Available quest ids the slow way (no frontier)"""
+    plain = {key: value for key, value in character.items()
+             if key != quest_handler.FRONTIER_KEY}
+    return [quest["quest_id"] for quest in quest_handler.get_available_quests(plain, quests)]
+
+def test_frontier_matches_full_scan():
+    """Property test: random accept/complete/abandon/level-ups match a full scan"""
+    rng = random.Random(11)
+    quests = {}
+    for i in range(60):
+        prereq = f"q{rng.randrange(i)}" if i and rng.random() < 0.8 else "NONE"
+        quests[f"q{i}"] = make_quest(f"q{i}", prereq, required_level=rng.randint(1, 8))
+
+    char = character_manager.create_character("Quester", "Warrior")
+    quest_handler.attach_quest_frontier(char, quests)
+    for _ in range(400):
+        available = [q["quest_id"] for q in quest_handler.get_available_quests(char, quests)]
+        assert available == full_scan(char, quests)
+
+        roll = rng.random()
+        if roll < 0.4 and available:
+            quest_handler.accept_quest(char, rng.choice(available), quests)
+        elif roll < 0.75 and char["active_quests"]:
+            quest_handler.complete_quest(char, rng.choice(char["active_quests"]), quests)
+        elif roll < 0.85 and char["active_quests"]:
+            quest_handler.abandon_quest(char, rng.choice(char["active_quests"]))
+        elif roll < 0.9:
+            char["level"] += 1
+
+def test_frontier_handles_level_ups_and_direct_edits():
+    """Test lazy level-up checks and rebuilding after direct list edits"""
+    quests = make_catalog({"a": "NONE", "b": "a", "c": "a"})
+    quests["c"]["required_level"] = 3
+    char = character_manager.create_character("Quester", "Mage")
+    frontier = quest_handler.attach_quest_frontier(char, quests)
+
+    quest_handler.accept_quest(char, "a", quests)
+    quest_handler.complete_quest(char, "a", quests)
+    assert frontier.available_ids(char) == ["b"]
+    char["level"] = 3
+    assert frontier.available_ids(char) == ["b", "c"]
+
+    char["completed_quests"].append("b")
+    assert frontier.available_ids(char) == ["c"]
+    char["completed_quests"].clear()
+    assert frontier.available_ids(char) == ["a"]
+
+    # A different catalog gets a fresh frontier
+    other = make_catalog({"x": "NONE"})
+    assert [q["quest_id"] for q in quest_handler.get_available_quests(char, other)] == ["x"]
+    assert char[quest_handler.FRONTIER_KEY] is not frontier
+
+    saved = character_manager.format_character_save(char)
+    assert "frontier" not in saved.lower()
+
+
+# ============================================================================
+# QUEST SET TESTS
+# ============================================================================
+
+def test_quest_set_behaves_like_an_ordered_list():
+    """Test the list-style methods and insertion order"""
+    done = quest_set.QuestSet(["b", "a", "b"])
+    assert done == ["b", "a"] and len(done) == 2
+    done.append("c")
+    done.append("a")
+    assert list(done) == ["b", "a", "c"]
+    assert "c" in done and "z" not in done
+    done.remove("a")
+    assert done == ["b", "c"] and done[-1] == "c" and done[:1] == ["b"]
+    with pytest.raises(ValueError):
+        done.remove("a")
+    assert done.copy() == done and done.copy() is not done
+    assert random.choice(done) in done
+
+def test_quest_sets_save_and_validate():
+    """Test that QuestSets use the same save format and pass validation"""
+    char = character_manager.create_character("Saver", "Rogue")
+    assert isinstance(char["completed_quests"], quest_set.QuestSet)
+    char["completed_quests"].extend(["first_steps", "goblin_hunter"])
+    char["active_quests"].append("orc_menace")
+    assert character_manager.validate_character_data(char)
+
+    text = character_manager.format_character_save(char)
+    assert "COMPLETED_QUESTS: first_steps,goblin_hunter\n" in text
+    loaded = character_manager.parse_character_save(text.splitlines())
+    assert loaded["completed_quests"] == ["first_steps", "goblin_hunter"]
+    assert isinstance(loaded["active_quests"], quest_set.QuestSet)
+
+    line = roster_transfer.character_to_record(char)
+    assert line["completed_quests"] == ["first_steps", "goblin_hunter"]
+    imported = roster_transfer.parse_roster_line(roster_transfer.json.dumps(line))
+    assert imported["completed_quests"] == char["completed_quests"]
+
+def test_plain_quest_lists_are_upgraded():
+    """Test that hand-built characters with lists still work"""
+    quests = make_catalog({"a": "NONE", "b": "a"})
+    char = {"level": 1, "experience": 0, "gold": 0, "health": 10,
+            "max_health": 10, "active_quests": [], "completed_quests": ["a"]}
+    quest_handler.accept_quest(char, "b", quests)
+    assert isinstance(char["active_quests"], quest_set.QuestSet)
+    assert quest_handler.is_quest_active(char, "b")
+    quest_handler.complete_quest(char, "b", quests)
+    assert char["completed_quests"] == ["a", "b"]
+
+
+# ============================================================================
+# QUEST ANALYTICS TESTS
+# ============================================================================
+
+def make_roster(quests, count, seed=5):
+    """Characters with random completed quests (plus an unknown id)"""
+    rng = random.Random(seed)
+    ids = list(quests)
+    roster = []
+    for _ in range(count):
+        done = rng.sample(ids, rng.randint(0, len(ids)))
+        roster.append({"completed_quests": quest_set.QuestSet(done + ["retired_quest"])})
+    return roster
+
+def test_bitset_stats_match_quest_handler():
+    """Test popcount / set-bit reward sums against the list versions"""
+    quests = {f"q{i}": make_quest(f"q{i}") for i in range(70)}
+    for i, quest in enumerate(quests.values()):
+        quest.update(reward_xp=i * 3, reward_gold=i % 7)
+    index = quest_analytics.get_quest_index(quests)
+    assert quest_analytics.get_quest_index(quests) is index
+
+    for char in make_roster(quests, 50):
+        bits = quest_analytics.completion_bits(char, index)
+        assert index.decode(bits) == [q for q in quests if q in char["completed_quests"]]
+        assert index.from_bytes(index.to_bytes(bits)) == bits
+        assert len(index.to_row(bits)) == 9
+        assert quest_analytics.completion_percentage(bits, index) == \
+            quest_handler.get_quest_completion_percentage(char, quests)
+        assert quest_analytics.rewards_earned(bits, index) == \
+            quest_handler.get_total_quest_rewards_earned(char, quests)
+
+def test_stored_bitsets_check_the_catalog():
+    """Test that stored bitsets survive appended quests but not other changes"""
+    quests = {f"q{i}": make_quest(f"q{i}") for i in range(10)}
+    index = quest_analytics.QuestIndex(quests)
+    data = index.to_bytes(index.encode(["q1", "q9"]))
+    assert len(data) == quest_analytics.BITSET_HEADER.size + 2
+
+    grown = dict(quests, q10=make_quest("q10"))
+    assert quest_analytics.QuestIndex(grown).decode(
+        quest_analytics.QuestIndex(grown).from_bytes(data)) == ["q1", "q9"]
+
+    reordered = dict(reversed(list(quests.items())))
+    shrunk = {f"q{i}": make_quest(f"q{i}") for i in range(9)}
+    for other in (reordered, shrunk):
+        with pytest.raises(InvalidSaveDataError):
+            quest_analytics.QuestIndex(other).from_bytes(data)
+    for damaged in (data[:5], data[:-1], data[:-1] + b"\xff"):
+        with pytest.raises(InvalidSaveDataError):
+            index.from_bytes(damaged)
+
+def test_roster_analytics_with_numpy():
+    """Test packed roster counts, percentages, rewards and funnels"""
+    np = pytest.importorskip("numpy")
+    quests = game_data.load_quests("data/quests.txt")
+    index = quest_analytics.QuestIndex(quests)
+    roster = make_roster(quests, 300)
+    packed = quest_analytics.pack_roster(roster, index)
+    assert packed.shape == (300, index.row_bytes) and packed.dtype == np.uint8
+
+    percentages = quest_analytics.roster_completion_percentages(packed, index)
+    xp, gold = quest_analytics.roster_rewards_earned(packed, index)
+    for row, char in enumerate(roster):
+        assert percentages[row] == pytest.approx(
+            quest_handler.get_quest_completion_percentage(char, quests))
+        totals = quest_handler.get_total_quest_rewards_earned(char, quests)
+        assert (xp[row], gold[row]) == (totals["total_xp"], totals["total_gold"])
+
+    counts = quest_analytics.quest_completion_counts(packed, index)
+    assert counts == {q: sum(q in c["completed_quests"] for c in roster) for q in quests}
+
+    chain = quest_handler.get_quest_prerequisite_chain(index.ids[-1], quests)
+    funnel = quest_analytics.completion_funnel(packed, index, chain)
+    for step, (quest_id, count) in enumerate(funnel):
+        assert quest_id == chain[step]
+        assert count == sum(all(q in c["completed_quests"] for q in chain[:step + 1])
+                            for c in roster)
+    assert quest_analytics.pack_roster([], index).shape == (0, index.row_bytes)
+
+def test_roster_snapshots_check_the_catalog(tmp_path):
+    """Test storing a packed roster and loading it against other catalogs"""
+    np = pytest.importorskip("numpy")
+    quests = {f"q{i}": make_quest(f"q{i}") for i in range(12)}
+    index = quest_analytics.QuestIndex(quests)
+    roster = make_roster(quests, 40)
+    packed = quest_analytics.pack_roster(roster, index)
+    path = str(tmp_path / "roster.bits")
+    quest_analytics.save_roster_snapshot(path, packed, index)
+    assert np.array_equal(quest_analytics.load_roster_snapshot(path, index), packed)
+
+    grown = quest_analytics.QuestIndex(dict(quests, q12=make_quest("q12"), q13=make_quest("q13")))
+    loaded = quest_analytics.load_roster_snapshot(path, grown)
+    assert quest_analytics.quest_completion_counts(loaded, grown) == dict(
+        quest_analytics.quest_completion_counts(packed, index), q12=0, q13=0)
+
+    with pytest.raises(InvalidSaveDataError):
+        quest_analytics.load_roster_snapshot(
+            path, quest_analytics.QuestIndex(dict(reversed(list(quests.items())))))
+    with open(path, "ab") as f:
+        f.write(b"\x00")
+    with pytest.raises(InvalidSaveDataError):
+        quest_analytics.load_roster_snapshot(path, index)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
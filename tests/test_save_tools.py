@@ -0,0 +1,326 @@
+"""
+Test Save Tools
+Tests for save scanning and other bulk save-file tooling
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+import character_manager
+import save_scanner
+import save_archive
+import roster_transfer
+
+# ============================================================================
+# LOCKING TESTS
+# ============================================================================
+
+def test_character_session_serializes_threads(tmp_path):
+    """Test that concurrent sessions on one character don't lose updates"""
+    save_dir = str(tmp_path / "saves")
+    char = character_manager.create_character("Shared", "Cleric")
+    char["gold"] = 0
+    character_manager.save_character(char, save_dir)
+
+    def add_gold():
+        for _ in range(25):
+            with character_manager.character_session("Shared", save_dir) as c:
+                c["gold"] += 1
+
+    threads = [threading.Thread(target=add_gold) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert character_manager.load_character("Shared", save_dir)["gold"] == 100
+
+def test_character_session_does_not_save_on_error(tmp_path):
+    """Test that a failed session leaves the save untouched"""
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Safe", "Mage"), save_dir)
+
+    with pytest.raises(ValueError):
+        with character_manager.character_session("Safe", save_dir) as c:
+            c["gold"] = 999999
+            raise ValueError("boom")
+
+    assert character_manager.load_character("Safe", save_dir)["gold"] == 100
+
+def test_character_locks_leave_nothing_behind(tmp_path):
+    """Test that locking creates no lock files and forgets idle characters"""
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Tidy", "Rogue"), save_dir)
+    with character_manager.character_session("Tidy", save_dir) as c:
+        c["gold"] += 1
+    character_manager.load_character("Tidy", save_dir)
+    assert os.listdir(save_dir) == ["Tidy_save.txt"]
+    assert not character_manager._lock_table
+
+    character_manager.delete_character("Tidy", save_dir)
+    assert os.listdir(save_dir) == []
+    assert not character_manager._lock_table
+    with pytest.raises(CharacterNotFoundError):
+        with character_manager.character_session("Tidy", save_dir):
+            pass
+
+def test_failed_save_leaves_old_save_in_place(tmp_path):
+    """Test that a character that can't be formatted doesn't clobber its save"""
+    save_dir = str(tmp_path / "saves")
+    char = character_manager.create_character("Kept", "Warrior")
+    character_manager.save_character(char, save_dir)
+
+    for name in ("Kept", "Fresh"):
+        broken = dict(char, name=name)
+        del broken["gold"]
+        with pytest.raises(KeyError):
+            character_manager.save_character(broken, save_dir)
+    assert os.listdir(save_dir) == ["Kept_save.txt"]
+    assert character_manager.load_character("Kept", save_dir)["gold"] == 100
+
+def test_session_keeps_lock_on_replaced_save(tmp_path):
+    """Test that saving inside a session moves the held lock to the new file"""
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Held", "Mage"), save_dir)
+    path = os.path.abspath(os.path.join(save_dir, "Held_save.txt"))
+
+    with character_manager.character_session("Held", save_dir) as c:
+        c["gold"] += 1
+        character_manager.save_character(c, save_dir)
+        handle = character_manager._lock_table[path]["handle"]
+        if handle is not None:
+            assert os.fstat(handle.fileno()).st_ino == os.stat(path).st_ino
+    assert character_manager.load_character("Held", save_dir)["gold"] == 101
+    assert os.listdir(save_dir) == ["Held_save.txt"]
+
+def test_unopenable_save_is_corrupted(tmp_path):
+    """Test that a save that can't be opened raises SaveFileCorruptedError"""
+    save_dir = tmp_path / "saves"
+    (save_dir / "Broken_save.txt").mkdir(parents=True)
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Broken", str(save_dir))
+    assert not character_manager._lock_table
+
+# ============================================================================
+# SAVE SCANNER TESTS
+# ============================================================================
+
+def _make_save_directory(tmp_path):
+    """Create a save directory with one good and two broken saves"""
+    save_dir = str(tmp_path / "saves")
+    char = character_manager.create_character("GoodHero", "Warrior")
+    character_manager.save_character(char, save_dir)
+
+    with open(os.path.join(save_dir, "BadFormat_save.txt"), "w") as f:
+        f.write("NAME: BadFormat\nLEVEL: not_a_number\n")
+
+    with open(os.path.join(save_dir, "Garbled_save.txt"), "wb") as f:
+        f.write(b"\xff\xfe\x00garbage")
+
+    return save_dir
+
+def test_scan_save_reports_each_status(tmp_path):
+    """Test that each save gets the right status"""
+    save_dir = _make_save_directory(tmp_path)
+
+    assert save_scanner.scan_save("GoodHero", save_dir)[1] == "ok"
+    assert save_scanner.scan_save("BadFormat", save_dir)[1] == "InvalidSaveDataError"
+    assert save_scanner.scan_save("Garbled", save_dir)[1] == "SaveFileCorruptedError"
+
+def test_scan_save_directory_summary(tmp_path):
+    """Test scanning a directory in parallel and writing a report"""
+    save_dir = _make_save_directory(tmp_path)
+    report_path = str(tmp_path / "report.txt")
+
+    summary = save_scanner.scan_save_directory(save_dir, workers=2, report_path=report_path)
+
+    assert summary["total"] == 3
+    assert summary["counts"]["ok"] == 1
+    assert summary["counts"]["InvalidSaveDataError"] == 1
+    assert summary["counts"]["SaveFileCorruptedError"] == 1
+    assert sorted(name for name, _, _ in summary["failures"]) == ["BadFormat", "Garbled"]
+
+    with open(report_path) as f:
+        report = f.read()
+    assert "TOTAL: 3" in report
+    assert "BadFormat" in report
+
+# ============================================================================
+# SAVE ARCHIVE TESTS
+# ============================================================================
+
+def test_archive_save_load_delete(tmp_path):
+    """Test the packed archive keeps the character_manager API"""
+    pack = str(tmp_path / "saves.pack")
+    char = character_manager.create_character("Packed", "Mage")
+
+    assert save_archive.save_character(char, pack) == True
+    char["gold"] = 555
+    save_archive.save_character(char, pack)
+
+    loaded = save_archive.load_character("Packed", pack)
+    assert loaded["gold"] == 555
+    assert save_archive.list_saved_characters(pack) == ["Packed"]
+
+    save_archive.delete_character("Packed", pack)
+    with pytest.raises(CharacterNotFoundError):
+        save_archive.load_character("Packed", pack)
+
+    save_archive.close_archive(pack)
+
+def test_archive_compaction_and_reopen(tmp_path):
+    """Test compaction reclaims old records and the index survives reopening"""
+    pack = str(tmp_path / "saves.pack")
+    for i in range(5):
+        char = character_manager.create_character(f"Hero{i}", "Rogue")
+        for gold in range(3):
+            char["gold"] = gold
+            save_archive.save_character(char, pack)
+    save_archive.delete_character("Hero0", pack)
+
+    size_before = os.path.getsize(pack)
+    reclaimed = save_archive.compact_archive(pack)
+    assert reclaimed > 0
+    assert os.path.getsize(pack) == size_before - reclaimed
+
+    save_archive.close_archive(pack)
+    assert sorted(save_archive.list_saved_characters(pack)) == [f"Hero{i}" for i in range(1, 5)]
+    assert save_archive.load_character("Hero3", pack)["gold"] == 2
+
+    # A torn record at the end is ignored and cut off
+    save_archive.close_archive(pack)
+    os.remove(pack + ".idx")
+    with open(pack, "ab") as f:
+        f.write(b"SAVE\x05\x00")
+    assert len(save_archive.list_saved_characters(pack)) == 4
+    save_archive.close_archive(pack)
+
+def test_archive_shared_by_two_handles(tmp_path):
+    """Test that two open archives (like two processes) see each other's writes"""
+    pack = str(tmp_path / "shared.pack")
+    first = save_archive.SaveArchive(pack)
+    second = save_archive.SaveArchive(pack)
+    odd_name = "Tab\tNew\nLine"
+
+    for name, archive in (("One", first), ("Two", second), (odd_name, first)):
+        char = character_manager.create_character(name, "Warrior")
+        archive.save(char)
+    char["gold"] = 7
+    second.save(char)
+
+    assert first.read("Two").startswith("NAME: Two\n")
+    assert "GOLD: 7" in first.read(odd_name)
+    first.delete("One")
+    with pytest.raises(CharacterNotFoundError):
+        second.read("One")
+
+    # Compaction swaps the file; the other handle follows it
+    assert first.compact() > 0
+    assert "GOLD: 7" in second.read(odd_name)
+    first.close()
+    second.close()
+
+    reopened = save_archive.SaveArchive(pack)
+    assert sorted(reopened.index) == sorted(["Two", odd_name])
+    assert "GOLD: 7" in reopened.read(odd_name)
+    reopened.close()
+
+def test_archive_listing_and_long_names(tmp_path):
+    """Test that listing sees other handles' writes and long names are refused"""
+    pack = str(tmp_path / "names.pack")
+    first = save_archive.SaveArchive(pack)
+    try:
+        assert save_archive.list_saved_characters(pack) == []
+        first.save(character_manager.create_character("Elsewhere", "Mage"))
+        assert save_archive.list_saved_characters(pack) == ["Elsewhere"]
+
+        long_name = "\u00e9" * (save_archive.MAX_NAME_BYTES // 2 + 1)
+        with pytest.raises(InvalidSaveDataError):
+            first.save(character_manager.create_character(long_name, "Mage"))
+        assert save_archive.list_saved_characters(pack) == ["Elsewhere"]
+    finally:
+        first.close()
+        save_archive.close_archive(pack)
+
+# ============================================================================
+# ROSTER TRANSFER TESTS
+# ============================================================================
+
+def test_roster_export_import_round_trip(tmp_path):
+    """Test exporting to gzip JSONL with filters and importing back"""
+    source = str(tmp_path / "source")
+    target = str(tmp_path / "target")
+    for name, char_class, level in [("A", "Warrior", 1), ("B", "Mage", 5), ("C", "Warrior", 7)]:
+        char = character_manager.create_character(name, char_class)
+        char["level"] = level
+        char["inventory"] = ["health_potion"]
+        character_manager.save_character(char, source)
+
+    roster = str(tmp_path / "roster.jsonl.gz")
+    counts = roster_transfer.export_roster(roster, source, min_level=5, workers=2)
+    assert counts == {"read": 3, "transferred": 2, "skipped": 1, "failed": 0}
+
+    counts = roster_transfer.import_roster(roster, target, character_class="Warrior")
+    assert counts["transferred"] == 1
+    assert character_manager.list_saved_characters(target) == ["C"]
+    assert character_manager.load_character("C", target)["inventory"] == ["health_potion"]
+
+def test_roster_import_counts_bad_quest_lists_as_failed(tmp_path):
+    """Test that non-string quest or item entries fail one line, not the import"""
+    record = roster_transfer.character_to_record(character_manager.create_character("Ok", "Mage"))
+    roster = str(tmp_path / "roster.jsonl")
+    with open(roster, "w") as f:
+        for key, bad in (("active_quests", [[1]]), ("completed_quests", [{"a": 1}]),
+                         ("inventory", [7])):
+            line = dict(record, **{key: bad})
+            f.write(roster_transfer.json.dumps(line) + "\n")
+        f.write(roster_transfer.json.dumps(record) + "\n")
+
+    counts = roster_transfer.import_roster(roster, str(tmp_path / "target"))
+    assert counts == {"read": 4, "transferred": 1, "skipped": 0, "failed": 3}
+    assert [c["name"] for c in roster_transfer.iter_roster_characters(roster)] == ["Ok"]
+
+def test_roster_pool_reads_tasks_in_bounded_windows():
+    """Test that the worker pool never pulls more than one window of tasks ahead"""
+    pulled = []
+
+    def tasks():
+        for i in range(50):
+            pulled.append(i)
+            yield -i
+
+    results = []
+    for result in roster_transfer._map_tasks(abs, tasks(), workers=2, chunk_size=3):
+        # At most one window (chunk_size * workers) past the current result
+        assert len(pulled) <= (len(results) // 6 + 1) * 6
+        results.append(result)
+    assert results == list(range(50))
+
+def test_roster_import_rejects_unsafe_names(tmp_path):
+    """Test that names which could escape the save directory are refused"""
+    record = roster_transfer.character_to_record(character_manager.create_character("Ok", "Mage"))
+    assert roster_transfer.parse_roster_line(roster_transfer.json.dumps(record))["name"] == "Ok"
+
+    for bad in ["../evil", "a/b", "..", "", "   ", 42, None, os.sep + "root",
+                "a\nLEVEL: 99", "nul\x00byte", "tab\there"]:
+        record["name"] = bad
+        with pytest.raises(InvalidSaveDataError):
+            roster_transfer.parse_roster_line(roster_transfer.json.dumps(record))
+
+    roster = str(tmp_path / "roster.jsonl")
+    with open(roster, "w") as f:
+        for bad in ("../escaped", "a\nLEVEL: 99", "nul\x00byte"):
+            record["name"] = bad
+            f.write(roster_transfer.json.dumps(record) + "\n")
+    counts = roster_transfer.import_roster(roster, str(tmp_path / "target"))
+    assert counts["failed"] == 3 and counts["transferred"] == 0
+    assert os.listdir(tmp_path / "target") == []
+    assert not os.path.exists(tmp_path / "escaped_save.txt")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+# AI Usage - AI assisted with explanations, debugging, code structure, and implementation guidance.
+"""
+COMP 163 - Project 3: Quest Chronicles
+Weighted Sampling Module
+
+Name: [Kurkeli Kurkeli]
+
+AI Usage: [AI assisted with explanations, debugging, code structure, and implementation guidance.]
+
+This module implements Walker's alias method. Building a table for n
+weights is O(n); after that every weighted random pick is O(1), no
+matter how many choices there are.
+"""
+
+import random
+
+# ============================================================================
+# ALIAS TABLES
+# ============================================================================
+
+def build_alias_table(weights):
+    """
+    Build an alias table for a list of non-negative weights (Vose's method)
+
+    Returns: Tuple (probabilities, aliases), both lists of length n
+    Raises: ValueError if there are no weights or they sum to 0
+    """
+    count = len(weights)
+    total = float(sum(weights))
+    if count == 0 or total <= 0:
+        raise ValueError("Alias table needs at least one positive weight")
+
+    # Scale so the average weight is 1
+    scaled = [w * count / total for w in weights]
+    probabilities = [0.0] * count
+    aliases = list(range(count))
+
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        # The large column gives away what the small one was missing
+        scaled[more] = scaled[more] + scaled[less] - 1.0
+        if scaled[more] < 1.0:
+            small.append(more)
+        else:
+            large.append(more)
+
+    # Leftovers are full columns (only off by float rounding)
+    for i in large + small:
+        probabilities[i] = 1.0
+
+    return probabilities, aliases
+
+
+def alias_draw(table, rng=random):
+    """
+    Pick a random index from an alias table in O(1)
+
+    Args:
+        table: (probabilities, aliases) from build_alias_table
+        rng: Anything with a random() method (default: random module)
+
+    Returns: Integer index
+    """
+    probabilities, aliases = table
+    u = rng.random() * len(probabilities)
+    column = int(u)
+    if u - column < probabilities[column]:
+        return column
+    return aliases[column]
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== WEIGHTED SAMPLING TEST ===")
+
+    # table = build_alias_table([1, 2, 7])
+    # counts = [0, 0, 0]
+    # for _ in range(10000):
+    #     counts[alias_draw(table)] += 1
+    # print(counts)